@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+##########################################################################################
+# scripts/benchmark_pickle_codecs.py
+#
+# Compare the pickle compression codecs on representative backplanes.
+#
+# Usage:
+#   python scripts/benchmark_pickle_codecs.py [--size N] [--repeat R]
+##########################################################################################
+"""Compare the pickle compression codecs on representative backplanes.
+
+For each codec and backplane, prints the pickled size in bytes and the best time to
+encode and to decode, in milliseconds. The codec applies to masks, integer and boolean
+arrays, and floats stored as scaled integers; fpzip-encoded floats are unaffected.
+"""
+
+import argparse
+import pickle
+import time
+
+import numpy as np
+
+from polymath import Boolean, Scalar, Vector3
+from polymath.extensions.pickler import _PICKLE_CODECS
+
+
+def backplanes(size):
+    """A dictionary of representative backplanes, keyed by description."""
+
+    # A planet disk filling part of the field of view
+    (y, x) = np.mgrid[:size, :size] / size - 0.4
+    r2 = x**2 + y**2
+    off_disk = r2 > 0.3**2
+
+    # Incidence angle: smooth over the disk, masked beyond the limb
+    incidence = Scalar(np.arccos(np.sqrt(np.maximum(0., 1. - r2 / 0.09))),
+                       mask=off_disk)
+    scaled = incidence.copy()
+    scaled.set_pickle_digits(6, 'largest')
+
+    # Surface intercepts, with derivatives with respect to time as the planet rotates
+    z = np.sqrt(np.maximum(0., 0.09 - r2))
+    velocity = Vector3(np.stack([z, np.zeros_like(x), -x], axis=-1), mask=off_disk)
+    intercept = Vector3(np.stack([x, y, z], axis=-1), mask=off_disk,
+                        derivs={'t': velocity})
+
+    # Integer body IDs and a boolean shadow mask
+    body_ids = Scalar(np.where(off_disk, 0, 599) + (x > 0.2), mask=False)
+    shadow = Boolean(x + y > 0.1, mask=off_disk)
+
+    return {'incidence (fpzip double)': incidence,
+            'incidence (6 digits)': scaled,
+            'intercept (fpzip double)': intercept,
+            'body IDs (int)': body_ids,
+            'shadow (bool)': shadow}
+
+
+def best_time(func, repeat):
+    """The best of several timings of a function, in milliseconds."""
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return 1000. * min(times)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1024,
+                        help='width and height of each backplane (default 1024)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of timings to take the best of (default 3)')
+    args = parser.parse_args()
+
+    print(f'{"backplane":28s} {"codec":6s} {"bytes":>12s} {"encode ms":>10s} '
+          f'{"decode ms":>10s}')
+
+    for (name, obj) in backplanes(args.size).items():
+        for codec in _PICKLE_CODECS:
+            obj.set_pickle_codec(codec)
+            data = pickle.dumps(obj)
+            encode = best_time(lambda obj=obj: pickle.dumps(obj), args.repeat)
+            decode = best_time(lambda data=data: pickle.loads(data), args.repeat)
+            print(f'{name:28s} {codec:6s} {len(data):12d} {encode:10.1f} '
+                  f'{decode:10.1f}')
+
+        obj.set_pickle_codec(None)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -481,11 +481,16 @@ follows:
 * "double": preserve full precision using lossless **fpzip** compression.
 * "single": convert the array to single precision and then store it using lossless
   **fpzip** compression.
-* an number 7-16, defining the number of significant digits to preserve.
+* "raw": store the arrays exactly as they are, without compression. This applies to
+  integer and boolean arrays as well. Under pickle protocol 5, the arrays are passed as
+  out-of-band buffers, so transports such as `multiprocessing`, Dask and Ray can move
+  them without copying.
+* a number from 1 to 16, defining the number of significant digits to preserve.
 
 **reference** (`str or float`): How to interpret a numeric value of **digits**.
 
-* "fpzip": Use lossy **fpzip** compression, preserving the given number of digits.
+* "fpzip": Use lossy **fpzip** compression, preserving the given number of digits. The
+  relative error of every nonzero value is less than `10**(-digits)`.
 * a number: Preserve every number to the exact same absolute precision, scaling the number
   of **digits** by this value. For example, if **digits** = 8 and **reference** = 100,
   all values will be rounded to the nearest 1.e-6 before storage. This method uses option
@@ -511,6 +516,13 @@ generated automatically.
   we want the precision to be based on the more "typical" values.
 * "logmean": Absolute accuracy will be `10**(-digits)` times the log-mean of the absolute
   values in the array.
+* "auto": Every value keeps the given number of significant digits, as for "fpzip". A
+  sample of the array is encoded with lossy **fpzip**, with "smallest", and, when it
+  retains enough digits, with single precision; the method with the smallest output is
+  used, subject to the time budget set by :meth:`Qube.set_pickle_auto_budget`.
+
+For a numeric reference and for each of these options except "auto", the absolute error
+of every value is at most half of this accuracy.
 """
 
 from polymath.qube       import Qube
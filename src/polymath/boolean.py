@@ -149,7 +149,7 @@ class Boolean(Scalar):
 
         return self.as_int()
 
-    def __add__(self, /, arg, *, recursive=True):
+    def __add__(self, /, arg, *, recursive=True, out=None):
         """self + arg, element-by-element addition after this Boolean is converted to an
         integer Scalar.
 
@@ -158,12 +158,14 @@ class Boolean(Scalar):
         Parameters:
             arg (Qube, numpy.ndarray, float, int, or bool): The argument.
             recursive (bool, optional): Ignored for Boolean.
+            out (Scalar, optional): A writable Scalar of the same shape as the result,
+                into which the result is written in place of a new object.
 
         Returns:
             Scalar: The sum.
         """
 
-        return self.as_int() + arg
+        return self.as_int().__add__(arg, out=out)
 
     def __radd__(self, /, arg, *, recursive=True):
         """arg + self, element-by-element addition after this Boolean is converted to an
@@ -195,7 +197,7 @@ class Boolean(Scalar):
 
         Qube._raise_unsupported_op('+=', self)
 
-    def __sub__(self, /, arg, *, recursive=True):
+    def __sub__(self, /, arg, *, recursive=True, out=None):
         """self - arg, element-by-element subtraction after this Boolean is converted to
         an integer Scalar.
 
@@ -204,12 +206,14 @@ class Boolean(Scalar):
         Parameters:
             arg (Qube, numpy.ndarray, float, int, or bool): The argument.
             recursive (bool, optional): Ignored for Boolean.
+            out (Scalar, optional): A writable Scalar of the same shape as the result,
+                into which the result is written in place of a new object.
 
         Returns:
             Scalar: The difference.
         """
 
-        return self.as_int() - arg
+        return self.as_int().__sub__(arg, out=out)
 
     def __rsub__(self, /, arg, *, recursive=True):
         """arg - self, element-by-element subtraction after this Boolean is converted to
@@ -241,7 +245,7 @@ class Boolean(Scalar):
 
         Qube._raise_unsupported_op('-=', self)
 
-    def __mul__(self, /, arg, *, recursive=True):
+    def __mul__(self, /, arg, *, recursive=True, out=None):
         """self * arg, element-by-element multiplication after this Boolean is converted
         to an integer Scalar.
 
@@ -250,12 +254,14 @@ class Boolean(Scalar):
         Parameters:
             arg (Qube, numpy.ndarray, float, int, or bool): The argument.
             recursive (bool, optional): Ignored for Boolean.
+            out (Scalar, optional): A writable Scalar of the same shape as the result,
+                into which the result is written in place of a new object.
 
         Returns:
             Scalar: The product.
         """
 
-        return self.as_int() * arg
+        return self.as_int().__mul__(arg, out=out)
 
     def __rmul__(self, /, arg, *, recursive=True):
         """arg * self, element-by-element multiplication after this Boolean is converted
@@ -287,7 +293,7 @@ class Boolean(Scalar):
 
         Qube._raise_unsupported_op('*=', self)
 
-    def __truediv__(self, /, arg, *, recursive=True):
+    def __truediv__(self, /, arg, *, recursive=True, out=None):
         """self / arg, element-by-element division after this Boolean is converted to a
         floating-point Scalar.
 
@@ -296,12 +302,14 @@ class Boolean(Scalar):
         Parameters:
             arg (Qube, numpy.ndarray, float, int, or bool): The argument.
             recursive (bool, optional): Ignored for Boolean.
+            out (Scalar, optional): A writable Scalar of the same shape as the result,
+                into which the result is written in place of a new object.
 
         Returns:
             Scalar: The quotient.
         """
 
-        return self.as_float() / arg
+        return self.as_float().__truediv__(arg, out=out)
 
     def __rtruediv__(self, /, arg, *, recursive=True):
         """arg / self, element-by-element division after this Boolean is converted to a
@@ -24,7 +24,8 @@ class Boolean(Scalar):
     MASKED: Boolean
     TRUE: Boolean
     def __abs__(self, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
-    def __add__(self, arg: _Arraylike, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
+    def __add__(self, arg: _Arraylike, *, recursive: bool = ...,  # type: ignore[override]
+        out: Scalar | None = ...) -> _Arraylike: ...
     def __floordiv__(self, arg: _Arraylike) -> _Arraylike: ...  # type: ignore[override]
     def __ge__(self, arg: Any, *,  # type: ignore[override]
         builtins: bool = ...) -> _Arraylike | bool: ...
@@ -42,7 +43,8 @@ class Boolean(Scalar):
     def __lt__(self, arg: Any, *,  # type: ignore[override]
         builtins: bool = ...) -> _Arraylike | bool: ...
     def __mod__(self, arg: _Arraylike) -> _Arraylike: ...  # type: ignore[override]
-    def __mul__(self, arg: _Arraylike, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
+    def __mul__(self, arg: _Arraylike, *, recursive: bool = ...,  # type: ignore[override]
+        out: Scalar | None = ...) -> _Arraylike: ...
     def __neg__(self, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
     def __pos__(self, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
     def __pow__(self, arg: _Arraylike) -> _Arraylike: ...  # type: ignore[override]
@@ -52,8 +54,10 @@ class Boolean(Scalar):
     def __rmul__(self, arg: _Arraylike, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[misc, override]
     def __rsub__(self, arg: _Arraylike, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
     def __rtruediv__(self, arg: _Arraylike, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
-    def __sub__(self, arg: _Arraylike, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
-    def __truediv__(self, arg: _Arraylike, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
+    def __sub__(self, arg: _Arraylike, *, recursive: bool = ...,  # type: ignore[override]
+        out: Scalar | None = ...) -> _Arraylike: ...
+    def __truediv__(self, arg: _Arraylike, *, recursive: bool = ...,  # type: ignore[override]
+        out: Scalar | None = ...) -> _Arraylike: ...
     @staticmethod
     def as_boolean(arg: Any, *, recursive: bool = ...) -> _Arraylike: ...
     def as_index(self) -> NDArray[Any]: ...  # type: ignore[override]
@@ -4,6 +4,12 @@
 
 from polymath.qube import Qube
 
+from polymath.extensions import async_ops
+Qube.dump_async         = async_ops.dump_async
+Qube.load_async         = async_ops.load_async
+Qube.dump_batch_async   = async_ops.dump_batch_async
+Qube.load_batch_async   = async_ops.load_batch_async
+
 from polymath.extensions import attr_ops
 Qube.add_attr           = attr_ops.add_attr
 
@@ -98,6 +104,9 @@ from polymath.extensions import iterator
 Qube.__iter__           = iterator.__iter__
 Qube.ndenumerate        = iterator.ndenumerate
 
+from polymath.extensions import lazy
+Qube.lazy               = lazy.lazy
+
 from polymath.extensions import masking
 Qube._as_mask           = masking._as_mask
 Qube._suitable_mask     = masking._suitable_mask
@@ -114,6 +123,8 @@ Qube.remask             = masking.remask
 Qube.remask_or          = masking.remask_or
 Qube.expand_mask        = masking.expand_mask
 Qube.collapse_mask      = masking.collapse_mask
+Qube.as_sparse_mask     = masking.as_sparse_mask
+Qube.as_packed_mask     = masking.as_packed_mask
 Qube.as_mask_where_nonzero = masking.as_mask_where_nonzero
 Qube.as_mask_where_zero    = masking.as_mask_where_zero
 Qube.as_mask_where_nonzero_or_masked = masking.as_mask_where_nonzero_or_masked
@@ -126,6 +137,9 @@ Qube.__abs__            = math_ops.__abs__
 Qube.abs                = math_ops.abs
 Qube.__len__            = math_ops.__len__
 Qube.len                = math_ops.len
+Qube._prep_out          = math_ops._prep_out
+Qube._fill_out          = math_ops._fill_out
+Qube._copy_out          = math_ops._copy_out
 Qube.__add__            = math_ops.__add__
 Qube.__radd__           = math_ops.__radd__
 Qube.__iadd__           = math_ops.__iadd__
@@ -224,10 +238,19 @@ Qube.outer              = vector_ops.outer
 Qube.as_diagonal        = vector_ops.as_diagonal
 Qube.rms                = vector_ops.rms
 
+from polymath.extensions import numpy_ops
+Qube.__array_ufunc__    = numpy_ops.__array_ufunc__
+Qube.__array_function__ = numpy_ops.__array_function__
+
+from polymath.extensions import packing
+Qube.pack               = packing.pack
+Qube.unpack             = packing.unpack
+
 from polymath.extensions import pickler
 # The pickler module itself is documented through docs/module.rst, rather than bound
 # onto Qube, where a non-callable module attribute in every object's namespace surprised
 # anyone who reached for it expecting a method.
+Qube.__reduce_ex__      = pickler.__reduce_ex__
 Qube.__getstate__       = pickler.__getstate__
 Qube.__setstate__       = pickler.__setstate__
 Qube._encode_floats     = pickler._encode_floats
@@ -240,9 +263,24 @@ Qube.pickle_digits      = pickler.pickle_digits
 Qube.pickle_reference   = pickler.pickle_reference
 Qube.set_pickle_digits         = pickler.set_pickle_digits
 Qube.set_default_pickle_digits = pickler.set_default_pickle_digits
+Qube.set_pickle_workers        = pickler.set_pickle_workers
+Qube.set_pickle_auto_budget     = pickler.set_pickle_auto_budget
+Qube.set_pickle_lazy           = pickler.set_pickle_lazy
+Qube.pickle_codec              = pickler.pickle_codec
+Qube.set_pickle_codec          = pickler.set_pickle_codec
+Qube.set_default_pickle_codec  = pickler.set_default_pickle_codec
+Qube.register_pickle_codec     = pickler.register_pickle_codec
+Qube.set_pickle_delta          = pickler.set_pickle_delta
+Qube.register_pickle_delta     = pickler.register_pickle_delta
+Qube.dump_many                 = pickler.dump_many
+Qube.load_many                 = pickler.load_many
 Qube._check_pickle_digits      = pickler._check_pickle_digits
 Qube._pickle_debug             = pickler._pickle_debug
 
+# An object unpickled lazily lacks these attributes until they are first used
+Qube._values                   = pickler._LazyAttribute('_values')
+Qube._mask                     = pickler._LazyAttribute('_mask')
+
 from polymath.extensions import readonly_ops
 Qube._array_is_readonly = readonly_ops._array_is_readonly
 Qube._array_to_readonly = readonly_ops._array_to_readonly
@@ -261,9 +299,28 @@ Qube.roll_axis          = shaper.roll_axis
 Qube.move_axis          = shaper.move_axis
 Qube.stack              = shaper.stack
 
+from polymath.extensions import sharing
+Qube.to_shared          = sharing.to_shared
+Qube.from_shared        = sharing.from_shared
+
 from polymath.extensions import shrinker
 Qube.shrink             = shrinker.shrink
 Qube.unshrink           = shrinker.unshrink
+Qube.shrunk             = shrinker.shrunk
+Qube.set_auto_shrink    = shrinker.set_auto_shrink
+Qube._auto_shrink       = shrinker._auto_shrink
+
+from polymath.extensions import storage
+Qube.save               = storage.save
+Qube.load               = storage.load
+
+from polymath.extensions import streaming
+Qube.dump_blocks        = streaming.dump_blocks
+Qube.iter_blocks        = streaming.iter_blocks
+Qube.load_blocks        = streaming.load_blocks
+
+from polymath.extensions import tiler
+Qube.map_tiles          = tiler.map_tiles
 
 from polymath.extensions import tvl
 Qube.tvl_and            = tvl.tvl_and
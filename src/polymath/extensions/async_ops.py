@@ -0,0 +1,152 @@
+##########################################################################################
+# polymath/extensions/async_ops.py: pickling of Qube objects from asyncio code
+##########################################################################################
+"""This module supports the pickling of polymath objects from within an asyncio program.
+
+Encoding or decoding a large object spends hundreds of milliseconds in fpzip and the
+compression codec, which would stall an event loop. The coroutines
+:meth:`~polymath.Qube.dump_async` and :meth:`~polymath.Qube.load_async` instead pickle or
+unpickle an object and do the file I/O in an executor, so the event loop stays
+responsive. :meth:`~polymath.Qube.dump_batch_async` and
+:meth:`~polymath.Qube.load_batch_async` submit several files at once, so their encoding,
+decoding and I/O overlap. For example::
+
+    await backplane.dump_async(path)
+    backplane = await Qube.load_async(path)
+
+Objects are decoded in full in the executor, even when lazy decoding is selected with
+:meth:`~polymath.Qube.set_pickle_lazy`, so no decoding is left to run on the event loop
+when they are first used.
+
+An object must not be modified while it is being pickled.
+"""
+
+import asyncio
+import pickle
+
+from polymath.qube import Qube
+
+__all__ = ['dump_async', 'dump_batch_async', 'load_async', 'load_batch_async']
+
+
+def _dump(obj, path, protocol):
+    """Pickle one object to a file."""
+
+    with open(path, 'wb') as f:
+        pickle.dump(obj, f, protocol=protocol)
+
+
+def _load(path):
+    """Unpickle one object from a file, decoding it in full."""
+
+    with open(path, 'rb') as f:
+        obj = pickle.load(f)
+
+    _decode(obj)
+    return obj
+
+
+def _decode(obj):
+    """Decode now any Qube that was unpickled lazily, along with its derivatives, within
+    an object or within a list, tuple or dictionary."""
+
+    if isinstance(obj, Qube):
+        if '_lazy_state' in obj.__dict__:
+            _ = (obj._values, obj._mask)        # each access decodes the array
+        for deriv in obj._derivs.values():
+            _decode(deriv)
+
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _decode(item)
+
+    elif isinstance(obj, dict):
+        for item in obj.values():
+            _decode(item)
+
+
+async def dump_async(self, path, protocol=None, executor=None):
+    """Pickle this object to a file without blocking the event loop.
+
+    Parameters:
+        path (str or os.PathLike): The path of the file to write.
+        protocol (int, optional): The pickle protocol; None for the default.
+        executor (concurrent.futures.Executor, optional): The executor in which to
+            pickle and write the object; None for the default executor of the running
+            event loop.
+    """
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(executor, _dump, self, path, protocol)
+
+
+@staticmethod
+async def load_async(path, executor=None):
+    """Unpickle an object from a file without blocking the event loop.
+
+    Parameters:
+        path (str or os.PathLike): The path of the file to read.
+        executor (concurrent.futures.Executor, optional): The executor in which to read
+            and unpickle the object; None for the default executor of the running event
+            loop.
+
+    Returns:
+        object: The unpickled object, decoded in full even if lazy decoding is selected.
+    """
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, _load, path)
+
+
+@staticmethod
+async def dump_batch_async(objects, paths, protocol=None, executor=None):
+    """Pickle several objects, each to its own file, without blocking the event loop.
+
+    All of the objects are submitted to the executor at once, so the work on each one
+    overlaps with the others, up to the number of workers in the executor.
+
+    Parameters:
+        objects (list or tuple): The objects to pickle.
+        paths (list or tuple): The path of the file for each object.
+        protocol (int, optional): The pickle protocol; None for the default.
+        executor (concurrent.futures.Executor, optional): The executor in which to
+            pickle and write the objects; None for the default executor of the running
+            event loop.
+
+    Raises:
+        ValueError: If the numbers of objects and paths differ.
+    """
+
+    objects = list(objects)
+    paths = list(paths)
+    if len(objects) != len(paths):
+        raise ValueError(f'Qube.dump_batch_async() received {len(objects)} objects '
+                         f'but {len(paths)} paths')
+
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[loop.run_in_executor(executor, _dump, obj, path, protocol)
+                           for (obj, path) in zip(objects, paths, strict=True)])
+
+
+@staticmethod
+async def load_batch_async(paths, executor=None):
+    """Unpickle an object from each of several files without blocking the event loop.
+
+    All of the files are submitted to the executor at once, so the work on each one
+    overlaps with the others, up to the number of workers in the executor.
+
+    Parameters:
+        paths (list or tuple): The paths of the files to read.
+        executor (concurrent.futures.Executor, optional): The executor in which to read
+            and unpickle the objects; None for the default executor of the running event
+            loop.
+
+    Returns:
+        list: The unpickled objects, in the order of the paths.
+    """
+
+    loop = asyncio.get_running_loop()
+    return list(await asyncio.gather(*[loop.run_in_executor(executor, _load, path)
+                                       for path in paths]))
+
+##########################################################################################
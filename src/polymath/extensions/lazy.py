@@ -0,0 +1,477 @@
+##########################################################################################
+# polymath/extensions/lazy.py: deferred evaluation of Qube arithmetic
+##########################################################################################
+
+import numbers
+import warnings
+import numpy as np
+
+from polymath.qube import Qube
+from polymath.unit import Unit
+
+__all__ = ['LazyQube', 'lazy']
+
+# Unary functions that can be deferred; each is a method of Scalar
+_UNARY_FUNCS = {
+    'sin' : np.sin,
+    'cos' : np.cos,
+    'tan' : np.tan,
+    'sqrt': np.sqrt,
+    'log' : np.log,
+    'exp' : np.exp,
+}
+
+
+def lazy(self):
+    """A deferred version of this object, for building an arithmetic expression that is
+    evaluated in a single pass.
+
+    Operations on the returned object do not compute anything. Instead, they record an
+    expression, which is checked for compatible units, shapes and items as it is built.
+    Calling `evaluate()` on the expression then computes the result, writing each
+    intermediate step into a buffer already allocated by an earlier step wherever it can,
+    and combining the masks of all the operands only once, at the end.
+
+    Returns:
+        LazyQube: The deferred version of this object.
+    """
+
+    return LazyQube._leaf(self)
+
+
+class LazyQube:
+    """A deferred arithmetic expression involving Qube objects.
+
+    A LazyQube is created by calling `lazy()` on a Qube. It supports the operators +, -, *
+    and /, negation, and the Scalar functions sin(), cos(), tan(), sqrt(), log() and
+    exp(). The operands can be other LazyQubes, Qubes, or Python numbers. Each operation
+    returns a new LazyQube; nothing is computed until `evaluate()` is called.
+
+    Multiplication and division are supported only when one operand is a number or has a
+    rank of zero, and the unary functions only when the operand is a Scalar without a
+    denominator. Anything else raises the same kind of exception that the immediate
+    operation would, as soon as the expression is built.
+
+    Masked values are treated exactly as they are by the immediate operations. Division
+    by zero, and the square root or log of an invalid value, are masked. If any operand
+    has derivatives, the expression is evaluated one operation at a time, exactly as it
+    would have been without deferral, so that the derivatives are also correct.
+
+    Attributes:
+        shape (tuple): Shape of the result.
+    """
+
+    def __init__(self, op, args, cls, shape, numer, denom, unit):
+        """Constructor for an expression node; use `Qube.lazy()` instead.
+
+        Parameters:
+            op (str): Name of the operation, "leaf" for a Qube or "number" for a Python
+                number.
+            args (tuple): The operands, which are LazyQubes except in the case of a leaf
+                or a number.
+            cls (type): Class of the result.
+            shape (tuple): Shape of the result.
+            numer (tuple): Numerator shape of the result.
+            denom (tuple): Denominator shape of the result.
+            unit (Unit or None): Unit of the result.
+        """
+
+        self._op = op
+        self._args = args
+        self._cls = cls
+        self.shape = shape
+        self._numer = numer
+        self._denom = denom
+        self._rank = len(numer) + len(denom)
+        self._unit = unit
+
+    @staticmethod
+    def _leaf(obj):
+        """Expression node for a Qube."""
+
+        return LazyQube('leaf', (obj,), type(obj), obj._shape, obj._numer, obj._denom,
+                        obj._unit)
+
+    @staticmethod
+    def _number(value):
+        """Expression node for a Python number."""
+
+        return LazyQube('number', (value,), Qube._SCALAR_CLASS, (), (), (), None)
+
+    @staticmethod
+    def _as_node(arg, op, other):
+        """Convert an operand to an expression node.
+
+        Parameters:
+            arg (LazyQube, Qube, array-like, int, or float): The operand.
+            op (str): Name of the operation, for an error message.
+            other (LazyQube): The other operand, for an error message.
+
+        Returns:
+            LazyQube: The operand as a node.
+
+        Raises:
+            TypeError: If the operand cannot be converted.
+        """
+
+        if isinstance(arg, LazyQube):
+            return arg
+
+        if isinstance(arg, Qube):
+            return LazyQube._leaf(arg)
+
+        if isinstance(arg, (numbers.Real, np.number)):
+            return LazyQube._number(arg)
+
+        try:
+            return LazyQube._leaf(Qube._SCALAR_CLASS.as_scalar(arg))
+        except (ValueError, TypeError):
+            raise TypeError(f'{Qube._opstr(other._cls, op)} operation is not supported '
+                            'in deferred evaluation') from None
+
+    def __repr__(self):
+        return f'LazyQube({self._op}, {self._cls.__name__}, shape={self.shape})'
+
+    ######################################################################################
+    # Expression building
+    ######################################################################################
+
+    def _binary(self, op, arg, *, swap=False):
+        """A new node for a binary operation, after validating the operands.
+
+        Parameters:
+            op (str): One of "+", "-", "*" or "/".
+            arg (LazyQube, Qube, array-like, int, or float): The other operand.
+            swap (bool, optional): True if `arg` is the left operand.
+
+        Returns:
+            LazyQube: The new node.
+
+        Raises:
+            TypeError: If the operation is not supported.
+            ValueError: If the operands have incompatible units, shapes or items.
+        """
+
+        arg = LazyQube._as_node(arg, op, self)
+        (left, right) = (arg, self) if swap else (self, arg)
+
+        if op in ('+', '-'):
+            if left._op == 'number' or right._op == 'number':
+                node = right if left._op == 'number' else left
+                if node._rank:
+                    raise TypeError(f'{Qube._opstr(node._cls, op)} operation with a '
+                                    'number is not supported in deferred evaluation')
+                (cls, numer, denom, unit) = (node._cls, (), (), node._unit)
+            else:
+                if left._numer != right._numer:
+                    raise ValueError('incompatible numerator shapes for '
+                                     f'{Qube._opstr(left._cls, op)}: {left._numer}, '
+                                     f'{right._numer}')
+                if left._denom != right._denom:
+                    raise ValueError('incompatible denominator shapes for '
+                                     f'{Qube._opstr(left._cls, op)}: {left._denom}, '
+                                     f'{right._denom}')
+                if not Unit.can_match(left._unit, right._unit):
+                    Unit.require_compatible(left._unit, right._unit,
+                                            info=Qube._opstr(left._cls, op))
+                unit = left._unit or right._unit
+                (cls, numer, denom) = (left._cls, left._numer, left._denom)
+
+        elif op == '*':
+            if left._op == 'number':
+                (cls, numer, denom) = (right._cls, right._numer, right._denom)
+            elif right._rank == 0:
+                (cls, numer, denom) = (left._cls, left._numer, left._denom)
+            elif left._rank == 0:
+                (cls, numer, denom) = (right._cls, right._numer, right._denom)
+            else:
+                raise TypeError(f'{Qube._opstr(left._cls, op)} operation is only '
+                                'supported with a rank-zero operand in deferred '
+                                'evaluation')
+            unit = Unit.mul_units(left._unit, right._unit)
+
+        else:
+            if right._rank:
+                raise TypeError(f'{Qube._opstr(left._cls, op)} operation is only '
+                                'supported with a rank-zero divisor in deferred '
+                                'evaluation')
+            (cls, numer, denom) = (left._cls, left._numer, left._denom)
+            unit = Unit.div_units(left._unit, right._unit)
+
+        shape = Qube.broadcasted_shape(left.shape, right.shape)
+        return LazyQube(op, (left, right), cls, shape, numer, denom, unit)
+
+    def _unary(self, func):
+        """A new node for a unary Scalar function, after validating the operand.
+
+        Parameters:
+            func (str): Name of the function.
+
+        Returns:
+            LazyQube: The new node.
+
+        Raises:
+            TypeError: If the operand is not a Scalar.
+            ValueError: If the operand has a denominator or an incompatible unit.
+        """
+
+        if not issubclass(self._cls, Qube._SCALAR_CLASS) or self._numer:
+            raise TypeError(f'{Qube._opstr(self._cls, func + "()")} operation is not '
+                            'supported')
+        if self._denom:
+            raise ValueError(f'Scalar.{func}() does not support denominators')
+
+        unit = None
+        if func in ('sin', 'cos', 'tan'):
+            if not Unit.is_angle(self._unit):
+                Unit.require_angle(self._unit, info=f'Scalar.{func}()')
+        elif func == 'exp':
+            if not Unit.is_unitless(self._unit):
+                Unit.require_unitless(self._unit, info='Scalar.exp()')
+        elif func == 'sqrt':
+            unit = Unit.sqrt_unit(self._unit)
+
+        return LazyQube(func, (self,), Qube._SCALAR_CLASS, self.shape, (), (), unit)
+
+    def __add__(self, arg):
+        return self._binary('+', arg)
+
+    def __radd__(self, arg):
+        return self._binary('+', arg, swap=True)
+
+    def __sub__(self, arg):
+        return self._binary('-', arg)
+
+    def __rsub__(self, arg):
+        return self._binary('-', arg, swap=True)
+
+    def __mul__(self, arg):
+        return self._binary('*', arg)
+
+    def __rmul__(self, arg):
+        return self._binary('*', arg, swap=True)
+
+    def __truediv__(self, arg):
+        return self._binary('/', arg)
+
+    def __rtruediv__(self, arg):
+        return self._binary('/', arg, swap=True)
+
+    def __neg__(self):
+        return LazyQube('neg', (self,), self._cls, self.shape, self._numer, self._denom,
+                        self._unit)
+
+    def sin(self):
+        """Deferred Scalar.sin()."""
+        return self._unary('sin')
+
+    def cos(self):
+        """Deferred Scalar.cos()."""
+        return self._unary('cos')
+
+    def tan(self):
+        """Deferred Scalar.tan()."""
+        return self._unary('tan')
+
+    def sqrt(self):
+        """Deferred Scalar.sqrt()."""
+        return self._unary('sqrt')
+
+    def log(self):
+        """Deferred Scalar.log()."""
+        return self._unary('log')
+
+    def exp(self):
+        """Deferred Scalar.exp()."""
+        return self._unary('exp')
+
+    ######################################################################################
+    # Evaluation
+    ######################################################################################
+
+    def _leaves(self, leaves):
+        """Fill in a dictionary of the Qubes in this expression, keyed by their IDs."""
+
+        if self._op == 'leaf':
+            leaves[id(self._args[0])] = self._args[0]
+        elif self._op != 'number':
+            for arg in self._args:
+                arg._leaves(leaves)
+
+        return leaves
+
+    def evaluate(self):
+        """Evaluate this expression.
+
+        Returns:
+            Qube: The result, identical to what the immediate operations would have
+            returned.
+        """
+
+        leaves = self._leaves({})
+        if any(leaf._derivs for leaf in leaves.values()):
+            return self._evaluate_eagerly()
+
+        masks = [leaf._mask for leaf in leaves.values()]
+        (values, _) = self._evaluate(masks)
+
+        return self._cls._new_from_parts(values, Qube.or_(*masks),
+                                         nrank=len(self._numer), drank=len(self._denom),
+                                         unit=self._unit)
+
+    def _evaluate_eagerly(self):
+        """Evaluate this expression one operation at a time."""
+
+        if self._op in ('leaf', 'number'):
+            return self._args[0]
+
+        if self._op == 'neg':
+            return -self._args[0]._evaluate_eagerly()
+
+        if self._op in _UNARY_FUNCS:
+            return getattr(self._args[0]._evaluate_eagerly(), self._op)()
+
+        left = self._args[0]._evaluate_eagerly()
+        right = self._args[1]._evaluate_eagerly()
+
+        # A number on the left is converted the same way Python would do it
+        if self._args[0]._op == 'number':
+            left = Qube._SCALAR_CLASS(left)
+
+        if self._op == '+':
+            return left + right
+        if self._op == '-':
+            return left - right
+        if self._op == '*':
+            return left * right
+        return left / right
+
+    def _evaluate(self, masks):
+        """The values of this expression.
+
+        Parameters:
+            masks (list): List of masks, to which any new masks generated by the
+                evaluation are appended.
+
+        Returns:
+            tuple: (values, temporary), where `values` is a NumPy array or number and
+            `temporary` is True if the array was allocated during this evaluation, and so
+            can be overwritten by the next step.
+        """
+
+        if self._op == 'leaf':
+            return (self._args[0]._values, False)
+
+        if self._op == 'number':
+            return (self._args[0], False)
+
+        if self._op == 'neg':
+            (values, temp) = self._args[0]._evaluate(masks)
+            return (np.negative(values, out=_out(values, temp, values)), True)
+
+        if self._op in _UNARY_FUNCS:
+            return self._evaluate_unary(masks)
+
+        (left, ltemp) = self._args[0]._evaluate(masks)
+        (right, rtemp) = self._args[1]._evaluate(masks)
+
+        if self._op == '/':
+            if self._args[1]._op == 'number':
+                if right == 0:
+                    masks.append(True)
+                    right = 1
+            else:
+                zeros = (right == 0)
+                if np.any(zeros):
+                    masks.append(zeros)
+                    if rtemp and isinstance(right, np.ndarray):
+                        right[zeros] = 1
+                    else:
+                        right = np.where(zeros, 1, right)
+                        rtemp = True
+
+        # Align the axes of a rank-zero operand with the item of the other
+        if self._op in ('*', '/'):
+            if self._args[1]._rank == 0 and np.shape(right) and self._args[0]._rank:
+                right = right.reshape(np.shape(right) + self._args[0]._rank * (1,))
+            elif self._args[0]._rank == 0 and np.shape(left) and self._args[1]._rank:
+                left = left.reshape(np.shape(left) + self._args[1]._rank * (1,))
+
+        if self._op == '+':
+            func = np.add
+        elif self._op == '-':
+            func = np.subtract
+        elif self._op == '*':
+            func = np.multiply
+        else:
+            func = np.true_divide
+
+        floats = (self._op == '/')
+        out = _out(left, ltemp, right, floats=floats)
+        if out is None:
+            out = _out(right, rtemp, left, floats=floats)
+
+        return (func(left, right, out=out), True)
+
+    def _evaluate_unary(self, masks):
+        """The values of a unary function, masking invalid inputs."""
+
+        (values, temp) = self._args[0]._evaluate(masks)
+
+        # Mask out invalid values, replacing them with one
+        if self._op in ('sqrt', 'log'):
+            invalid = (values < 0) if self._op == 'sqrt' else (values <= 0)
+            if np.any(invalid):
+                masks.append(invalid)
+                if temp and isinstance(values, np.ndarray):
+                    values[invalid] = 1
+                else:
+                    values = np.where(invalid, 1, values)
+                    temp = True
+
+        func = _UNARY_FUNCS[self._op]
+        out = _out(values, temp, values, floats=True)
+
+        if self._op != 'exp':
+            return (func(values, out=out), True)
+
+        with warnings.catch_warnings():
+            warnings.filterwarnings('error')
+            try:
+                return (func(values, out=out), True)
+            except RuntimeWarning as err:
+                raise ValueError('Scalar.exp() overflow encountered') from err
+
+
+def _out(values, temp, other, *, floats=False):
+    """The array to receive the result of an operation, or None if a new array is needed.
+
+    Parameters:
+        values (array-like): The operand that might be overwritten.
+        temp (bool): True if `values` was allocated during this evaluation.
+        other (array-like): The other operand, which determines the shape and dtype of the
+            result along with `values`.
+        floats (bool, optional): True if the operation always returns floats.
+
+    Returns:
+        (np.ndarray or None): `values` if the result can be written into it; otherwise
+        None.
+    """
+
+    if not temp or not isinstance(values, np.ndarray):
+        return None
+
+    dtype = np.result_type(values, other)
+    if floats and dtype.kind != 'f':
+        return None
+
+    if dtype != values.dtype:
+        return None
+
+    if np.shape(other) and np.broadcast_shapes(values.shape,
+                                               np.shape(other)) != values.shape:
+        return None
+
+    return values
+
+##########################################################################################
@@ -2,15 +2,17 @@
 # polymath/extensions/masking.py: Mask construction and object mask operations
 ##########################################################################################
 
+import math
 import numpy as np
 import numbers
 from polymath.qube import Qube
 
 __all__ = ['and_', 'as_all_masked', 'as_mask_where_nonzero',
            'as_mask_where_nonzero_or_masked', 'as_mask_where_zero',
-           'as_mask_where_zero_or_masked', 'as_one_masked', 'collapse_mask',
-           'count_masked', 'count_unmasked', 'expand_mask', 'is_all_masked',
-           'masked_single', 'or_', 'remask', 'remask_or', 'without_mask']
+           'as_mask_where_zero_or_masked', 'as_one_masked', 'as_packed_mask',
+           'as_sparse_mask', 'collapse_mask', 'count_masked', 'count_unmasked',
+           'expand_mask', 'is_all_masked', 'masked_single', 'or_', 'remask', 'remask_or',
+           'without_mask']
 
 ##########################################################################################
 # Mask construction
@@ -279,6 +281,10 @@ def is_all_masked(self):
 def count_masked(self):
     """The number of masked items in this object."""
 
+    compact = _compact_mask_of(self) if _COMPACT_MASKS else None
+    if compact is not None:
+        return compact.count()
+
     if isinstance(self._mask, np.ndarray):
         return np.sum(self._mask)
 
@@ -288,10 +294,7 @@ def count_masked(self):
 def count_unmasked(self):
     """The number of unmasked items in this object."""
 
-    if isinstance(self._mask, np.ndarray):
-        return self._size - np.sum(self._mask)
-
-    return 0 if self._mask else self._size
+    return self._size - self.count_masked()
 
 
 def masked_single(self, *, recursive=True):
@@ -532,6 +535,298 @@ def collapse_mask(self, *, recursive=True):
     return obj
 
 
+##########################################################################################
+# Compact masks
+##########################################################################################
+
+# True once any object has been given a sparse or packed mask; until then, operations skip
+# the check for one
+_COMPACT_MASKS = False
+
+
+class _SparseMask:
+    """The mask of an object, stored as the sorted flat indices of its masked elements.
+
+    Attributes:
+        index (numpy.ndarray): The read-only flat indices of the masked elements.
+        shape (tuple): The shape of the object.
+    """
+
+    def __init__(self, index, shape):
+        self.index = index
+        self.shape = shape
+        self.index.flags.writeable = False
+
+    def count(self):
+        """The number of masked elements."""
+
+        return self.index.size
+
+    def dense(self):
+        """This mask as a new boolean array."""
+
+        mask = np.zeros(self.shape, dtype=np.bool_)
+        mask.ravel()[self.index] = True
+        return mask
+
+    def __or__(self, other):
+        if other is self:               # can happen when objects share masks
+            return self
+        if isinstance(other, _SparseMask):
+            return _SparseMask(np.union1d(self.index, other.index), self.shape)
+        return other | self
+
+
+class _PackedMask:
+    """The mask of an object, stored with eight elements to the byte by `np.packbits`.
+
+    The padding bits after the last element are always zero.
+
+    Attributes:
+        words (numpy.ndarray): The read-only packed bytes of the flattened mask.
+        shape (tuple): The shape of the object.
+    """
+
+    def __init__(self, words, shape):
+        self.words = words
+        self.shape = shape
+        self.words.flags.writeable = False
+
+    @staticmethod
+    def from_array(mask):
+        """The packed form of a boolean array."""
+
+        return _PackedMask(np.packbits(mask, axis=None), mask.shape)
+
+    def count(self):
+        """The number of masked elements."""
+
+        return int(np.bitwise_count(self.words).sum())
+
+    def dense(self):
+        """This mask as a new boolean array."""
+
+        size = math.prod(self.shape)
+        mask = np.unpackbits(self.words, count=size).view(np.bool_)
+        return mask.reshape(self.shape)
+
+    def __or__(self, other):
+        if other is self:               # can happen when objects share masks
+            return self
+        if isinstance(other, _SparseMask):
+            words = self.words.copy()
+            np.bitwise_or.at(words, other.index >> 3,
+                             np.right_shift(0x80, other.index & 7).astype(np.uint8))
+            return _PackedMask(words, self.shape)
+        return _PackedMask(self.words | other.words, self.shape)
+
+
+def _compact_mask_of(obj):
+    """The sparse or packed mask of an object, or None if its mask is a bool or an array.
+
+    An object holds a compact mask in place of its "_mask" attribute. Reading "_mask"
+    converts it to an array, which then takes its place.
+    """
+
+    state = obj.__dict__
+    if '_mask' in state:
+        return None
+
+    return state.get('_compact_mask')
+
+
+def _set_compact_mask(obj, compact):
+    """Replace the mask of a new object with a compact mask."""
+
+    obj.__dict__.pop('_mask', None)
+    obj.__dict__['_compact_mask'] = compact
+    obj._cache.clear()
+
+
+def _dense_mask(obj):
+    """Convert the compact mask of an object to an array, on first access to "_mask"."""
+
+    compact = obj.__dict__.get('_compact_mask')
+    if compact is None:
+        return None
+
+    mask = compact.dense()
+    if obj._readonly:
+        Qube._array_to_readonly(mask)
+
+    mask = obj.__dict__.setdefault('_mask', mask)
+    obj.__dict__.pop('_compact_mask', None)
+    return mask
+
+
+def _as_compact_mask(self, recursive, convert):
+    """A shallow copy of this object with its mask array converted by a function."""
+
+    global _COMPACT_MASKS
+
+    if not isinstance(self._mask, np.ndarray):
+        return self if recursive else self.wod
+
+    _COMPACT_MASKS = True
+    compact = convert(self._mask)
+
+    obj = self.clone(recursive=False)
+    _set_compact_mask(obj, compact)
+
+    if recursive:
+        for key, deriv in self._derivs.items():
+            if deriv._mask is self._mask:
+                new_deriv = deriv.clone(recursive=False)
+                _set_compact_mask(new_deriv, compact)
+            else:
+                new_deriv = _as_compact_mask(deriv, False, convert)
+            obj.insert_deriv(key, new_deriv)
+
+    return obj
+
+
+def as_sparse_mask(self, *, recursive=True):
+    """A shallow copy of this object whose mask is stored as the flat indices of its
+    masked elements, rather than as a boolean array.
+
+    This saves memory and time for large objects with few masked elements. The arithmetic
+    operators and the Scalar functions such as :meth:`~Scalar.sin` combine sparse masks
+    by taking the union of their indices, and return objects with sparse masks. Reading
+    the :attr:`mask` of an object, or any other operation on it, converts its mask to an
+    array.
+
+    Parameters:
+        recursive (bool, optional): True to store the masks of the derivatives sparsely
+            too; False to strip derivatives.
+
+    Returns:
+        Qube: A shallow copy of this object. If its mask is a single value, this object
+            is returned as is.
+    """
+
+    return _as_compact_mask(self, recursive,
+                            lambda mask: _SparseMask(np.flatnonzero(mask), mask.shape))
+
+
+def as_packed_mask(self, *, recursive=True):
+    """A shallow copy of this object whose mask is stored with eight elements to the
+    byte, rather than as a boolean array.
+
+    This saves seven eighths of the memory of a mask array. The arithmetic operators and
+    the Scalar functions such as :meth:`~Scalar.sin` combine packed masks a byte at a
+    time, and return objects with packed masks; combined with a sparse mask from
+    :meth:`as_sparse_mask`, the result is packed. Reading the :attr:`mask` or
+    :attr:`antimask` of an object, or any other operation on it, converts its mask to an
+    array.
+
+    Parameters:
+        recursive (bool, optional): True to pack the masks of the derivatives too; False
+            to strip derivatives.
+
+    Returns:
+        Qube: A shallow copy of this object. If its mask is a single value, this object
+            is returned as is.
+    """
+
+    return _as_compact_mask(self, recursive, _PackedMask.from_array)
+
+
+def _unmasked_standin(obj):
+    """An object sharing the values of an object with a compact or False mask but having
+    no mask, with its derivatives likewise; None if the mask of any derivative differs
+    from that of the object.
+    """
+
+    compact = _compact_mask_of(obj)
+    result = type(obj)._new_from_parts(obj._values, False, nrank=obj._nrank,
+                                       drank=obj._drank, unit=obj._unit, example=obj)
+    for key, deriv in obj._derivs.items():
+        deriv_compact = _compact_mask_of(deriv)
+        if deriv_compact is None:
+            if not Qube.is_one_false(deriv._mask):
+                return None
+        elif deriv_compact is not compact:
+            return None
+
+        new_deriv = _unmasked_standin(deriv)
+        if new_deriv is None:
+            return None
+        result.insert_deriv(key, new_deriv)
+
+    return result
+
+
+def _apply_compact_mask(obj, compact):
+    """Combine a compact mask with the mask of a new object and of its derivatives."""
+
+    if Qube.is_one_false(obj._mask):
+        _set_compact_mask(obj, compact)
+    elif isinstance(obj._mask, np.ndarray):
+        mask = obj._mask | compact.dense()
+        if obj._readonly:
+            Qube._array_to_readonly(mask)
+        obj._mask = mask
+        obj._cache.clear()
+
+    for deriv in obj._derivs.values():
+        _apply_compact_mask(deriv, compact)
+
+
+def _compact_operation(func, self, args, kwargs):
+    """The result of an elementwise operation on operands with compact masks, computed
+    without converting the masks to arrays; None if the operands do not allow it.
+    """
+
+    shape = self._shape
+    operands = [self] + [arg for arg in args if isinstance(arg, Qube)]
+    compact_masks = []
+    for obj in operands:
+        if obj._shape != shape and obj._shape:
+            return None
+        compact = _compact_mask_of(obj)
+        if compact is not None:
+            compact_masks.append(compact)
+        elif not Qube.is_one_false(obj._mask):
+            return None
+
+    if not compact_masks:
+        return None
+
+    # A derivative of the result is masked like the result only if every masked operand
+    # has it; otherwise its mask depends on the operation
+    keys = set().union(*[obj._derivs.keys() for obj in operands])
+    if keys and any(obj._derivs.keys() != keys for obj in operands
+                    if _compact_mask_of(obj) is not None):
+        return None
+
+    for arg in args:
+        if not isinstance(arg, Qube) and np.shape(arg):
+            return None
+
+    standins = {}
+    for obj in operands:
+        standin = _unmasked_standin(obj)
+        if standin is None:
+            return None
+        standins[id(obj)] = standin
+
+    args = [standins[id(arg)] if isinstance(arg, Qube) else arg for arg in args]
+    result = func(standins[id(self)], *args, **kwargs)
+    if result._shape != shape:
+        return None
+
+    # Packed masks go first, so a union with any of them is packed
+    compact_masks.sort(key=lambda mask: isinstance(mask, _SparseMask))
+    compact = compact_masks[0]
+    for mask in compact_masks[1:]:
+        compact = compact | mask
+
+    if compact.count():
+        _apply_compact_mask(result, compact)
+
+    return result
+
+
 def as_mask_where_nonzero(self):
     """A boolean scalar or NumPy ndarray where values are nonzero and unmasked."""
 
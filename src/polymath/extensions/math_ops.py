@@ -6,6 +6,7 @@ import numpy as np
 import numbers
 from polymath.extensions.errors import (_raise_dual_denoms, _raise_incompatible_denoms,
                                         _raise_incompatible_numers, _raise_unsupported_op)
+from polymath.extensions.shrinker import _auto_shrink
 from polymath.qube import Qube, _NUMERIC_TYPES
 from polymath.unit import Unit
 
@@ -29,6 +30,7 @@ def __pos__(self, *, recursive=True):
     return self.clone(recursive=recursive)
 
 
+@_auto_shrink
 def __neg__(self, *, recursive=True):
     """-self, element-by-element negation.
 
@@ -51,6 +53,7 @@ def __neg__(self, *, recursive=True):
     return obj
 
 
+@_auto_shrink
 def __abs__(self, *, recursive=True):
     """abs(self), element-by-element absolute value.
 
@@ -82,11 +85,112 @@ def len(self):
 
     return self.__len__()
 
+##########################################################################################
+# Output objects
+##########################################################################################
+
+@staticmethod
+def _prep_out(out, cls, shape, item, op, *operands):
+    """The values array into which an operation can write its result, given the object
+    supplied as its `out` argument.
+
+    Parameters:
+        out (Qube): The object to receive the result.
+        cls (type): The class of which `out` must be an instance.
+        shape (tuple): The shape of the result.
+        item (tuple): The item shape of the result.
+        op (str): Name of the operation, for an error message.
+        *operands (Qube, array-like, or number): The operands of the operation.
+
+    Returns:
+        (np.ndarray or None): The values array of `out`; None if it shares memory with an
+        operand, in which case the result must be computed separately and then copied into
+        `out` using `_copy_out()`.
+
+    Raises:
+        TypeError: If `out` is not an instance of `cls`.
+        ValueError: If `out` is read-only, if it has the wrong shape or item, or if it is
+            shapeless.
+    """
+
+    if not isinstance(out, cls):
+        raise TypeError(f'invalid class for out in {Qube._opstr(cls, op)}: '
+                        f'{type(out).__name__}')
+
+    if out._shape != shape or out._item != item:
+        raise ValueError(f'invalid shape for out in {Qube._opstr(cls, op)}: '
+                         f'{out._shape + out._item}, {shape + item}')
+
+    out.require_writeable()
+
+    if not out._is_array:
+        raise ValueError(f'out in {Qube._opstr(cls, op)} must be an array')
+
+    for operand in operands:
+        if isinstance(operand, Qube) and np.may_share_memory(out._values,
+                                                             operand._values):
+            return None
+
+    return out._values
+
+
+@staticmethod
+def _fill_out(out, masks, unit):
+    """Complete an object into which an operation has written its values.
+
+    The mask and unit of the object are replaced, and its derivatives are removed.
+
+    Parameters:
+        out (Qube): The object containing the new values.
+        masks (list or tuple): The masks of the operands, to be combined with a logical
+            "or".
+        unit (Unit or None): The unit of the result.
+
+    Returns:
+        Qube: The object, updated.
+    """
+
+    mask = Qube.or_(*masks)
+    if isinstance(mask, np.ndarray) and mask.shape != out._shape:
+        mask = Qube._array_to_readonly(np.broadcast_to(mask, out._shape))
+
+    out._mask = mask
+    out._unit = unit
+    out.delete_derivs()
+    out._new_values()
+    out._cache.clear()
+    return out
+
+
+@staticmethod
+def _copy_out(result, out, op=None):
+    """Copy the result of an operation into the object supplied as its `out` argument.
+
+    Parameters:
+        result (Qube): The result.
+        out (Qube): The object to receive the result.
+        op (str, optional): Name of the operation. If given, `out` is first checked
+            against the class, shape and item of the result, as by `_prep_out()`; this is
+            used by operations that cannot write their values directly into `out`.
+
+    Returns:
+        Qube: The object, updated.
+    """
+
+    if op is not None:
+        Qube._prep_out(out, type(result), result._shape, result._item, op)
+
+    np.copyto(out._values, result._values)
+    Qube._fill_out(out, (result._mask,), result._unit)
+    out.insert_derivs(result._derivs)
+    return out
+
 ##########################################################################################
 # Addition
 ##########################################################################################
 
-def __add__(self, /, arg, *, recursive=True):
+@_auto_shrink
+def __add__(self, /, arg, *, recursive=True, out=None):
     """self + arg, element-by-element addition.
 
     Parameters:
@@ -95,13 +199,15 @@ def __add__(self, /, arg, *, recursive=True):
             For simple scalar operations (when self._rank == 0), Python numbers are
             handled directly for efficiency.
         recursive (bool, optional): True to include derivatives in return.
+        out (Qube, optional): A writable object of the same class, shape and item as the
+            result, into which the result is written in place of a new object.
 
     Returns:
         Qube: The sum.
     """
 
     # Handle a simple right-hand value...
-    if self._rank == 0 and isinstance(arg, _NUMERIC_TYPES):
+    if self._rank == 0 and isinstance(arg, _NUMERIC_TYPES) and out is None:
         obj = self._clone_new_values(recursive=recursive, retain_cache=True)
         obj._set_values(self._values + arg, retain_cache=True)
         return obj
@@ -127,10 +233,19 @@ def __add__(self, /, arg, *, recursive=True):
         _raise_incompatible_denoms('+', self, arg)
 
     # Construct the result
-    obj = type(self)._new_from_parts(self._values + arg._values,
-                                     Qube.or_(self._mask, arg._mask),
-                                     nrank=self._nrank, drank=self._drank,
-                                     unit=self._unit or arg._unit, example=self)
+    if out is None:
+        obj = type(self)._new_from_parts(self._values + arg._values,
+                                         Qube.or_(self._mask, arg._mask),
+                                         nrank=self._nrank, drank=self._drank,
+                                         unit=self._unit or arg._unit, example=self)
+    else:
+        values = Qube._prep_out(out, type(self), Qube.broadcasted_shape(self, arg),
+                                self._item, '+', self, arg)
+        if values is None:
+            return Qube._copy_out(self.__add__(arg, recursive=recursive), out)
+
+        np.add(self._values, arg._values, out=values)
+        obj = Qube._fill_out(out, (self._mask, arg._mask), self._unit or arg._unit)
 
     if recursive:
         obj.insert_derivs(obj._add_derivs(self, arg))
@@ -138,6 +253,7 @@ def __add__(self, /, arg, *, recursive=True):
     return obj
 
 
+@_auto_shrink
 def __radd__(self, /, arg, *, recursive=True):
     """arg + self, element-by-element addition.
 
@@ -227,7 +343,8 @@ def _add_derivs(self, /, arg1, arg2):
 # Subtraction
 ##########################################################################################
 
-def __sub__(self, /, arg, *, recursive=True):
+@_auto_shrink
+def __sub__(self, /, arg, *, recursive=True, out=None):
     """self - arg, element-by-element subtraction.
 
     Parameters:
@@ -236,13 +353,15 @@ def __sub__(self, /, arg, *, recursive=True):
             For simple scalar operations (when self._rank == 0), Python numbers are
             handled directly for efficiency.
         recursive (bool, optional): True to include derivatives in return.
+        out (Qube, optional): A writable object of the same class, shape and item as the
+            result, into which the result is written in place of a new object.
 
     Returns:
         Qube: The difference.
     """
 
     # Handle a simple right-hand value...
-    if self._rank == 0 and isinstance(arg, _NUMERIC_TYPES):
+    if self._rank == 0 and isinstance(arg, _NUMERIC_TYPES) and out is None:
         obj = self._clone_new_values(recursive=recursive, retain_cache=True)
         obj._set_values(self._values - arg, retain_cache=True)
         return obj
@@ -268,10 +387,19 @@ def __sub__(self, /, arg, *, recursive=True):
         _raise_incompatible_denoms('-', self, arg)
 
     # Construct the result
-    obj = type(self)._new_from_parts(self._values - arg._values,
-                                     Qube.or_(self._mask, arg._mask),
-                                     nrank=self._nrank, drank=self._drank,
-                                     unit=self._unit or arg._unit, example=self)
+    if out is None:
+        obj = type(self)._new_from_parts(self._values - arg._values,
+                                         Qube.or_(self._mask, arg._mask),
+                                         nrank=self._nrank, drank=self._drank,
+                                         unit=self._unit or arg._unit, example=self)
+    else:
+        values = Qube._prep_out(out, type(self), Qube.broadcasted_shape(self, arg),
+                                self._item, '-', self, arg)
+        if values is None:
+            return Qube._copy_out(self.__sub__(arg, recursive=recursive), out)
+
+        np.subtract(self._values, arg._values, out=values)
+        obj = Qube._fill_out(out, (self._mask, arg._mask), self._unit or arg._unit)
 
     if recursive:
         obj.insert_derivs(obj._sub_derivs(self, arg))
@@ -279,6 +407,7 @@ def __sub__(self, /, arg, *, recursive=True):
     return obj
 
 
+@_auto_shrink
 def __rsub__(self, /, arg, *, recursive=True):
     """arg - self, element-by-element subtraction.
 
@@ -375,7 +504,8 @@ def _sub_derivs(self, /, arg1, arg2):
 # Multiplication
 ##########################################################################################
 
-def __mul__(self, /, arg, *, recursive=True):
+@_auto_shrink
+def __mul__(self, /, arg, *, recursive=True, out=None):
     """self * arg, element-by-element multiplication.
 
     Parameters:
@@ -384,6 +514,8 @@ def __mul__(self, /, arg, *, recursive=True):
             For simple scalar operations (when self._rank == 0), Python numbers are
             handled directly for efficiency.
         recursive (bool, optional): True to include derivatives in return.
+        out (Qube, optional): A writable object of the same class, shape and item as the
+            result, into which the result is written in place of a new object.
 
     Returns:
         Qube: The product.
@@ -391,7 +523,7 @@ def __mul__(self, /, arg, *, recursive=True):
 
     # Handle multiplication by a number
     if Qube._is_one_value(arg):
-        return self._mul_by_number(arg, recursive=recursive)
+        return self._mul_by_number(arg, recursive=recursive, out=out)
 
     # Convert arg to a Scalar if necessary
     original_arg = arg
@@ -408,7 +540,7 @@ def __mul__(self, /, arg, *, recursive=True):
     # Multiply by scalar...
     if arg._nrank == 0:
         try:
-            return self._mul_by_scalar(arg, recursive=recursive)
+            return self._mul_by_scalar(arg, recursive=recursive, out=out)
 
         # Revise the exception if the arg was modified
         except (ValueError, TypeError):
@@ -418,17 +550,18 @@ def __mul__(self, /, arg, *, recursive=True):
 
     # Swap and try again
     if self._nrank == 0:
-        return arg._mul_by_scalar(self, recursive=recursive)
+        return arg._mul_by_scalar(self, recursive=recursive, out=out)
 
     # Multiply by matrix...
     if self._nrank == 2 and arg._nrank in (1, 2):
         return Qube.dot(self, arg, -1, 0, classes=(type(arg), type(self)),
-                        recursive=recursive)
+                        recursive=recursive, out=out)
 
     # Give up
     _raise_unsupported_op('*', self, original_arg)
 
 
+@_auto_shrink
 def __rmul__(self, /, arg, *, recursive=True):
     """arg * self, element-by-element multiplication.
 
@@ -522,11 +655,19 @@ def __imul__(self, /, arg):
     _raise_unsupported_op('*=', self, original_arg)
 
 
-def _mul_by_number(self, /, arg, *, recursive=True):
+def _mul_by_number(self, /, arg, *, recursive=True, out=None):
     """Internal multiply op when the arg is a Python scalar."""
 
-    obj = self._clone_new_values(recursive=False, retain_cache=True)
-    obj._set_values(self._values * arg, retain_cache=True)
+    if out is None:
+        obj = self._clone_new_values(recursive=False, retain_cache=True)
+        obj._set_values(self._values * arg, retain_cache=True)
+    else:
+        values = Qube._prep_out(out, type(self), self._shape, self._item, '*', self)
+        if values is None:
+            return Qube._copy_out(self._mul_by_number(arg, recursive=recursive), out)
+
+        np.multiply(self._values, arg, out=values)
+        obj = Qube._fill_out(out, (self._mask,), self._unit)
 
     if recursive and self._derivs:
         for key, deriv in self._derivs.items():
@@ -535,7 +676,7 @@ def _mul_by_number(self, /, arg, *, recursive=True):
     return obj
 
 
-def _mul_by_scalar(self, /, arg, *, recursive=True):
+def _mul_by_scalar(self, /, arg, *, recursive=True, out=None):
     """Internal multiply op when the arg is a Qube with nrank == 0 and no
     more than one object has a denominator."""
 
@@ -551,12 +692,22 @@ def _mul_by_scalar(self, /, arg, *, recursive=True):
         arg_values = arg_values.reshape(arg_shape)
 
     # Construct object
-    obj = type(self)._new_from_parts(self_values * arg_values,
-                                     Qube.or_(self._mask, arg._mask),
-                                     nrank=self._nrank,
-                                     drank=max(self._drank, arg._drank),
-                                     unit=Unit.mul_units(self._unit, arg._unit),
-                                     example=self)
+    unit = Unit.mul_units(self._unit, arg._unit)
+    if out is None:
+        obj = type(self)._new_from_parts(self_values * arg_values,
+                                         Qube.or_(self._mask, arg._mask),
+                                         nrank=self._nrank,
+                                         drank=max(self._drank, arg._drank),
+                                         unit=unit, example=self)
+    else:
+        item = self._numer + (self._denom if self._drank else arg._denom)
+        values = Qube._prep_out(out, type(self), Qube.broadcasted_shape(self, arg),
+                                item, '*', self, arg)
+        if values is None:
+            return Qube._copy_out(self._mul_by_scalar(arg, recursive=recursive), out)
+
+        np.multiply(self_values, arg_values, out=values)
+        obj = Qube._fill_out(out, (self._mask, arg._mask), unit)
 
     obj.insert_derivs(self._mul_derivs(arg))
     return obj
@@ -586,7 +737,8 @@ def _mul_derivs(self, /, arg):
 # Division
 ##########################################################################################
 
-def __truediv__(self, /, arg, *, recursive=True):
+@_auto_shrink
+def __truediv__(self, /, arg, *, recursive=True, out=None):
     """self / arg, element-by-element division.
 
     Cases of divide-by-zero are masked.
@@ -597,6 +749,8 @@ def __truediv__(self, /, arg, *, recursive=True):
             For simple scalar operations (when self._rank == 0), Python numbers are
             handled directly for efficiency.
         recursive (bool, optional): True to include derivatives in return.
+        out (Qube, optional): A writable object of the same class, shape and item as the
+            result, into which the result is written in place of a new object.
 
     Returns:
         Qube: The quotient.
@@ -604,7 +758,7 @@ def __truediv__(self, /, arg, *, recursive=True):
 
     # Handle division by a number
     if Qube._is_one_value(arg):
-        return self._div_by_number(arg, recursive=recursive)
+        return self._div_by_number(arg, recursive=recursive, out=out)
 
     # Convert arg to a Scalar if necessary
     original_arg = arg
@@ -622,7 +776,7 @@ def __truediv__(self, /, arg, *, recursive=True):
     # Divide by scalar...
     if arg._nrank == 0:
         try:
-            return self._div_by_scalar(arg, recursive=recursive)
+            return self._div_by_scalar(arg, recursive=recursive, out=out)
 
         # Revise the exception if the arg was modified
         except (ValueError, TypeError):
@@ -633,16 +787,18 @@ def __truediv__(self, /, arg, *, recursive=True):
     # Swap and multiply by reciprocal...
     if self._nrank == 0:
         return self.reciprocal(recursive=recursive)._mul_by_scalar(arg,
-                                                                   recursive=recursive)
+                                                                   recursive=recursive,
+                                                                   out=out)
 
     # Matrix / matrix is multiply by inverse matrix
     if self._rank == 2 and arg._rank == 2:
-        return self.__mul__(arg.reciprocal(recursive=recursive))
+        return self.__mul__(arg.reciprocal(recursive=recursive), out=out)
 
     # Give up
     _raise_unsupported_op('/', self, original_arg)
 
 
+@_auto_shrink
 def __rtruediv__(self, /, arg, *, recursive=True):
     """arg / self, element-by-element division.
 
@@ -722,16 +878,29 @@ def __itruediv__(self, /, arg):
     return self
 
 
-def _div_by_number(self, /, arg, *, recursive=True):
+def _div_by_number(self, /, arg, *, recursive=True, out=None):
     """Internal division op when the arg is a Python scalar."""
 
-    obj = self._clone_new_values(recursive=False, retain_cache=True)
+    if out is not None:
+        values = Qube._prep_out(out, type(self), self._shape, self._item, '/', self)
+        if values is None:
+            return Qube._copy_out(self._div_by_number(arg, recursive=recursive), out)
+
+        if arg == 0:
+            np.copyto(values, self._values)
+            obj = Qube._fill_out(out, (True,), self._unit)
+        else:
+            np.divide(self._values, arg, out=values)
+            obj = Qube._fill_out(out, (self._mask,), self._unit)
 
-    # Mask out zeros
-    if arg == 0:
-        obj._set_mask(True)
     else:
-        obj._set_values(self._values / arg, retain_cache=True)
+        obj = self._clone_new_values(recursive=False, retain_cache=True)
+
+        # Mask out zeros
+        if arg == 0:
+            obj._set_mask(True)
+        else:
+            obj._set_values(self._values / arg, retain_cache=True)
 
     if recursive and self._derivs:
         for key, deriv in self._derivs.items():
@@ -740,7 +909,7 @@ def _div_by_number(self, /, arg, *, recursive=True):
     return obj
 
 
-def _div_by_scalar(self, /, arg, *, recursive):
+def _div_by_scalar(self, /, arg, *, recursive, out=None):
     """Internal division op when the arg is a Qube with rank == 0."""
 
     # Mask out zeros
@@ -752,11 +921,20 @@ def _div_by_scalar(self, /, arg, *, recursive):
         arg_values = arg_values.reshape(arg.shape + self._rank * (1,))
 
     # Construct object
-    obj = type(self)._new_from_parts(self._values / arg_values,
-                                     Qube.or_(self._mask, arg._mask),
-                                     nrank=self._nrank, drank=self._drank,
-                                     unit=Unit.div_units(self._unit, arg._unit),
-                                     example=self)
+    unit = Unit.div_units(self._unit, arg._unit)
+    if out is None:
+        obj = type(self)._new_from_parts(self._values / arg_values,
+                                         Qube.or_(self._mask, arg._mask),
+                                         nrank=self._nrank, drank=self._drank,
+                                         unit=unit, example=self)
+    else:
+        values = Qube._prep_out(out, type(self), Qube.broadcasted_shape(self, arg),
+                                self._item, '/', self, arg)
+        if values is None:
+            return Qube._copy_out(self._div_by_scalar(arg, recursive=recursive), out)
+
+        np.divide(self._values, arg_values, out=values)
+        obj = Qube._fill_out(out, (self._mask, arg._mask), unit)
 
     if recursive:
         obj.insert_derivs(self._div_derivs(arg, nozeros=True))
@@ -799,6 +977,7 @@ def _div_derivs(self, /, arg, *, nozeros=False):
 # Floor Division (with no support for derivatives)
 ##########################################################################################
 
+@_auto_shrink
 def __floordiv__(self, /, arg):
     """self // arg, element-by-element floor division.
 
@@ -845,6 +1024,7 @@ def __floordiv__(self, /, arg):
 
 
 # Generic right floor division
+@_auto_shrink
 def __rfloordiv__(self, /, arg):
     """arg // self, element-by-element floor division.
 
@@ -960,6 +1140,7 @@ def _floordiv_by_scalar(self, /, arg):
 # Modulus operators (with no support for derivatives)
 ##########################################################################################
 
+@_auto_shrink
 def __mod__(self, /, arg, *, recursive=True):
     """self % arg, element-by-element modulus.
 
@@ -1007,6 +1188,7 @@ def __mod__(self, /, arg, *, recursive=True):
     _raise_unsupported_op('%', self, original_arg)
 
 
+@_auto_shrink
 def __rmod__(self, /, arg, *, recursive=True):
     """arg % self, element-by-element modulus.
 
@@ -1130,6 +1312,7 @@ def _mod_by_scalar(self, /, arg, *, recursive=True):
 # Exponentiation operator
 ##########################################################################################
 
+@_auto_shrink
 def __pow__(self, /, arg):
     """self ** arg, element-by-element exponentiation.
 
@@ -0,0 +1,401 @@
+##########################################################################################
+# polymath/extensions/numpy_ops.py: NumPy ufunc and array function protocols
+##########################################################################################
+
+import numpy as np
+
+from polymath.qube import Qube
+from polymath.unit import Unit
+
+__all__ = []
+
+# Binary ufuncs as (method, reflected method). For a reflected call, the Qube is the right
+# operand. A reflected method of None means that there is none, so a left operand that is
+# not a Qube is converted to a Scalar and the method is called on that.
+_BINARY_UFUNCS = {
+    np.add          : ('__add__', '__radd__'),
+    np.subtract     : ('__sub__', '__rsub__'),
+    np.multiply     : ('__mul__', '__rmul__'),
+    np.true_divide  : ('__truediv__', '__rtruediv__'),
+    np.floor_divide : ('__floordiv__', '__rfloordiv__'),
+    np.remainder    : ('__mod__', '__rmod__'),
+    np.power        : ('__pow__', None),
+    np.arctan2      : ('arctan2', None),
+    np.equal        : ('__eq__', '__eq__'),
+    np.not_equal    : ('__ne__', '__ne__'),
+    np.less         : ('__lt__', '__gt__'),
+    np.less_equal   : ('__le__', '__ge__'),
+    np.greater      : ('__gt__', '__lt__'),
+    np.greater_equal: ('__ge__', '__le__'),
+    np.logical_and  : ('__and__', '__rand__'),
+    np.logical_or   : ('__or__', '__ror__'),
+    np.logical_xor  : ('__xor__', '__rxor__'),
+}
+
+# Unary ufuncs and the methods that implement them
+_UNARY_UFUNCS = {
+    np.negative   : '__neg__',
+    np.positive   : '__pos__',
+    np.absolute   : '__abs__',
+    np.sin        : 'sin',
+    np.cos        : 'cos',
+    np.tan        : 'tan',
+    np.arcsin     : 'arcsin',
+    np.arccos     : 'arccos',
+    np.arctan     : 'arctan',
+    np.sqrt       : 'sqrt',
+    np.log        : 'log',
+    np.exp        : 'exp',
+    np.logical_not: 'logical_not',
+}
+
+# Methods that accept an out argument themselves
+_OUT_METHODS = {'__add__', '__sub__', '__mul__', '__truediv__', 'sin', 'cos', 'sqrt',
+                'log', 'exp'}
+
+# Binary methods for which the operands can be swapped
+_COMMUTATIVE = {'__add__', '__mul__'}
+
+
+def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+    """Support for NumPy ufuncs such as np.add() and np.sin() on Qube objects.
+
+    Each ufunc is carried out by the method that implements the same operation, so masks,
+    units and derivatives are handled exactly as they are by that method. For example,
+    `np.sin(x)` returns `x.sin()` and `np.subtract(array, x)` returns `x.__rsub__(array)`.
+    Where there is no reflected method, a left operand that is not a Qube is converted to
+    a Scalar, so `np.power(array, x)` returns `Scalar.as_scalar(array).__pow__(x)`.
+    Other elementwise ufuncs are applied directly to the values, but only to objects of
+    rank zero without units or derivatives.
+
+    The `out` argument can be a writable Qube of the same class and shape as the result.
+    The `where` argument selects the locations of the result to compute; other locations
+    keep their values in `out` or, if `out` is not given, are masked. The selection also
+    applies to the derivatives of `out`: at the selected locations they become those of
+    the result, or zero where the result lacks them, and elsewhere they are unchanged.
+
+    Parameters:
+        ufunc (numpy.ufunc): The ufunc.
+        method (str): The ufunc method; only "__call__" is supported.
+        *inputs: The inputs to the ufunc.
+        **kwargs: Keyword arguments to the ufunc; only `out` and `where` are supported.
+
+    Returns:
+        Qube or NotImplemented: The result of the operation; NotImplemented if the ufunc
+        or any of its arguments is not supported.
+    """
+
+    if method != '__call__' or ufunc.nout != 1:
+        return NotImplemented
+
+    out = kwargs.pop('out', None)
+    where = kwargs.pop('where', True)
+    if kwargs:
+        return NotImplemented
+
+    if out is not None:
+        if len(out) != 1 or not isinstance(out[0], Qube):
+            return NotImplemented
+        out = out[0]
+
+    if Qube.is_one_true(where):
+        where = True
+        target = out
+    else:
+        target = None       # where= is applied after the operation
+
+    # Identify the method and the object on which to call it
+    if ufunc in _UNARY_UFUNCS and len(inputs) == 1:
+        (obj, name, args) = (inputs[0], _UNARY_UFUNCS[ufunc], ())
+    elif ufunc in _BINARY_UFUNCS and len(inputs) == 2:
+        (name, rname) = _BINARY_UFUNCS[ufunc]
+        if isinstance(inputs[0], Qube):
+            (obj, args) = (inputs[0], (inputs[1],))
+        elif rname is None:
+            try:
+                left = Qube._SCALAR_CLASS.as_scalar(inputs[0])
+            except (ValueError, TypeError):
+                return NotImplemented
+            (obj, args) = (left, (inputs[1],))
+        elif name in _COMMUTATIVE and target is not None:
+            (obj, args) = (inputs[1], (inputs[0],))
+        else:
+            (obj, name, args) = (inputs[1], rname, (inputs[0],))
+    else:
+        return _generic_ufunc(ufunc, inputs, out, where)
+
+    func = getattr(obj, name, None)
+    if func is None:
+        return NotImplemented
+
+    # Evaluate
+    if target is not None and name in _OUT_METHODS:
+        return func(*args, out=target)
+
+    result = func(*args)
+    return _apply_out(result, out, where, ufunc.__name__)
+
+
+def _generic_ufunc(ufunc, inputs, out, where):
+    """Apply an elementwise ufunc to the values of rank-zero objects without units or
+    derivatives.
+
+    Returns:
+        Qube or NotImplemented: A Scalar or Boolean result; NotImplemented if any input
+        does not qualify.
+    """
+
+    values = []
+    masks = []
+    for arg in inputs:
+        if isinstance(arg, Qube):
+            if arg._rank or arg._derivs or not Unit.is_unitless(arg._unit):
+                return NotImplemented
+            values.append(arg._values)
+            masks.append(arg._mask)
+        else:
+            values.append(arg)
+
+    new_values = ufunc(*values)
+    if np.asarray(new_values).dtype.kind == 'b':
+        cls = Qube._BOOLEAN_CLASS
+    else:
+        cls = Qube._SCALAR_CLASS
+
+    result = cls._new_from_parts(new_values, Qube.or_(*masks), nrank=0)
+    return _apply_out(result, out, where, ufunc.__name__)
+
+
+def _apply_out(result, out, where, op):
+    """Apply the `out` and `where` arguments of a ufunc to a result already computed.
+
+    Parameters:
+        result (Qube or bool): The full result of the operation.
+        out (Qube or None): The object to receive the result, if any.
+        where (array-like, Boolean, or bool): The locations to receive the result.
+        op (str): Name of the ufunc, for an error message.
+
+    Returns:
+        Qube or bool: The result, or `out` after the result has been written into it.
+    """
+
+    if not isinstance(result, Qube):
+        if out is not None:
+            raise TypeError(f'out is not supported by {op}() for this operand')
+        return result
+
+    if where is not True:
+        where = Qube._BOOLEAN_CLASS.as_boolean(where).as_mask_where_nonzero()
+        where = np.broadcast_to(where, result._shape)
+
+        if out is None:
+            return result.mask_where(np.logical_not(where))
+
+        # Assignment by index writes the derivatives at the same locations, and zeros
+        # those of out that the result does not have
+        Qube._prep_out(out, type(result), result._shape, result._item, op)
+        out[where] = result[where]
+        return out
+
+    if out is None:
+        return result
+
+    values = Qube._prep_out(out, type(result), result._shape, result._item, op)
+    if values is None or result._values is not out._values:
+        Qube._copy_out(result, out)
+
+    return out
+
+
+def __array_function__(self, func, types, args, kwargs):
+    """Support for np.concatenate(), np.stack() and np.where() on Qube objects.
+
+    Other NumPy functions behave as they would without this protocol; for example,
+    np.sum(x) still returns x.sum().
+
+    Parameters:
+        func (function): The NumPy function.
+        types (tuple): The types of the arguments that implement this protocol.
+        args (tuple): Positional arguments to the function.
+        kwargs (dict): Keyword arguments to the function.
+
+    Returns:
+        The result of the function.
+    """
+
+    if func is np.concatenate:
+        return _concatenate(*args, **kwargs)
+
+    if func is np.stack:
+        return _stack(*args, **kwargs)
+
+    if func is np.where and len(args) + len(kwargs) == 3:
+        return _where(*args, **kwargs)
+
+    return func._implementation(*args, **kwargs)
+
+
+def _concatenate(arrays, axis=0, out=None, *, dtype=None, casting='same_kind'):
+    """np.concatenate() along a leading axis of Qube objects.
+
+    All the objects are converted to the class of the first Qube among them. Masks are
+    concatenated, and the derivatives are the union of all those found; a derivative that
+    is missing from one object is taken to be zero.
+    """
+
+    if out is not None or dtype is not None:
+        raise TypeError('out and dtype are not supported by concatenate() for Qube '
+                        'objects')
+
+    args = list(arrays)
+    template = next(arg for arg in args if isinstance(arg, Qube))
+    args = [template.as_this_type(arg, coerce=False) for arg in args]
+
+    unit = None
+    for arg in args:
+        if arg._numer != template._numer:
+            Qube._raise_incompatible_numers('concatenate()', template, arg)
+        if arg._denom != template._denom:
+            Qube._raise_incompatible_denoms('concatenate()', template, arg)
+        if arg._unit is not None:
+            if unit is None:
+                unit = arg._unit
+            else:
+                Unit.require_compatible(unit, arg._unit, template._opstr('concatenate()'))
+
+    if axis is None:
+        args = [arg.flatten() for arg in args]
+        axis = 0
+
+    ndims = template._ndims
+    if ndims == 0:
+        raise ValueError(f'{template._opstr("concatenate()")} does not support shapeless '
+                         'objects')
+
+    template._require_axis_in_range(axis, ndims, 'concatenate()')
+    axis %= ndims
+
+    new_values = np.concatenate([arg._values for arg in args], axis=axis)
+    if all(Qube.is_one_false(arg._mask) for arg in args):
+        new_mask = False
+    else:
+        new_mask = np.concatenate([np.broadcast_to(arg._mask, arg._shape)
+                                   for arg in args], axis=axis)
+
+    obj = type(template)._new_from_parts(new_values, new_mask, nrank=template._nrank,
+                                         drank=template._drank, unit=unit,
+                                         example=template)
+
+    for key in _deriv_keys(args):
+        derivs = _derivs_or_zeros(args, key)
+        obj.insert_deriv(key, _concatenate(derivs, axis=axis))
+
+    return obj
+
+
+def _stack(arrays, axis=0, out=None, *, dtype=None, casting='same_kind'):
+    """np.stack() of Qube objects, via Qube.stack()."""
+
+    if out is not None or dtype is not None:
+        raise TypeError('out and dtype are not supported by stack() for Qube objects')
+
+    obj = Qube.stack(*arrays)
+    if axis == 0:
+        return obj
+
+    obj._require_axis_in_range(axis, obj._ndims, 'stack()')
+    return obj.move_axis(0, axis)
+
+
+def _where(condition, x, y):
+    """np.where(condition, x, y) for Qube objects.
+
+    A masked condition produces a masked result. The derivatives are the union of those
+    found in `x` and `y`; a derivative that is missing from one is taken to be zero.
+    """
+
+    # Interpret the condition
+    if isinstance(condition, Qube):
+        condition = Qube._BOOLEAN_CLASS.as_boolean(condition)
+        (cond, cond_mask) = (condition._values, condition._mask)
+    else:
+        (cond, cond_mask) = (np.asarray(condition, dtype=np.bool_), False)
+
+    # Convert x and y to the same class
+    if isinstance(x, Qube):
+        template = x
+    elif isinstance(y, Qube):
+        template = y
+    else:
+        template = Qube._SCALAR_CLASS.as_scalar(x)
+
+    (x, y) = (template.as_this_type(x, coerce=False),
+              template.as_this_type(y, coerce=False))
+
+    if x._numer != y._numer:
+        Qube._raise_incompatible_numers('where()', x, y)
+    if x._denom != y._denom:
+        Qube._raise_incompatible_denoms('where()', x, y)
+    Unit.require_compatible(x._unit, y._unit, x._opstr('where()'))
+
+    # Select values and masks
+    item_cond = cond
+    if np.shape(cond) and x._rank:
+        item_cond = cond.reshape(np.shape(cond) + x._rank * (1,))
+
+    new_values = np.where(item_cond, x._values, y._values)
+
+    if x._mask is y._mask:
+        new_mask = x._mask
+    else:
+        new_mask = np.where(cond, x._mask, y._mask)
+    new_mask = Qube.or_(new_mask, cond_mask)
+
+    # The shape comes from all three, even where the values and masks do not need it
+    shape = Qube.broadcasted_shape(np.shape(cond), x, y)
+    new_mask = np.broadcast_to(new_mask, shape) if np.shape(new_mask) else new_mask
+    ndims = np.ndim(new_values) - x._rank
+    if ndims < len(shape):
+        new_values = np.broadcast_to(new_values, shape + x._item)
+
+    obj = type(template)._new_from_parts(new_values, new_mask, nrank=x._nrank,
+                                         drank=x._drank, unit=x._unit or y._unit,
+                                         example=template)
+
+    for key in _deriv_keys([x, y]):
+        (dx, dy) = _derivs_or_zeros([x, y], key)
+        obj.insert_deriv(key, _where(cond, dx, dy))
+
+    return obj
+
+
+def _deriv_keys(args):
+    """The union of the derivative keys of a list of objects, in order of appearance."""
+
+    keys = {}
+    for arg in args:
+        for key in arg._derivs:
+            keys[key] = None
+
+    return list(keys)
+
+
+def _derivs_or_zeros(args, key):
+    """The derivatives of a list of objects with the given key, with zeros in place of
+    any that are missing."""
+
+    example = next(arg._derivs[key] for arg in args if key in arg._derivs)
+
+    derivs = []
+    for arg in args:
+        if key in arg._derivs:
+            derivs.append(arg._derivs[key])
+        else:
+            values = np.zeros(arg._shape + example._item)
+            derivs.append(type(example)._new_from_parts(values, nrank=example._nrank,
+                                                        drank=example._drank,
+                                                        unit=example._unit))
+
+    return derivs
+
+##########################################################################################
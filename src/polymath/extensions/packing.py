@@ -0,0 +1,239 @@
+##########################################################################################
+# polymath/extensions/packing.py: batch pickling of many small Qube objects
+##########################################################################################
+"""This module supports the compact pickling of many small polymath objects.
+
+Results are often long lists of shapeless or small objects. Pickled one at a time, each
+object carries its own class, unit and ranks, and its arrays are too small to compress.
+Instead, :meth:`~polymath.Qube.pack` sorts a list of objects into groups that share a
+class, shape, item shape, dtype, unit and set of derivatives, and stacks each group into
+a single object with a new leading axis. The returned :class:`PackedQubes` container
+pickles each stacked object with the usual compression, and
+:meth:`~polymath.Qube.unpack` restores the original list. For example::
+
+    with open(path, 'wb') as f:
+        pickle.dump(Qube.pack(results), f)
+
+    with open(path, 'rb') as f:
+        results = Qube.unpack(pickle.load(f))
+"""
+
+import numpy as np
+
+from polymath.extensions.pickler import _unpickle_small
+from polymath.qube import Qube
+
+__all__ = ['PackedQubes', 'pack', 'unpack']
+
+# The per-object pickle settings that each group carries over to its stacked object
+_PICKLE_ATTRS = ('_pickle_digits', '_pickle_reference', '_pickle_codec')
+
+
+class PackedQubes:
+    """A picklable container for a list of objects, stacked into groups by class.
+
+    Attributes:
+        size (int): The number of objects in the list.
+        groups (list): One tuple (indices, stacked, readonly) for each group, where
+            indices is an array of the positions of the group's objects in the list,
+            stacked is an object whose leading axis indexes these objects, and readonly is
+            True if the objects are read-only.
+    """
+
+    def __init__(self, size, groups):
+        """Constructor for a PackedQubes object.
+
+        Parameters:
+            size (int): The number of objects in the list.
+            groups (list): The tuple (indices, stacked, readonly) for each group.
+        """
+
+        self.size = size
+        self.groups = groups
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f'PackedQubes({self.size} objects in {len(self.groups)} groups)'
+
+
+def _dtype_key(obj):
+    """The full dtype of an object's values, so that stacking never changes precision."""
+
+    return obj._values.dtype if obj._is_array else type(obj._values)
+
+
+def _group_key(obj):
+    """The key shared by every object that can be stacked with this one."""
+
+    derivs = tuple([(key, type(deriv), deriv._item, deriv._drank, _dtype_key(deriv),
+                     id(deriv._unit))
+                    for (key, deriv) in obj._derivs.items()]) if obj._derivs else ()
+    settings = tuple([getattr(obj, attr, None) for attr in _PICKLE_ATTRS])
+
+    # Units are compared by identity, because they are not hashable; objects with equal
+    # but distinct units simply fall into separate groups
+    return (type(obj), obj._shape, obj._item, obj._drank, _dtype_key(obj), id(obj._unit),
+            obj._readonly, derivs, settings)
+
+
+def _stack_masks(masks, shape):
+    """The masks of a group stacked along a new leading axis; False if none is masked."""
+
+    if shape:
+        stacked = np.array([np.broadcast_to(mask, shape) for mask in masks])
+    else:
+        stacked = np.array(masks, dtype='bool')
+
+    return stacked if stacked.any() else False
+
+
+def _split(array, count):
+    """The items along the leading axis of a stacked array, as Python scalars if possible.
+
+    A stacked mask of False splits into False for every object.
+    """
+
+    if not isinstance(array, np.ndarray):
+        return count * [array]
+
+    if array.ndim == 1:
+        return array.tolist()
+
+    return list(array)
+
+
+def _split_masks(mask, count):
+    """The masks of the objects in a group; False for each object with no masked value."""
+
+    masks = _split(mask, count)
+    if isinstance(mask, np.ndarray) and mask.ndim > 1:
+        masks = [mask if mask.any() else False for mask in masks]
+
+    return masks
+
+
+def _instances(cls, values, masks, nrank, drank, unit):
+    """New objects of one class from lists of values and masks.
+
+    Apart from their values, masks, caches and derivatives, the objects share every
+    attribute, so each one after the first is built from a copy of the first one's
+    dictionary. None of them is read-only.
+    """
+
+    first = _unpickle_small(cls, values[0], masks[0], nrank, drank, unit, False, {})
+    template = vars(first)
+    objects = [first]
+    for k in range(1, len(values)):
+        obj = Qube.__new__(cls)
+        state = template.copy()
+        state['_values'] = values[k]
+        state['_mask'] = masks[k]
+        state['_cache'] = {}
+        state['_derivs'] = {}
+        obj.__dict__ = state
+        objects.append(obj)
+
+    return objects
+
+
+@staticmethod
+def pack(objects):
+    """Stack a list of objects into groups, for compact and fast pickling.
+
+    Objects share a group if they have the same class, shape, item shape, dtype, unit,
+    read-only status, derivatives and pickle settings. Each group is stacked into one
+    object, which is pickled with the usual compression. Attributes added by
+    :meth:`add_attr` are not retained.
+
+    Parameters:
+        objects (list or tuple): The objects, each a Qube.
+
+    Returns:
+        PackedQubes: A picklable container from which :meth:`unpack` restores the list.
+
+    Raises:
+        TypeError: If any item is not a Qube.
+    """
+
+    objects = list(objects)
+    members = {}
+    for (index, obj) in enumerate(objects):
+        if not isinstance(obj, Qube):
+            raise TypeError('Qube.pack() requires Qube objects, not '
+                            f'{type(obj).__name__}')
+
+        members.setdefault(_group_key(obj), []).append(index)
+
+    groups = []
+    for (key, indices) in members.items():
+        group = [objects[i] for i in indices]
+        first = group[0]
+        shape = first._shape
+
+        stacked = type(first)._new_from_parts(
+            np.array([obj._values for obj in group]),
+            _stack_masks([obj._mask for obj in group], shape),
+            nrank=first._nrank, drank=first._drank, unit=first._unit)
+
+        for (attr, value) in zip(_PICKLE_ATTRS, key[-1], strict=True):
+            if value is not None:
+                setattr(stacked, attr, value)
+
+        derivs = {}
+        for (name, deriv) in first._derivs.items():
+            group_derivs = [obj._derivs[name] for obj in group]
+            derivs[name] = type(deriv)._new_from_parts(
+                np.array([d._values for d in group_derivs]),
+                _stack_masks([d._mask for d in group_derivs], shape),
+                nrank=deriv._nrank, drank=deriv._drank, unit=deriv._unit)
+        stacked.insert_derivs(derivs)
+
+        groups.append((np.array(indices), stacked, first._readonly))
+
+    return PackedQubes(len(objects), groups)
+
+
+@staticmethod
+def unpack(packed):
+    """Restore the list of objects from a container returned by :meth:`pack`.
+
+    Parameters:
+        packed (PackedQubes): The container.
+
+    Returns:
+        list: The objects, in their original order.
+
+    Raises:
+        TypeError: If `packed` is not a PackedQubes object.
+    """
+
+    if not isinstance(packed, PackedQubes):
+        raise TypeError('Qube.unpack() requires a PackedQubes object, not '
+                        f'{type(packed).__name__}')
+
+    objects = packed.size * [None]
+    for (indices, stacked, readonly) in packed.groups:
+        count = len(indices)
+        group = _instances(type(stacked), _split(stacked._values, count),
+                           _split_masks(stacked._mask, count), stacked._nrank,
+                           stacked._drank, stacked._unit)
+
+        for (name, deriv) in stacked._derivs.items():
+            derivs = _instances(type(deriv), _split(deriv._values, count),
+                                _split_masks(deriv._mask, count), deriv._nrank,
+                                deriv._drank, deriv._unit)
+            attr = 'd_d' + name
+            for (obj, obj_deriv) in zip(group, derivs, strict=True):
+                obj._derivs[name] = obj_deriv
+                setattr(obj, attr, obj_deriv)
+
+        for (index, obj) in zip(indices.tolist(), group, strict=True):
+            if readonly:
+                obj.as_readonly()
+            objects[index] = obj
+
+    return objects
+
+##########################################################################################
@@ -34,11 +34,16 @@ these functions are as follows:
 * "double": preserve full precision using lossless **fpzip** compression.
 * "single": convert the array to single precision and then store it using lossless
   **fpzip** compression.
-* an integer 7-16, defining the number of significant digits to preserve.
+* "raw": store the arrays exactly as they are, without compression. This applies to
+  integer and boolean arrays as well. Under pickle protocol 5, the arrays are passed as
+  out-of-band buffers, so transports such as `multiprocessing`, Dask and Ray can move
+  them without copying.
+* a number from 1 to 16, defining the number of significant digits to preserve.
 
 **reference** (`str or float`): How to interpret a numeric value of **digits**.
 
-* "fpzip": Use lossy **fpzip** compression, preserving the given number of digits.
+* "fpzip": Use lossy **fpzip** compression, preserving the given number of digits. The
+  relative error of every nonzero value is less than 10**(-digits).
 * a number: Preserve every number to the exact same absolute precision, scaling the number
   of **digits** by this value. For example, if **digits** = 8 and **reference** = 100,
   all values will be rounded to the nearest 1.e-6 before storage. This method uses option
@@ -64,20 +69,66 @@ number to be generated automatically.
   we want the precision to be based on the more "typical" values.
 * "logmean": Absolute accuracy will be 10**(-digits) times the log-mean of the absolute
   values in the array.
+* "auto": Every value keeps the given number of significant digits, as for "fpzip". A
+  sample of the array is encoded with lossy **fpzip**, with "smallest", and, when it
+  retains enough digits, with single precision; the method with the smallest output is
+  used, subject to the time budget set by :meth:`~polymath.Qube.set_pickle_auto_budget`.
+
+For a numeric reference and for each of these options except "auto", the absolute error
+of every value is at most half of this accuracy. Digits below single precision, such as 3
+to 5 for preview products, therefore store each value in one or two bytes before
+compression.
+
+Normally, the values, the mask and every derivative are decoded as soon as an object is
+unpickled. After a call to :meth:`~polymath.Qube.set_pickle_lazy`, the encoded arrays
+instead remain attached to the object, and each one is decoded the first time it is used.
+Reading only the shape or unit of an unpickled object then costs almost nothing, and
+reading one derivative does not decode the others.
+
+Backplanes derived from one observation usually share a single mask. To pickle such
+objects together, use :meth:`~polymath.Qube.dump_many` and
+:meth:`~polymath.Qube.load_many` in place of `pickle.dump` and `pickle.load`. Each
+distinct mask, whether shared by identity or merely equal in content, is then encoded
+once and decoded once.
+
+Successive frames of an image sequence often differ only slightly. Use
+:meth:`~polymath.Qube.set_pickle_delta` to pickle the values of an object as differences
+from those of a reference object; the differences compress far better than the values
+themselves. For frames pickled separately, register the reference by name with
+:meth:`~polymath.Qube.register_pickle_delta`. A reference given as an object is pickled
+along with each frame and only pays off when the frames are pickled together.
+
+Shapeless objects and objects with only a few values are never compressed. They are
+pickled as a short tuple of their class, values, mask, unit and derivatives, which is
+much smaller and faster to write and read than the full encoded state.
 """
 
 import bz2
 import fpzip
+import hashlib
+import lzma
 import math
 import numpy as np
 import numbers
+import os
+import pickle
 import sys
+import threading
+import time
 import warnings
+import zlib
 
+from concurrent.futures import ThreadPoolExecutor
+
+from polymath.extensions.masking import _dense_mask
 from polymath.qube import Qube
 
-__all__ = ['PICKLE_VERSION', 'fpzip_compress', 'fpzip_decompress', 'pickle_digits',
-           'pickle_reference', 'set_default_pickle_digits', 'set_pickle_digits']
+__all__ = ['PICKLE_VERSION', 'dump_many', 'fpzip_compress', 'fpzip_decompress',
+           'load_many', 'pickle_codec', 'pickle_digits', 'pickle_reference',
+           'register_pickle_codec', 'register_pickle_delta', 'set_default_pickle_codec',
+           'set_default_pickle_digits', 'set_pickle_auto_budget', 'set_pickle_codec',
+           'set_pickle_delta', 'set_pickle_digits', 'set_pickle_lazy',
+           'set_pickle_workers']
 
 PICKLE_VERSION = (1, 0)
 
@@ -88,12 +139,67 @@ _PICKLE_DEBUG = False   # If True, __setstate__ includes encoding info
 _DEFAULT_PICKLE_DIGITS = ('double', 'double')
 _DEFAULT_PICKLE_REFERENCE = ('fpzip', 'fpzip')
 
+# Compression codecs for integer, boolean, and scaled floating-point arrays, keyed by
+# name. Each value is a tuple (compress, decompress) of functions from bytes to bytes.
+_PICKLE_CODECS = {
+    'bz2' : (bz2.compress, bz2.decompress),
+    'zlib': (zlib.compress, zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+    'raw' : (bytes, bytes),
+}
+
+
+def _add_zstd_codec():
+    """Register the "zstd" codec if the zstandard module is installed."""
+
+    try:
+        import zstandard
+    except ImportError:                     # pragma: no cover
+        return
+
+    _PICKLE_CODECS['zstd'] = (zstandard.ZstdCompressor().compress,   # pragma: no cover
+                              zstandard.ZstdDecompressor().decompress)
+
+
+_add_zstd_codec()
+
+# The codec of every pickle written before codecs could be selected. It is not recorded
+# in the state, so that these pickles are unchanged.
+_BZ2 = 'bz2'
+_DEFAULT_PICKLE_CODEC = _BZ2
+
+# Reference objects for delta encoding, keyed by name
+_DELTA_REFERENCES = {}
+
+# True to defer decoding until the values, mask or a derivative is first used
+_PICKLE_LAZY = False
+
+# The masks shared by a batch of objects being pickled by dump_many() or unpickled by
+# load_many() in this thread
+_BATCH = threading.local()              # .masks is a _MaskTable, a list, or None
+_BATCH_HEADER = 'polymath.dump_many'
+
+# The reference "auto" test-encodes a sample of about this many values with each
+# candidate method, and the methods must fit within this budget in seconds per million
+# values; None for no limit
+_AUTO_SAMPLE_SIZE = 16384
+_PICKLE_AUTO_BUDGET = None
+
+# Default values of objects unpickled by the fast path, keyed by class, item shape,
+# denominator rank and type
+_SMALL_DEFAULTS = {}
+
+# Thread pool for encoding and decoding; None to work serially
+_PICKLE_EXECUTOR = None
+_PICKLE_THREAD = threading.local()      # .in_pool is True inside the pool's threads
+
 # Useful constants relevant to IEEE floats
 if sys.float_info.mant_dig != 53:       # pragma: no cover
     raise RuntimeError('polymath requires IEEE double-precision floats; this platform '
                        f'has a {sys.float_info.mant_dig}-bit mantissa')
 _SINGLE_DIGITS = np.log10(2**23)    # 6.92
 _DOUBLE_DIGITS = np.log10(2**52)    # 15.65
+_MIN_DIGITS = 1.                    # fpzip retains at least four bits of mantissa
 _LOG10_BIT = np.log10(2.)
 
 @staticmethod
@@ -106,18 +212,20 @@ def set_pickle_digits(self, digits='double', reference='fpzip'):
     """Set the desired number of decimal digits of precision in the storage of this
     object's floating-point values and their derivatives.
 
-    This attribute is ignored for integer and boolean values. The method will still
-    set the attribute on the object, but it will not be used during pickling of
-    integer or boolean arrays.
+    This attribute is ignored for integer and boolean values, except that "raw" stores
+    them without compression as well. The method will still set the attribute on the
+    object, but it will not otherwise be used during pickling of integer or boolean
+    arrays.
 
     Parameters:
         digits (int, float, str or tuple, optional):
             The number of digits to preserve when pickling this object. If two values are
             given, the second applies to any derivatives. If a number is specified, this
             is the number of decimal digits to preserve when this object is pickled. It
-            need not be an integer. It is truncated to the range supported by single and
-            double precision. Alternatively, use "double" to preserve full double
-            precision; use "single" for single precision.
+            need not be an integer. It is truncated to the range 1 to 15.65, the limit
+            of double precision. Alternatively, use "double" to preserve full double
+            precision; use "single" for single precision; use "raw" to store the arrays
+            without any compression.
 
         reference (int, float, str or tuple, optional):
             A value defining the number to use when assessing how many digits are
@@ -126,7 +234,7 @@ def set_pickle_digits(self, digits='double', reference='fpzip'):
             For example, if the `reference=100` and `digits=8`, the absolute precision
             will be 1.e-6. Alternatively, use one of these strings to let the precision be
             referenced to the values in the array: "smallest", "largest", "mean",
-            "median", "logmean", or "fpzip".
+            "median", "logmean", "fpzip", or "auto".
 
     Notes:
         The reference options are:
@@ -144,6 +252,14 @@ def set_pickle_digits(self, digits='double', reference='fpzip'):
               should not dominate the precision determination.
             * "logmean": Reference the mean of the log of absolute values.
             * "fpzip": Employ fpzip compression.
+            * "auto": Preserve the digits in every value, as "fpzip" does, using
+              whichever of lossy fpzip, "smallest", or single precision encodes a sample
+              of the array most compactly within the time budget set by
+              :meth:`set_pickle_auto_budget`.
+
+        With "fpzip", the relative error of every nonzero value is less than
+        10**(-digits). Otherwise, the absolute error of every value is at most half of
+        10**(-digits) times the reference value.
     """
 
     reference = _validate_pickle_reference(reference)
@@ -172,9 +288,10 @@ def set_default_pickle_digits(digits='double', reference='fpzip'):
             The number of digits to preserve when pickling this object. If two values are
             given, the second applies to any derivatives. If a number is specified, this
             is the number of decimal digits to preserve when this object is pickled. It
-            need not be an integer. It is truncated to the range supported by single and
-            double precision. Alternatively, use "double" to preserve full double
-            precision; use "single" for single precision.
+            need not be an integer. It is truncated to the range 1 to 15.65, the limit
+            of double precision. Alternatively, use "double" to preserve full double
+            precision; use "single" for single precision; use "raw" to store the arrays
+            without any compression.
         reference (int, float, str or tuple, optional):
             A value defining the number to use when assessing how many digits are
             preserved. If two values are given, the second applies to any derivatives. If
@@ -182,7 +299,7 @@ def set_default_pickle_digits(digits='double', reference='fpzip'):
             For example, if the `reference=100` and `digits=8`, the precision will be
             1.e-6. Alternatively, use one of these strings to let the precision be
             referenced to the values in the array: "smallest", "largest", "mean",
-            "median", "logmean", or "fpzip".
+            "median", "logmean", "fpzip", or "auto".
 
     Notes:
         The reference options are:
@@ -200,6 +317,10 @@ def set_default_pickle_digits(digits='double', reference='fpzip'):
               should not dominate the precision determination.
             * "logmean": Reference the mean of the log of absolute values.
             * "fpzip": Employ fpzip compression.
+            * "auto": Preserve the digits in every value, as "fpzip" does, using
+              whichever of lossy fpzip, "smallest", or single precision encodes a sample
+              of the array most compactly within the time budget set by
+              :meth:`set_pickle_auto_budget`.
     """
 
     global _DEFAULT_PICKLE_DIGITS, _DEFAULT_PICKLE_REFERENCE
@@ -209,13 +330,361 @@ def set_default_pickle_digits(digits='double', reference='fpzip'):
     _DEFAULT_PICKLE_DIGITS = _validate_pickle_digits(digits, reference)
 
 
+@staticmethod
+def set_pickle_auto_budget(budget=None):
+    """Set the time budget for choosing a floating-point encoding automatically.
+
+    When the pickle reference is "auto", a sample of each floating-point array is encoded
+    with every candidate method and timed. The method giving the smallest output is used,
+    among those whose encoding time, scaled from the sample to the whole array, is within
+    the budget. If none is, the fastest is used.
+
+    Parameters:
+        budget (float or None, optional): The time allowed for encoding, in seconds per
+            million values; None for no limit.
+
+    Raises:
+        ValueError: If `budget` is not a positive number or None.
+    """
+
+    global _PICKLE_AUTO_BUDGET
+
+    if budget is not None and (not isinstance(budget, numbers.Real) or budget <= 0):
+        raise ValueError(f'invalid pickle time budget: {budget!r}')
+
+    _PICKLE_AUTO_BUDGET = budget
+
+
+def set_pickle_codec(self, codec=None):
+    """Set the compression codec used when pickling this object and its derivatives.
+
+    The codec compresses integer and boolean arrays, masks, and floating-point arrays that
+    are stored as scaled integers. Floating-point arrays compressed by fpzip are not
+    affected. The codec is recorded in the pickle, so any codec can be read back as long
+    as it is available where the pickle is loaded.
+
+    Parameters:
+        codec (str, optional): The name of a codec: "bz2", "zlib", "lzma", "raw" for no
+            compression, "zstd" if the `zstandard` module is installed, or a name
+            registered with :meth:`register_pickle_codec`. None to use the default set
+            by :meth:`set_default_pickle_codec`.
+
+    Raises:
+        ValueError: If the codec is unknown.
+    """
+
+    if codec is not None:
+        _require_pickle_codec(codec)
+
+    for obj in (self,) + tuple(self._derivs.values()):
+        if codec is not None:
+            obj._pickle_codec = codec
+        elif hasattr(obj, '_pickle_codec'):
+            del obj._pickle_codec           # leaves the pickle as it was without one
+
+
+@staticmethod
+def set_default_pickle_codec(codec='bz2'):
+    """Set the default compression codec used when pickling.
+
+    Parameters:
+        codec (str, optional): The name of a codec, as for :meth:`set_pickle_codec`.
+
+    Raises:
+        ValueError: If the codec is unknown.
+    """
+
+    global _DEFAULT_PICKLE_CODEC
+
+    _require_pickle_codec(codec)
+    _DEFAULT_PICKLE_CODEC = codec
+
+
+def pickle_codec(self):
+    """The compression codec to use when pickling this object.
+
+    Returns:
+        str: The name of the codec.
+    """
+
+    return getattr(self, '_pickle_codec', None) or _DEFAULT_PICKLE_CODEC
+
+
+@staticmethod
+def register_pickle_codec(name, compress, decompress):
+    """Register a compression codec for pickling.
+
+    Parameters:
+        name (str): The name of the codec.
+        compress (function): A function that takes a bytes-like object and returns the
+            compressed bytes.
+        decompress (function): A function that reverses `compress`.
+    """
+
+    _PICKLE_CODECS[name] = (compress, decompress)
+
+
+def _require_pickle_codec(codec):
+    """Raise a ValueError if the codec is unknown."""
+
+    if not isinstance(codec, str) or codec not in _PICKLE_CODECS:
+        raise ValueError(f'unknown pickle codec: {codec!r}')
+
+
+def _compress(data, codec):
+    """Compress a bytes-like object using the named codec."""
+
+    return _PICKLE_CODECS[codec][0](data)
+
+
+def _decompress(data, codec):
+    """Decompress bytes using the named codec."""
+
+    try:
+        decompress = _PICKLE_CODECS[codec][1]
+    except KeyError:
+        raise ValueError(f'pickle codec is not available: {codec!r}') from None
+
+    return decompress(data)
+
+
+def _codec_suffix(codec):
+    """The items to append to an encoding tuple to record the codec.
+
+    Nothing is recorded for BZ2, so that these encodings are unchanged from those written
+    before the codec could be selected.
+    """
+
+    return () if codec == _BZ2 else (codec,)
+
+
+def set_pickle_delta(self, reference=None):
+    """Pickle the values of this object as differences from those of a reference object.
+
+    The differences are encoded like the values would be. The digits of floating-point
+    precision apply to the differences, so lossy encoding loses no more absolute accuracy
+    than it would for the values themselves.
+
+    The differences are taken from the values of the reference exactly as unpickling the
+    reference reproduces them, so the reference must be available, unchanged, wherever
+    this object is unpickled.
+
+    A reference given by name is not pickled at all; it must be registered with
+    :meth:`register_pickle_delta` wherever the pickle is written or read. This is the
+    form to use for frames that are pickled separately, such as one file per frame.
+
+    A reference given as an object is pickled inside the state of this object. Because
+    pickle stores each object only once per call, one reference can serve every frame of
+    a sequence pickled together in a single call to `pickle.dump` or
+    :meth:`dump_many`. However, each separate pickle of this object carries the full
+    reference, which makes it larger than it would be without delta encoding.
+
+    The values are pickled as usual if they are not an array of floats or integers, if
+    the shape, item or type of the reference differs, or if the digits are "double" and
+    the values cannot be recovered exactly from the floating-point differences.
+    Derivatives are always pickled as usual.
+
+    Parameters:
+        reference (Qube, str, or None): The reference object; the name of a registered
+            reference; None to stop encoding differences.
+
+    Raises:
+        TypeError: If `reference` is not a Qube, str, or None.
+        ValueError: If `reference` is this object or is a name that is not registered.
+    """
+
+    if reference is None:
+        if hasattr(self, '_pickle_delta'):
+            del self._pickle_delta
+        return
+
+    if _delta_reference(reference) is self:
+        raise ValueError('an object cannot be its own delta reference')
+
+    self._pickle_delta = reference
+
+
+@staticmethod
+def register_pickle_delta(name, reference):
+    """Register a reference object for delta encoding under a name.
+
+    Parameters:
+        name (str): The name by which :meth:`set_pickle_delta` and pickles refer to the
+            reference.
+        reference (Qube or None): The reference object; None to remove the name.
+    """
+
+    if reference is None:
+        _DELTA_REFERENCES.pop(name, None)
+    else:
+        _DELTA_REFERENCES[name] = reference
+
+
+def _delta_reference(reference):
+    """The reference object for delta encoding, given the object or its name."""
+
+    if isinstance(reference, Qube):
+        return reference
+
+    if not isinstance(reference, str):
+        raise TypeError(f'invalid delta reference: {type(reference).__name__}')
+
+    if reference not in _DELTA_REFERENCES:
+        raise ValueError(f'delta reference is not registered: {reference!r}')
+
+    return _DELTA_REFERENCES[reference]
+
+
+def _delta_base(reference):
+    """The values of a delta reference, exactly as unpickling the reference reproduces
+    them.
+
+    The writer and the reader of a pickle obtain the same values this way, even if the
+    reference has masked elements or is pickled with lossy encoding.
+    """
+
+    if not Qube._DISABLE_CACHE and 'pickle_delta_base' in reference._cache:
+        return reference._cache['pickle_delta_base']
+
+    # The round trip stands alone, outside any batch being pickled in this thread
+    saved = getattr(_BATCH, 'masks', None)
+    _BATCH.masks = None
+    try:
+        state = pickle.dumps(reference.wod, protocol=pickle.HIGHEST_PROTOCOL)
+        base = pickle.loads(state)._values
+    finally:
+        _BATCH.masks = saved
+
+    reference._cache['pickle_delta_base'] = base
+    return base
+
+
+def _delta_residual(obj, values, delta, antimask, digits):
+    """The differences between the values of an object and those of its delta reference;
+    None if delta encoding does not apply.
+
+    Parameters:
+        obj (Qube): The object.
+        values (np.ndarray): The values to be encoded, with the antimask applied if it is
+            not None.
+        delta (Qube or str): The reference object or its registered name.
+        antimask (np.ndarray or None): The antimask applied to the values.
+        digits (str or int): The digits of floating-point precision.
+    """
+
+    reference = _delta_reference(delta)
+    dtype = obj.dtype()
+    if (dtype not in ('float', 'int')
+            or reference._shape != obj._shape
+            or reference._item != obj._item
+            or reference.dtype() != dtype):
+        return None
+
+    base = _delta_base(reference)
+    if antimask is not None:
+        base = base[antimask]
+
+    residual = values - base
+
+    # Floating-point subtraction is not always exactly reversible
+    if (dtype == 'float' and digits == 'double'
+            and not np.array_equal(residual + base, values, equal_nan=True)):
+        return None
+
+    return residual
+
+
+@staticmethod
+def set_pickle_workers(workers=1):
+    """Set the number of threads used to encode and decode arrays during pickling.
+
+    The item components of a floating-point array are encoded separately, as are the
+    derivatives of an object. With more than one worker, these independent jobs run in a
+    pool of threads; fpzip and BZ2 release the GIL, so they run in parallel. The pickled
+    bytes are identical to those of serial encoding.
+
+    Parameters:
+        workers (int, optional): The number of threads; 1 to encode and decode serially;
+            None to use the number of CPUs.
+
+    Raises:
+        ValueError: If `workers` is less than one.
+    """
+
+    global _PICKLE_EXECUTOR
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers < 1:
+        raise ValueError(f'invalid number of pickle workers: {workers}')
+
+    if _PICKLE_EXECUTOR is not None:
+        _PICKLE_EXECUTOR.shutdown(wait=False)
+
+    if workers == 1:
+        _PICKLE_EXECUTOR = None
+    else:
+        _PICKLE_EXECUTOR = ThreadPoolExecutor(max_workers=workers,
+                                              thread_name_prefix='polymath-pickle',
+                                              initializer=_init_pickle_thread)
+
+
+def _init_pickle_thread():
+    _PICKLE_THREAD.in_pool = True
+
+
+def _pickle_map(func, args, *, batch=False):
+    """The list of func(arg) for each arg, computed in the pickle thread pool if one is
+    defined.
+
+    Calls made from inside the pool run serially, so that a job never waits on jobs queued
+    behind it.
+
+    Parameters:
+        func (callable): The function to apply.
+        args (iterable): The arguments.
+        batch (bool, optional): True if func pickles or unpickles whole objects, which
+            use the mask table of any batch in progress. That table belongs to this
+            thread, so the calls then run serially, in order.
+    """
+
+    args = list(args)
+    executor = _PICKLE_EXECUTOR
+    if executor is None or len(args) < 2 or getattr(_PICKLE_THREAD, 'in_pool', False):
+        return [func(arg) for arg in args]
+
+    if batch and getattr(_BATCH, 'masks', None) is not None:
+        return [func(arg) for arg in args]
+
+    return list(executor.map(func, args))
+
+
+@staticmethod
+def set_pickle_lazy(lazy=True):
+    """Defer the decoding of unpickled objects until their arrays are first used.
+
+    When lazy, unpickling an object decodes nothing. Its mask is decoded on the first
+    access to the mask, its values on the first access to the values, and each derivative
+    on the first access to that derivative's values or mask. The shape, unit and other
+    attributes are available immediately.
+
+    Parameters:
+        lazy (bool, optional): True to decode lazily; False to decode every object in
+            full as it is unpickled.
+    """
+
+    global _PICKLE_LAZY
+    _PICKLE_LAZY = bool(lazy)
+
+
 def pickle_digits(self):
     """The digits of floating-point precision to include when pickling this object and its
     derivatives.
 
     Returns:
-        (str, float, or int): One of "double", "single", or a number of digits roughly in
-        the range 7-16.
+        (str, float, or int): One of "double", "single", "raw", or a number of digits
+        roughly in the range 7-16.
     """
 
     if not hasattr(self, '_pickle_digits') or self._pickle_digits is None:
@@ -230,7 +699,7 @@ def pickle_reference(self):
 
     Returns:
         (str, float, or int): One of "fpzip", "smallest", "largest", "mean", "median",
-        "logmean", or a number.
+        "logmean", "auto", or a number.
     """
 
     if (not hasattr(self, '_pickle_reference')
@@ -271,18 +740,18 @@ def _validate_pickle_digits(digits, reference):
     Parameters:
         digits (int, float, str, list, tuple, or None): A single value, or one value for
             an object and a second for its derivatives. Each value is a number of decimal
-            digits, "single", or "double". Use None for "double". Values beyond the first
-            two are ignored.
+            digits, "single", "double", or "raw". Use None for "double". Values beyond the
+            first two are ignored.
         reference (tuple): The validated pickle reference values, as returned by
             _validate_pickle_reference().
 
     Returns:
         tuple: The validated digit values. A number of digits is truncated to the range
-        that single and double precision can represent, unless the reference value that
-        applies to it is itself a number.
+        from _MIN_DIGITS to the limit of double precision, unless the reference value
+        that applies to it is itself a number.
 
     Raises:
-        ValueError: If a value is neither a number nor "single" or "double".
+        ValueError: If a value is neither a number nor "single", "double", or "raw".
         ValueError: If a value is a number but `reference` provides no value to match it.
     """
 
@@ -301,11 +770,11 @@ def _validate_pickle_digits(digits, reference):
             if k >= len(reference):
                 raise ValueError(f'missing pickle reference for digits: {digit!r}')
             if not isinstance(reference[k], numbers.Real):
-                digit = min(max(_SINGLE_DIGITS, float(digit)), _DOUBLE_DIGITS)
+                digit = min(max(_MIN_DIGITS, float(digit)), _DOUBLE_DIGITS)
 
         # The alternatives are a tuple rather than a set so that an unhashable value
         # compares unequal instead of raising a TypeError
-        elif digit not in ('single', 'double'):
+        elif digit not in ('single', 'double', 'raw'):
             raise ValueError(f'invalid pickle digits: {digit!r}')
 
         new_digits.append(digit)
@@ -319,8 +788,8 @@ def _validate_pickle_reference(references):
     Parameters:
         references (int, float, str, list, tuple, or None): A single value, or one value
             for an object and a second for its derivatives. Each value is a number or one
-            of "smallest", "largest", "mean", "median", "logmean", or "fpzip". Use None
-            for "fpzip". Values beyond the first two are ignored.
+            of "smallest", "largest", "mean", "median", "logmean", "fpzip", or "auto".
+            Use None for "fpzip". Values beyond the first two are ignored.
 
     Returns:
         tuple: The validated reference values.
@@ -345,7 +814,7 @@ def _validate_pickle_reference(references):
         # compares unequal instead of raising a TypeError
         if (not isinstance(reference, numbers.Real)
                 and reference not in ('smallest', 'largest', 'mean', 'median', 'logmean',
-                                      'fpzip')):
+                                      'fpzip', 'auto')):
             raise ValueError(f'invalid pickle reference {reference!r}')
 
     return references
@@ -437,6 +906,9 @@ def fpzip_compress(array, digits=16, dtype=np.float64):
                 raise
 
         else:
+            # Compensate only for the bits actually zeroed
+            zeroed_bits = 8 * dtype.itemsize - precision
+
             # Raise any warnings
             if _PICKLE_WARNINGS and first_exception is not None:
                 if precision != initial_precision:
@@ -501,7 +973,7 @@ def fpzip_decompress(fpzip_bytes, shape, bits):
 # Support for compression using integers plus an offset and scale factor
 ################################################################################
 
-def _encode_one_float_array(values, digits, reference):
+def _encode_one_float_array(values, digits, reference, codec=_BZ2):
     """Encode one array into a tuple for the specified digits precision.
 
     Parameters:
@@ -509,6 +981,7 @@ def _encode_one_float_array(values, digits, reference):
         digits (float): Number of digits to preserve.
         reference (str or float): One of 'smallest', 'largest', 'mean', 'median',
             'logmean', 'fpzip', or a number.
+        codec (str, optional): Name of the codec for compressing scaled integers.
 
     Returns:
         tuple: Encoded array in one of several formats depending on the compression method
@@ -564,8 +1037,10 @@ def _encode_one_float_array(values, digits, reference):
         (fpzip_bytes, bits) = fpzip_compress(values)
         return ('float64', shape, bits, fpzip_bytes)
 
-    # Sometimes the test reveals that single precision fpzip is best
-    if nbytes == 4 and digits <= _SINGLE_DIGITS:
+    # Sometimes the test reveals that single precision fpzip is best, provided that its
+    # rounding error stays within the precision
+    if (nbytes == 4 and digits <= _SINGLE_DIGITS
+            and max(-minval, maxval) * 2.**-24 <= 0.5 * precision):
         (fpzip_bytes, bits) = fpzip_compress(values, dtype=np.float32)
         return ('float32', shape, bits, fpzip_bytes)
 
@@ -597,11 +1072,11 @@ def _encode_one_float_array(values, digits, reference):
     # The last term is to make sure the restored values are not systematically smaller
     # than they were originally
 
-    return ('scaled', shape, dtype, nbytes,
-            1./scale_factor, minval + 0.5/scale_factor, bz2.compress(bz2_ints))
+    return (('scaled', shape, dtype, nbytes, 1./scale_factor, minval + 0.5/scale_factor,
+             _compress(bz2_ints, codec)) + _codec_suffix(codec))
 
 
-def _encode_floats(values, rank, digits, reference):
+def _encode_floats(values, rank, digits, reference, codec=_BZ2):
     """Complete encoding of a floating-point array.
 
     A tuple is returned in one of these forms:
@@ -609,11 +1084,12 @@ def _encode_floats(values, rank, digits, reference):
         ('float64', shape, fpzipped array)
         ('float32', shape, fpzipped array)
         ('constant', shape, single value)
-        ('scaled', shape, dtype, nbytes, scale_factor, offset, bz-compressed
-                   unsigned ints)
+        ('scaled', shape, dtype, nbytes, scale_factor, offset, compressed
+                   unsigned ints[, codec])
             where:
                 dtype is one of 'uint8', 'uint16', 'uint32'
                 nbytes is the number of bytes in each encoded item
+                codec is the name of the compression codec, omitted for BZ2
             The correctly scaled return value is
                 values = scale_factor * uints + offset
         ('items', shape, item_rank, list of individual encoded items)
@@ -625,6 +1101,7 @@ def _encode_floats(values, rank, digits, reference):
             preserve.
         reference (str): One of 'smallest', 'largest', 'mean', 'median',
             'logmean', or 'fpzip'.
+        codec (str, optional): Name of the codec for compressing scaled integers.
 
     Returns:
         tuple: Encoded array in one of several formats depending on the
@@ -651,7 +1128,7 @@ def _encode_floats(values, rank, digits, reference):
 
     # Handle shapeless items
     if item == ():
-        return _encode_one_float_array(values, digits, reference)
+        return _encode_one_float_array(values, digits, reference, codec)
 
     # Encode each item element separately for better encoding, because ranges
     # can be very different.
@@ -661,18 +1138,70 @@ def _encode_floats(values, rank, digits, reference):
     array = array.swapaxes(0, 1)            # item axis first
     array = np.require(array, requirements=['C', 'A'])
 
-    encoded = []
-    for element in array:
-        encoded.append(_encode_one_float_array(element, digits, reference))
+    encoded = _pickle_map(lambda element: _encode_one_float_array(element, digits,
+                                                                  reference, codec),
+                          array)
 
     return ('items', shape, rank, encoded)
 
 
+def _choose_float_method(values, rank, digits, codec=_BZ2):
+    """The digits and reference that encode a floating-point array most compactly while
+    preserving the given number of significant digits in every value.
+
+    The candidates are lossy fpzip, scaled integers referenced to the smallest value, and
+    single precision if it retains enough digits. Each one encodes a contiguous sample of
+    the array from the middle of its leading axis. The size of the result decides, among
+    the candidates whose timing, scaled to the whole array, is within the time budget.
+
+    Parameters:
+        values (numpy.ndarray): Array of values to encode.
+        rank (int): Rank of the individual items in this array.
+        digits (float): Number of digits to preserve.
+        codec (str, optional): Name of the codec for compressing scaled integers.
+
+    Returns:
+        tuple: (digits, reference) to pass to _encode_floats().
+    """
+
+    candidates = [(digits, 'fpzip'), (digits, 'smallest')]
+    if digits <= _SINGLE_DIGITS:
+        candidates.append(('single', 'fpzip'))
+
+    sample = values
+    if values.ndim > rank and values.size > _AUTO_SAMPLE_SIZE:
+        rows = -(-_AUTO_SAMPLE_SIZE * values.shape[0] // values.size)
+        start = (values.shape[0] - rows) // 2
+        sample = values[start:start + rows]
+
+    # A sample this small would be stored literally by every method
+    if sample.size <= _FPZIP_ENCODING_CUTOFF:
+        return candidates[0]
+
+    trials = []
+    for candidate in candidates:
+        start = time.perf_counter()
+        encoded = _encode_floats(sample, rank, *candidate, codec=codec)
+        elapsed = (time.perf_counter() - start) * values.size / sample.size
+        size = len(pickle.dumps(encoded, protocol=pickle.HIGHEST_PROTOCOL))
+        trials.append((size, elapsed, candidate))
+
+    if _PICKLE_AUTO_BUDGET is not None:
+        limit = _PICKLE_AUTO_BUDGET * values.size / 1.e6
+        affordable = [trial for trial in trials if trial[1] <= limit]
+        if not affordable:
+            return min(trials, key=lambda trial: trial[1])[2]
+        trials = affordable
+
+    return min(trials, key=lambda trial: trial[0])[2]
+
+
 def _decode_scaled_uints(encoded):
     """Decode a scaled, compressed array of unsigned integers."""
 
-    (_, shape, dtype, nbytes, scale_factor, offset, bz2_bytes) = encoded
-    bz2_ints = np.frombuffer(bz2.decompress(bz2_bytes), dtype=dtype)
+    (_, shape, dtype, nbytes, scale_factor, offset, bz2_bytes) = encoded[:7]
+    codec = encoded[7] if len(encoded) > 7 else _BZ2
+    bz2_ints = np.frombuffer(_decompress(bz2_bytes, codec), dtype=dtype)
 
     # Convert given number of bytes to an int as quickly as possible
     if nbytes == 3:
@@ -725,47 +1254,200 @@ def _decode_floats(encoded):
     # Create an empty buffer with flattened item axes first, so each item index
     # points to a contiguous array
     values = np.empty((len(items),) + shape[:-item_rank])
-    for k, item in enumerate(items):
-        values[k] = _decode_floats(item)
+    for k, decoded in enumerate(_pickle_map(_decode_floats, items)):
+        values[k] = decoded
 
     # Fix the item axes and make contiguous
     return np.moveaxis(values, 0, -1).copy().reshape(shape)
 
 
-def _encode_ints(values):
-    """Encode an integer array using BZ2 compression."""
+def _encode_ints(values, codec=_BZ2):
+    """Encode an integer array using BZ2 or another compression codec."""
 
     if not values.flags['CONTIGUOUS']:
         values = values.copy()
 
-    return bz2.compress(values)
+    return _compress(values, codec)
 
 
-def _decode_ints(values, shape):
-    """Decode an integer array using BZ2 decompression."""
+def _decode_ints(values, shape, codec=_BZ2):
+    """Decode an integer array using BZ2 or another compression codec."""
 
-    bz2_bytes = bz2.decompress(values)
+    bz2_bytes = _decompress(values, codec)
     return np.frombuffer(bz2_bytes, dtype='int').reshape(shape)
 
 
-def _encode_bools(values):
-    """Encode a boolean array using packbits + BZ2 compression."""
+def _encode_bools(values, codec=_BZ2):
+    """Encode a boolean array using packbits + BZ2 or another compression codec."""
 
     if not values.flags['CONTIGUOUS']:
         values = values.copy()
 
-    return bz2.compress(np.packbits(values))
+    return _compress(np.packbits(values), codec)
 
 
-def _decode_bools(values, shape, size):
-    """Decode a boolean array using BZ2 decompression."""
+def _decode_bools(values, shape, size, codec=_BZ2):
+    """Decode a boolean array using BZ2 or another compression codec."""
 
-    bz2_bytes = bz2.decompress(values)
+    bz2_bytes = _decompress(values, codec)
     packed = np.frombuffer(bz2_bytes, dtype='uint8')
     bools = np.unpackbits(packed).astype('bool')
     bools = bools[:size]
     return bools.reshape(shape)
 
+
+def _encode_runs(mask, codec=_BZ2, limit=None):
+    """Encode a boolean array as run lengths.
+
+    The mask is flattened in C order and described by the lengths of its alternating
+    runs of False and True. For masks made of a few compact blobs, each run length is
+    close to the one two runs before, one image row earlier, so the differences from
+    those are stored, as the smallest integers that hold them, and then compressed.
+
+    Parameters:
+        mask (np.ndarray): The boolean array.
+        codec (str, optional): The compression codec.
+        limit (int, optional): If given, the largest number of bytes the run lengths may
+            occupy before compression; None is returned without compressing them if they
+            would occupy more.
+
+    Returns:
+        tuple or None: (encoded bytes, first value, dtype string); None if the run lengths
+        exceed the limit.
+    """
+
+    flat = mask.ravel()
+    changes = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+
+    # Every run takes at least one byte
+    if limit is not None and changes.size + 1 > limit:
+        return None
+
+    runs = np.diff(np.concatenate(([0], changes, [flat.size])))
+    runs[2:] -= runs[:-2].copy()
+
+    extreme = max(-runs.min(), runs.max())
+    for dtype in ('int8', 'int16', 'int32', 'int64'):
+        if extreme <= np.iinfo(dtype).max:
+            break
+
+    if limit is not None and runs.size * np.dtype(dtype).itemsize > limit:
+        return None
+
+    runs = runs.astype(dtype)
+    return (_compress(runs, codec), bool(flat[0]), runs.dtype.str)
+
+
+def _decode_runs(values, shape, first, dtype, codec=_BZ2):
+    """Decode a boolean array from run lengths, as encoded by _encode_runs()."""
+
+    runs = np.frombuffer(_decompress(values, codec), dtype=dtype).astype('int64')
+    runs[0::2] = np.cumsum(runs[0::2])
+    runs[1::2] = np.cumsum(runs[1::2])
+
+    states = np.arange(runs.size) % 2 != 0
+    if first:
+        states = ~states
+
+    return np.repeat(states, runs).reshape(shape)
+
+################################################################################
+# Fast path for small objects
+################################################################################
+
+def __reduce_ex__(self, protocol):
+    """Support for pickling, with a fast path for small objects.
+
+    A shapeless object, or one with no more than _FPZIP_ENCODING_CUTOFF values, is
+    reduced to a short tuple of its class, values, mask, unit, ranks, read-only status
+    and derivatives, which pickles many times faster than the state returned by
+    :meth:`__getstate__`. Its arrays would not be compressed by __getstate__ anyway.
+
+    Objects that are larger, that override __getstate__, or that carry attributes the
+    tuple does not record use the standard reduction with __getstate__ and
+    __setstate__.
+    """
+
+    if ((self._is_array and self._values.size > _FPZIP_ENCODING_CUTOFF)
+            or type(self).__getstate__ is not __getstate__ or _PICKLE_DEBUG
+            or self._added_attrs or self._truth_if_any or self._truth_if_all):
+        return object.__reduce_ex__(self, protocol)
+
+    for attr in Qube._OPTIONAL_ATTRS:
+        if hasattr(self, attr):
+            return object.__reduce_ex__(self, protocol)
+
+    return (_unpickle_small, (type(self), self._values, self._mask, self._nrank,
+                              self._drank, self._unit, self._readonly, self._derivs))
+
+
+def _unpickle_small(cls, values, mask, nrank, drank, unit, readonly, derivs):
+    """Reconstruct an object reduced by the fast path of __reduce_ex__().
+
+    The attributes are filled in as by Qube._new_from_parts(), which the values and mask
+    are known to satisfy. They are set here directly because this is measurably faster
+    than calling it. Any attribute added to the constructor must also be added here.
+    The unit tests compare these attributes with those of objects built by the
+    constructor.
+    """
+
+    obj = Qube.__new__(cls)
+
+    if isinstance(values, np.ndarray):
+        full_shape = values.shape
+        ndims = len(full_shape) - nrank - drank
+        obj._is_array = True
+        obj._is_scalar = False
+        obj._shape = full_shape[:ndims]
+        obj._item = full_shape[ndims:]
+        obj._numer = full_shape[ndims:ndims + nrank]
+        obj._denom = full_shape[ndims + nrank:]
+        obj._nsize = math.prod(obj._numer)
+        obj._dsize = math.prod(obj._denom)
+        obj._size = math.prod(obj._shape)
+        key = (cls, obj._item, drank, values.dtype.kind)
+    else:
+        ndims = 0
+        obj._is_array = False
+        obj._is_scalar = True
+        obj._shape = ()
+        obj._item = ()
+        obj._numer = ()
+        obj._denom = ()
+        obj._nsize = 1
+        obj._dsize = 1
+        obj._size = 1
+        key = (cls, (), drank, type(values))
+
+    obj._values = values
+    obj._mask = mask
+    obj._ndims = ndims
+    obj._rank = nrank + drank
+    obj._nrank = nrank
+    obj._drank = drank
+    obj._isize = obj._nsize * obj._dsize
+    obj._unit = unit
+    obj._readonly = False
+    obj._cache = {}
+    obj._derivs = derivs
+    obj._truth_if_any = False
+    obj._truth_if_all = False
+
+    # Defaults are shared among objects, just as clone() shares them
+    try:
+        obj._default = _SMALL_DEFAULTS[key]
+    except KeyError:
+        obj._default = cls._default_for(obj._item, drank, Qube._dtype(values))
+        _SMALL_DEFAULTS[key] = obj._default
+
+    for key, deriv in derivs.items():
+        setattr(obj, 'd_d' + key, deriv)
+
+    if readonly:
+        obj.as_readonly()
+
+    return obj
+
 ################################################################################
 # __getstate__ and __setstate__
 ################################################################################
@@ -783,8 +1465,16 @@ def __getstate__(self):
     mask. Each item in the list is a tuple, one of:
 
     * ('CORNERS', corners), where corners is the tuple returned by Qube._find_corners()
-    * ('BOOL', shape, size), where the mask has been converted to packed bits and
-      BZ2-compressed; shape is its final shape; size is its final size.
+    * ('BOOL', shape, size[, codec]), where the mask has been converted to packed bits
+      and compressed; shape is its final shape; size is its final size; codec is the name
+      of the compression codec, omitted for BZ2.
+    * ('RLE', shape, first, dtype[, codec]), where the mask has been converted to the
+      lengths of its runs of equal values, each stored as its difference from the run
+      two earlier; shape is its final shape; first is its first value; dtype is the
+      dtype string of the stored differences; codec is as for 'BOOL'. This is used
+      instead of 'BOOL' when it is smaller, as it is for masks of a few compact regions.
+    * ('SHARED', index), where the mask is stored once for a batch of objects pickled by
+      dump_many(); index locates it in the batch.
 
     The list will be empty if no compression has been applied.
 
@@ -792,9 +1482,16 @@ def __getstate__(self):
     values. Each item in the list is a tuple, one of:
     * ('ALL_MASKED',) if the object is fully masked, so no values are saved.
     * ('ANTIMASKED',) if the antimask has been applied.
-    * ('FLOAT', digits, reference) for any floating-point compression performed.
-    * ('BOOL', shape, size) if packbits plus BZ2 compression was performed.
-    * ('INT', shape) if BZ2 compression of integers was performed.
+    * ('DELTA', reference) if the values of a reference object, or of the reference
+      registered under this name, have been subtracted.
+    * ('FLOAT', digits, reference) for any floating-point compression performed. For
+      the reference "auto", these are the digits and reference of the method chosen.
+    * ('BOOL', shape, size[, codec]) if packbits plus compression was performed.
+    * ('INT', shape[, codec]) if compression of integers was performed.
+
+    If the pickle digits are "raw", the mask and values are saved as contiguous arrays
+    without any encoding, and both lists are empty unless the object is fully masked.
+    NumPy pickles such arrays as out-of-band buffers under protocol 5.
 
     Note:
         For floating-point arrays using lossy compression methods (e.g., when digits < 16
@@ -812,6 +1509,8 @@ def __getstate__(self):
     clone.MASK_ENCODING = []
 
     _check_pickle_digits(clone)
+    codec = pickle_codec(self)
+    suffix = _codec_suffix(codec)
 
     # For a single value, nothing changes
     if isinstance(self._values, (numbers.Real, np.bool_)):
@@ -824,6 +1523,13 @@ def __getstate__(self):
         clone.VALS_ENCODING.append(('ALL_MASKED',))
         antimask = None
 
+    # For the "raw" option, save contiguous arrays without encoding
+    elif clone._pickle_digits[0] == 'raw':
+        clone._values = np.ascontiguousarray(self._values)
+        if np.shape(self._mask):
+            clone._mask = np.ascontiguousarray(self._mask)
+        antimask = None
+
     # Otherwise, _values is an array and not fully masked
     else:
 
@@ -835,8 +1541,15 @@ def __getstate__(self):
             clone._mask = False    # convert to bool if it's an array
 
         mask_shape = np.shape(clone._mask)
+        table = getattr(_BATCH, 'masks', None)
+        index = None if table is None or not mask_shape else table.find(self._mask)
 
-        if mask_shape:
+        # A mask already encoded in this batch is stored by reference
+        if index is not None:
+            clone.MASK_ENCODING.append(('SHARED', index))
+            clone._mask = None
+
+        elif mask_shape:
             # If any "edges" of the mask array are all True, save the corners
             # and reduce the mask size
             corners = self.corners
@@ -844,8 +1557,25 @@ def __getstate__(self):
                 clone.MASK_ENCODING.append(('CORNERS', corners))
                 clone._mask = self._mask[self._slicer].copy()
 
-            clone.MASK_ENCODING.append(('BOOL', clone._mask.shape, clone._mask.size))
-            clone._mask = _encode_bools(clone._mask)
+            # Use run lengths or packed bits, whichever is smaller. Run lengths that
+            # occupy more bytes than the packed bits, even before compression, are not
+            # worth compressing
+            bits = _encode_bools(clone._mask, codec)
+            runs = _encode_runs(clone._mask, codec, limit=(clone._mask.size + 7) // 8)
+            if runs and len(runs[0]) < len(bits):
+                clone.MASK_ENCODING.append(('RLE', clone._mask.shape) + runs[1:]
+                                           + suffix)
+                clone._mask = runs[0]
+            else:
+                clone.MASK_ENCODING.append(('BOOL', clone._mask.shape,
+                                            clone._mask.size) + suffix)
+                clone._mask = bits
+
+            if table is not None:
+                index = table.add(self._mask, clone._mask, clone.MASK_ENCODING,
+                                  self.antimask)
+                clone.MASK_ENCODING = [('SHARED', index)]
+                clone._mask = None
 
         ############################
         # Encode the values array
@@ -854,12 +1584,24 @@ def __getstate__(self):
         # Select the antimasked values; otherwise, flatten the shape axes.
         # At this point, the values array is always 2-D.
         if mask_shape:
-            antimask = self.antimask
+            antimask = self.antimask if index is None else table.antimasks[index]
             clone._values = clone._values[antimask]
             clone.VALS_ENCODING.append(('ANTIMASKED',))
         else:
             antimask = None
 
+        # Replace the values by their differences from a reference if requested. The
+        # reference is recorded in the encoding rather than as an attribute, so that it
+        # is not pickled at all if the differences are not used.
+        delta = getattr(clone, '_pickle_delta', None)
+        if delta is not None:
+            del clone._pickle_delta
+            residual = _delta_residual(self, clone._values, delta, antimask,
+                                       clone._pickle_digits[0])
+            if residual is not None:
+                clone.VALS_ENCODING.append(('DELTA', delta))
+                clone._values = residual
+
         # Floating-point arrays receive special handling for improved
         # compression
         dtype = self.dtype()
@@ -867,22 +1609,27 @@ def __getstate__(self):
             _check_pickle_digits(clone)
             digits = clone._pickle_digits[0]
             reference = clone._pickle_reference[0]
+            if reference == 'auto' and isinstance(digits, numbers.Real):
+                (digits, reference) = _choose_float_method(clone._values,
+                                                           len(self._item), digits,
+                                                           codec)
             clone.VALS_ENCODING.append(('FLOAT', digits, reference))
             clone._values = _encode_floats(clone._values, rank=len(self._item),
-                                           digits=digits, reference=reference)
+                                           digits=digits, reference=reference,
+                                           codec=codec)
 
         # Integers use straight BZ2-encoding
         elif dtype == 'int':
             shape = clone._values.shape
-            clone.VALS_ENCODING.append(('INT', shape))
-            clone._values = _encode_ints(clone._values)
+            clone.VALS_ENCODING.append(('INT', shape) + suffix)
+            clone._values = _encode_ints(clone._values, codec)
 
         # Booleans use BZ2-encoding of the packed bits
         else:
             shape = clone._values.shape
             size = clone._values.size
-            clone.VALS_ENCODING.append(('BOOL', shape, size))
-            clone._values = _encode_bools(clone._values)
+            clone.VALS_ENCODING.append(('BOOL', shape, size) + suffix)
+            clone._values = _encode_bools(clone._values, codec)
 
     ############################
     # Process the derivatives
@@ -897,20 +1644,27 @@ def __getstate__(self):
         deriv_digits = 2 * clone._pickle_digits[1:]
         deriv_reference = 2 * clone._pickle_reference[1:]
 
-        for key, deriv in self._derivs.items():
+        new_derivs = []
+        for deriv in self._derivs.values():
             new_deriv = deriv.clone(recursive=False)
             if not hasattr(new_deriv, '_pickle_digits'):
                 new_deriv._pickle_digits = deriv_digits
             if not hasattr(new_deriv, '_pickle_reference'):
                 new_deriv._pickle_reference = deriv_reference
+            if not hasattr(new_deriv, '_pickle_codec'):
+                new_deriv._pickle_codec = codec
 
-            if antimask is None:
-                new_deriv = deriv
-            else:
+            if antimask is not None:
                 new_deriv._values = deriv._values[antimask]
                 new_deriv._mask = False
 
-            clone._derivs[key] = (type(deriv), new_deriv.__getstate__())
+            new_derivs.append(new_deriv)
+
+        states = _pickle_map(lambda deriv: deriv.__getstate__(), new_derivs,
+                             batch=True)
+        for key, deriv, state in zip(self._derivs, self._derivs.values(), states,
+                                     strict=True):
+            clone._derivs[key] = (type(deriv), state)
 
     return clone.__dict__
 
@@ -927,10 +1681,25 @@ def __setstate__(self, state):
     original due to compression precision limits. Use 'double' precision with 'fpzip'
     reference for lossless compression.
 
+    If :meth:`set_pickle_lazy` is in effect, the decoding is deferred until each array is
+    first used.
+
     Parameters:
         state (dict): The state dictionary as returned by __getstate__().
     """
 
+    _restore_state(self, state)
+
+
+def _restore_state(self, state, parent=None):
+    """Restore the object state from a pickled dictionary.
+
+    Parameters:
+        state (dict): The state dictionary as returned by __getstate__().
+        parent (_LazyState, optional): When decoding lazily, the state of the parent of a
+            derivative that was pickled with the parent's antimask applied.
+    """
+
     # Handle renamed keys
     if '_units_' in state:
         state['_unit'] = state['_units_']
@@ -955,125 +1724,465 @@ def __setstate__(self, state):
         delattr(self, 'VALS_ENCODING')
         delattr(self, 'MASK_ENCODING')
 
+    # A mask shared within a batch is found in the table for the batch
+    if mask_encoding and mask_encoding[0][0] == 'SHARED':
+        masks = getattr(_BATCH, 'masks', None)
+        if masks is None:
+            raise ValueError('an object with a shared mask must be unpickled by '
+                             'Qube.load_many()')
+        self._mask = masks[mask_encoding[0][1]]
+
     ############################
-    # Decode the mask
+    # Restore the attributes that an older pickle does not carry
     ############################
 
-    mask_is_writable = not bool(mask_encoding)  # True if mask was not encoded
-    while mask_encoding:
-        encoding = mask_encoding.pop()
+    # A state dictionary replaces the instance dictionary wholesale, so an object
+    # restored from a pickle written before an attribute existed simply lacks it, and the
+    # first operation to read it fails. Each of these is derived from the values or the
+    # shape, so it can be recomputed here rather than lost. The two array flags always
+    # appeared together, so one check serves for both. Encoded values always decode to an
+    # array, so the test gives the same answer it gives in __init__ without decoding.
+
+    if not hasattr(self, '_is_array'):
+        self._is_array = bool(vals_encoding) or isinstance(self._values, np.ndarray)
+        self._is_scalar = not self._is_array
+
+    if not hasattr(self, '_ndims'):
+        self._ndims = len(self._shape)
+
+    # The derivatives were saved with the antimask applied only if the values were
+    derivs_antimasked = ('ANTIMASKED',) in vals_encoding
+
+    ############################
+    # Defer the decoding if lazy
+    ############################
+
+    if _PICKLE_LAZY and not _PICKLE_DEBUG:
+        lazy = _LazyState(self, mask_encoding, vals_encoding, parent)
+        self._lazy_state = lazy
+        del self._values
+        del self._mask
+
+        deriv_parent = lazy if derivs_antimasked else None
+        for key, (class_, deriv) in list(self._derivs.items()):
+            if self._readonly:
+                deriv['_readonly'] = True
+            new_deriv = Qube.__new__(class_)
+            _restore_state(new_deriv, deriv, deriv_parent)
+            self._derivs[key] = new_deriv
+            setattr(self, 'd_d' + key, new_deriv)
+
+        return
+
+    ############################
+    # Decode the mask and values
+    ############################
+
+    (mask, mask_is_writable) = _decode_mask(self._mask, mask_encoding, self._shape)
+    antimask = np.logical_not(mask) if np.shape(mask) else None
+    (values, values_is_writable) = _decode_values(self._values, vals_encoding, antimask,
+                                                  self)
+
+    # Match the readonly status
+    self._mask = _finish_array(mask, mask_is_writable, self._readonly)
+    self._values = _finish_array(values, values_is_writable, self._readonly)
+
+    ############################
+    # Expand the derivatives
+    ############################
+
+    def restore(deriv_tuple):
+        (class_, deriv) = deriv_tuple
+        new_deriv = Qube.__new__(class_)
+        new_deriv.__setstate__(deriv)
+        return new_deriv
+
+    restored = _pickle_map(restore, self._derivs.values(), batch=True)
+    for key, new_deriv in zip(list(self._derivs), restored, strict=True):
+
+        if derivs_antimasked:
+            values = _expand_deriv(new_deriv._values, antimask, new_deriv)
+            new_deriv._values = _finish_array(values, True, new_deriv._readonly)
+            new_deriv._mask = self._mask
+
+        self.insert_deriv(key, new_deriv)
+
+
+def _decode_mask(mask, mask_encoding, shape):
+    """Decode the mask of an unpickled object.
+
+    Parameters:
+        mask (bytes, bool, or np.ndarray): The mask as pickled.
+        mask_encoding (list): The steps that were applied to the mask.
+        shape (tuple): The shape of the object.
+
+    Returns:
+        tuple: (mask, True if the mask is a new, writable array).
+    """
+
+    # True if the mask was not encoded, unless it came from a read-only buffer
+    is_writable = not mask_encoding and not Qube._array_is_readonly(mask)
+
+    for encoding in reversed(mask_encoding):
         method = encoding[0]
 
-        if method == 'BOOL':
-            (_, shape, size) = encoding
-            self._mask = _decode_bools(self._mask, shape, size)
-            mask_is_writable = True
+        if method == 'SHARED':
+            mask = mask.decode(shape)
+            is_writable = False
+
+        elif method == 'BOOL':
+            (_, mask_shape, size) = encoding[:3]
+            mask = _decode_bools(mask, mask_shape, size, *encoding[3:])
+            is_writable = True
+
+        elif method == 'RLE':
+            mask = _decode_runs(mask, *encoding[1:])
+            is_writable = True
 
         elif method == 'CORNERS':
             (_, corners) = encoding
-            new_mask = np.ones(self._shape, dtype='bool')
+            new_mask = np.ones(shape, dtype='bool')
             slicer = Qube._slicer_from_corners(corners)
-            new_mask[slicer] = self._mask
-            self._mask = new_mask
-            mask_is_writable = True
+            new_mask[slicer] = mask
+            mask = new_mask
+            is_writable = True
 
         else:
             raise ValueError('unrecognized mask encoding: ' + str(encoding[0]))
 
-    # Define the antimask
-    if np.shape(self._mask):
-        antimask = np.logical_not(self._mask)
-    else:
-        antimask = None
+    return (mask, is_writable)
+
+
+def _decode_values(values, vals_encoding, antimask, obj):
+    """Decode the values of an unpickled object.
+
+    Parameters:
+        values (bytes, tuple, number, or np.ndarray): The values as pickled.
+        vals_encoding (list): The steps that were applied to the values.
+        antimask (np.ndarray or None): The antimask of the object; None if its mask is
+            not an array.
+        obj (Qube): The object, which defines the shape, item and default.
 
-    # Decode the values
-    values_is_writable = not bool(vals_encoding)    # True if values not encoded
-    while vals_encoding:
-        encoding = vals_encoding.pop()
+    Returns:
+        tuple: (values, True if the values are a new, writable array).
+    """
+
+    # True if the values were not encoded, unless they came from a read-only buffer
+    is_writable = not vals_encoding and not Qube._array_is_readonly(values)
+
+    for encoding in reversed(vals_encoding):
         method = encoding[0]
 
         if method == 'INT':
-            (_, shape) = encoding
-            self._values = _decode_ints(self._values, shape)
+            (_, shape) = encoding[:2]
+            values = _decode_ints(values, shape, *encoding[2:])
 
         elif method == 'BOOL':
-            (_, shape, size) = encoding
-            self._values = _decode_bools(self._values, shape, size)
-            values_is_writable = True
+            (_, shape, size) = encoding[:3]
+            values = _decode_bools(values, shape, size, *encoding[3:])
+            is_writable = True
 
         elif method == 'FLOAT':
-            self._values = _decode_floats(self._values)
-            values_is_writable = True
+            values = _decode_floats(values)
+            is_writable = True
+
+        elif method == 'DELTA':
+            base = _delta_base(_delta_reference(encoding[1]))
+            if ('ANTIMASKED',) in vals_encoding:
+                if antimask is None:
+                    raise ValueError('missing antimask for decoding')
+                base = base[antimask]
+            values = values + base
+            is_writable = True
 
         elif method == 'ANTIMASKED':
             if antimask is None:
                 raise ValueError('missing antimask for decoding')
-            new_values = np.empty(self._shape + self._item,
-                                  dtype=Qube._dtype(self._default))
-            new_values[...] = self._default
-            new_values[antimask] = self._values
-            self._values = new_values
-            values_is_writable = True
+            new_values = np.empty(obj._shape + obj._item,
+                                  dtype=Qube._dtype(obj._default))
+            new_values[...] = obj._default
+            new_values[antimask] = values
+            values = new_values
+            is_writable = True
 
         elif method == 'ALL_MASKED':
-            new_values = np.empty(self._shape + self._item,
-                                  dtype=Qube._dtype(self._default))
-            new_values[...] = self._default
-            self._values = new_values
-            values_is_writable = True
+            new_values = np.empty(obj._shape + obj._item,
+                                  dtype=Qube._dtype(obj._default))
+            new_values[...] = obj._default
+            values = new_values
+            is_writable = True
 
         else:
             raise ValueError('unrecognized values encoding: ' + str(encoding))
 
-    ############################
-    # Restore the attributes that an older pickle does not carry
-    ############################
+    return (values, is_writable)
 
-    # A state dictionary replaces the instance dictionary wholesale, so an object
-    # restored from a pickle written before an attribute existed simply lacks it, and the
-    # first operation to read it fails. Each of these is derived from the values or the
-    # shape, so it can be recomputed here rather than lost. The two array flags always
-    # appeared together, so one check serves for both. The values are decoded by this
-    # point, so the test for an array gives the same answer it gives in __init__.
 
-    if not hasattr(self, '_is_array'):
-        self._is_array = isinstance(self._values, np.ndarray)
-        self._is_scalar = not self._is_array
+def _expand_deriv(values, antimask, deriv):
+    """The values of a derivative pickled with its parent's antimask applied, expanded to
+    the parent's full shape."""
 
-    if not hasattr(self, '_ndims'):
-        self._ndims = len(self._shape)
+    new_values = np.empty(antimask.shape + deriv._item)
+    new_values[...] = deriv._default
+    new_values[antimask] = values
+    return new_values
 
-    ############################
-    # Set readonly status
-    ############################
 
-    if self._readonly:
-        self.as_readonly()
-    else:
-        if not mask_is_writable:
-            self._mask = self._mask.copy()
-        if not values_is_writable:
-            self._values = self._values.copy()
+def _finish_array(array, is_writable, readonly):
+    """A decoded array, made read-only if the object is and writable otherwise."""
 
-    ############################
-    # Expand the derivatives
-    ############################
+    if readonly:
+        return Qube._array_to_readonly(array)
+    if is_writable:
+        return array
+    return array.copy()
 
-    for key, deriv_tuple in self._derivs.items():
-        (class_, deriv) = deriv_tuple
-        new_deriv = Qube.__new__(class_)
-        new_deriv.__setstate__(deriv)
+##########################################################################################
+# Lazy decoding
+##########################################################################################
 
-        if antimask is not None:
-            new_values = np.empty(self._shape + new_deriv._item)
-            new_values[...] = new_deriv._default
-            new_values[antimask] = new_deriv._values
-            new_deriv._values = new_values
-            new_deriv._mask = self._mask
+class _LazyState:
+    """The encoded mask and values of an object that was unpickled lazily.
 
-        if deriv['_readonly']:
-            new_deriv.as_readonly()
+    Each array is decoded once, on first use. The decoded mask and antimask are retained,
+    because the derivatives pickled with the object's antimask applied need them.
+    """
 
-        self.insert_deriv(key, new_deriv)
+    def __init__(self, obj, mask_encoding, vals_encoding, parent=None):
+        """Constructor for a _LazyState.
+
+        Parameters:
+            obj (Qube): The object, with its mask and values still encoded.
+            mask_encoding (list): The steps that were applied to the mask.
+            vals_encoding (list): The steps that were applied to the values.
+            parent (_LazyState, optional): The state of the parent object, if this is a
+                derivative pickled with the parent's antimask applied.
+        """
+
+        self.encoded_mask = obj._mask
+        self.encoded_values = obj._values
+        self.mask_encoding = mask_encoding
+        self.vals_encoding = vals_encoding
+        self.shape = obj._shape
+        self.readonly = obj._readonly
+        self.parent = parent
+        self.lock = threading.RLock()
+        self.mask = None
+        self.mask_is_decoded = False
+        self.antimask = None
+
+    def decode_mask(self):
+        """The decoded mask."""
+
+        with self.lock:
+            if not self.mask_is_decoded:
+                if self.parent is None:
+                    (mask, is_writable) = _decode_mask(self.encoded_mask,
+                                                       self.mask_encoding, self.shape)
+                    self.mask = _finish_array(mask, is_writable, self.readonly)
+                else:
+                    self.mask = self.parent.decode_mask()
+
+                self.mask_is_decoded = True
+                self.encoded_mask = None
+
+            return self.mask
+
+    def decode_antimask(self):
+        """The antimask; None if the mask is not an array."""
+
+        with self.lock:
+            if self.antimask is None:
+                if self.parent is None:
+                    mask = self.decode_mask()
+                    if np.shape(mask):
+                        self.antimask = np.logical_not(mask)
+                else:
+                    self.antimask = self.parent.decode_antimask()
+
+            return self.antimask
+
+    def decode_values(self, obj):
+        """The decoded values of the given object."""
+
+        with self.lock:
+            if self.parent is None:
+                antimasked = ('ANTIMASKED',) in self.vals_encoding
+                antimask = self.decode_antimask() if antimasked else None
+                (values, is_writable) = _decode_values(self.encoded_values,
+                                                       self.vals_encoding, antimask, obj)
+            else:
+                (values, _) = _decode_values(self.encoded_values, self.vals_encoding,
+                                             None, obj)
+                values = _expand_deriv(values, self.parent.decode_antimask(), obj)
+                is_writable = True
+
+            self.encoded_values = None
+            return _finish_array(values, is_writable, self.readonly)
+
+
+class _LazyAttribute:
+    """The values or mask of a lazily unpickled object, decoded on first access; or the
+    mask of an object with a sparse or packed mask, converted to an array on first access.
+
+    This is a non-data descriptor, so it is consulted only when the object's own
+    dictionary lacks the attribute. Every other object holds its values and mask in its
+    dictionary, and reading them costs nothing extra.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+
+        if obj is None:
+            return self
+
+        lazy = obj.__dict__.get('_lazy_state')
+        if lazy is None:
+            if self.name == '_mask':
+                mask = _dense_mask(obj)
+                if mask is not None:
+                    return mask
+
+            raise AttributeError(f"'{type(obj).__name__}' object has no attribute "
+                                 f"'{self.name}'")
+
+        with lazy.lock:
+            if self.name not in obj.__dict__:   # another thread might have decoded it
+                if self.name == '_mask':
+                    obj.__dict__['_mask'] = lazy.decode_mask()
+                else:
+                    obj.__dict__['_values'] = lazy.decode_values(obj)
+
+                if '_mask' in obj.__dict__ and '_values' in obj.__dict__:
+                    obj.__dict__.pop('_lazy_state', None)
+
+            return obj.__dict__[self.name]
+
+
+##########################################################################################
+# Batches of objects that share masks
+##########################################################################################
+
+class _MaskTable:
+    """The distinct masks found while pickling a batch of objects with dump_many()."""
+
+    def __init__(self):
+
+        self.by_id = {}         # id(mask) -> index
+        self.by_content = {}    # (shape, digest) -> index
+        self.masks = []         # every mask seen, so that no id is reused
+        self.entries = []       # (encoded mask, mask encoding) for each index
+        self.antimasks = []     # antimask for each index
+        self.pending = None     # (id, content key) of the last mask not found
+
+    def find(self, mask):
+        """The index of a mask equal to this one, or None if it is new."""
+
+        index = self.by_id.get(id(mask))
+        if index is not None:
+            return index
+
+        key = (mask.shape, hashlib.blake2b(np.ascontiguousarray(mask)).digest())
+        index = self.by_content.get(key)
+        if index is None:
+            self.pending = (id(mask), key)
+        else:
+            self.by_id[id(mask)] = index
+            self.masks.append(mask)
+
+        return index
+
+    def add(self, mask, encoded, mask_encoding, antimask):
+        """Add a new mask, as just encoded, and return its index."""
+
+        (mask_id, key) = self.pending
+        index = len(self.entries)
+        self.by_id[mask_id] = index
+        self.by_content[key] = index
+        self.masks.append(mask)
+        self.entries.append((encoded, mask_encoding))
+        self.antimasks.append(antimask)
+        return index
+
+
+class _SharedMask:
+    """A mask shared by objects unpickled with load_many(), decoded on first use."""
+
+    def __init__(self, encoded, mask_encoding):
+
+        self.encoded = encoded
+        self.mask_encoding = mask_encoding
+        self.mask = None
+        self.lock = threading.Lock()
+
+    def decode(self, shape):
+        """The decoded mask, which is read-only because every object shares it."""
+
+        with self.lock:
+            if self.mask is None:
+                (mask, _) = _decode_mask(self.encoded, self.mask_encoding, shape)
+                self.mask = Qube._array_to_readonly(mask)
+                self.encoded = None
+
+            return self.mask
+
+
+@staticmethod
+def dump_many(objects, file, protocol=None):
+    """Pickle a batch of objects to a file, encoding each distinct mask only once.
+
+    Objects that share a mask, either the same array or one equal in content, are pickled
+    with a reference to a single encoded copy. On unpickling, the mask is decoded once;
+    read-only objects share it and writable objects receive their own copies.
+
+    Parameters:
+        objects (dict, list, or tuple): The objects to pickle. Every Qube within the
+            structure takes part in the sharing; anything else is pickled as usual.
+        file (file-like): A binary file open for writing.
+        protocol (int, optional): The pickle protocol; None for the default.
+    """
+
+    table = _MaskTable()
+    saved = getattr(_BATCH, 'masks', None)
+    _BATCH.masks = table
+    try:
+        payload = pickle.dumps(objects, protocol=protocol)
+    finally:
+        _BATCH.masks = saved
+
+    pickle.dump((_BATCH_HEADER, table.entries), file, protocol=protocol)
+    file.write(payload)
+
+
+@staticmethod
+def load_many(file):
+    """Unpickle a batch of objects written by :meth:`dump_many`.
+
+    Parameters:
+        file (file-like): A binary file open for reading.
+
+    Returns:
+        dict, list, or tuple: The objects, in the structure given to :meth:`dump_many`.
+
+    Raises:
+        ValueError: If the file was not written by :meth:`dump_many`.
+    """
+
+    header = pickle.load(file)
+    if not (isinstance(header, tuple) and len(header) == 2
+            and header[0] == _BATCH_HEADER):
+        raise ValueError('not a file written by Qube.dump_many()')
+
+    masks = [_SharedMask(encoded, mask_encoding)
+             for (encoded, mask_encoding) in header[1]]
+
+    saved = getattr(_BATCH, 'masks', None)
+    _BATCH.masks = masks
+    try:
+        return pickle.load(file)
+    finally:
+        _BATCH.masks = saved
 
 ##########################################################################################
@@ -3,6 +3,7 @@
 ##########################################################################################
 
 import numpy as np
+from polymath.extensions import masking
 from polymath.qube import Qube
 
 __all__ = ['as_readonly', 'copy', 'match_readonly', 'require_writable',
@@ -57,8 +58,10 @@ def as_readonly(self, *, recursive=True):
         return self
 
     # Update the value if it is an array
+    # The arrays of a sparse or packed mask are always read-only
     Qube._array_to_readonly(self._values)
-    Qube._array_to_readonly(self._mask)
+    if not masking._COMPACT_MASKS or masking._compact_mask_of(self) is None:
+        Qube._array_to_readonly(self._mask)
     self._readonly = True
 
     # Update anything cached
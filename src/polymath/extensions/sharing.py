@@ -0,0 +1,248 @@
+##########################################################################################
+# polymath/extensions/sharing.py: transport of Qube objects through shared memory
+##########################################################################################
+"""This module supports the transport of polymath objects between processes using shared
+memory.
+
+Pickling an object for a process pool compresses and copies all of its arrays. Instead,
+:meth:`~polymath.Qube.to_shared` copies the values, mask and derivatives of an object into
+a single block of shared memory, and returns a small :class:`SharedQube` handle that
+describes it. The handle is cheap to pickle, and :meth:`~polymath.Qube.from_shared`
+reconstructs the object in any process as read-only views of the shared arrays, without
+copying them.
+
+The process that called :meth:`~polymath.Qube.to_shared` owns the memory. It must keep
+the handle until the other processes are done with it and then call
+:meth:`SharedQube.unlink`. For example::
+
+    handle = backplane.to_shared()
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(worker, itertools.repeat(handle, 8), range(8)))
+    handle.unlink()
+
+where `worker` calls `Qube.from_shared(handle)` to obtain the object.
+"""
+
+import ctypes
+import numpy as np
+
+from multiprocessing import shared_memory
+
+__all__ = ['SharedQube', 'from_shared', 'to_shared']
+
+# Each array starts on a boundary of this many bytes
+_ALIGNMENT = 64
+
+
+class SharedQube:
+    """A picklable handle to a Qube object stored in shared memory.
+
+    Attributes:
+        name (str): The name of the shared memory block.
+        size (int): The size of the block in bytes.
+        record (tuple): A description of the object and the locations of its arrays
+            within the block.
+    """
+
+    def __init__(self, name, size, record, shm=None):
+        """Constructor for a SharedQube.
+
+        Parameters:
+            name (str): The name of the shared memory block.
+            size (int): The size of the block in bytes.
+            record (tuple): The description of the object.
+            shm (multiprocessing.shared_memory.SharedMemory, optional): The block, if it
+                is already open in this process.
+        """
+
+        self.name = name
+        self.size = size
+        self.record = record
+        self._shm = shm
+
+    def __getstate__(self):
+        return (self.name, self.size, self.record)
+
+    def __setstate__(self, state):
+        (self.name, self.size, self.record) = state
+        self._shm = None
+
+    def __repr__(self):
+        return f'SharedQube({self.name!r}, {self.size})'
+
+    def _attach(self):
+        """The shared memory block, opened in this process if necessary."""
+
+        if self._shm is None:
+            try:
+                self._shm = shared_memory.SharedMemory(name=self.name, track=False)
+            except TypeError:       # `track` requires Python 3.13
+                self._shm = shared_memory.SharedMemory(name=self.name)
+
+        return self._shm
+
+    def close(self):
+        """Close the shared memory block in this process.
+
+        Objects already returned by :meth:`~polymath.Qube.from_shared` remain valid.
+        """
+
+        if self._shm is not None:
+            self._shm = None        # the block closes when its last array is deleted
+
+    def unlink(self):
+        """Destroy the shared memory block. Only the owner should call this.
+
+        Objects already returned by :meth:`~polymath.Qube.from_shared` remain valid in
+        every process, but the handle can no longer be used to create new ones.
+        """
+
+        self._attach().unlink()
+        self.close()
+
+
+class _Block:
+    """The shared memory block as seen by NumPy, keeping the block open for as long as any
+    array uses it."""
+
+    def __init__(self, shm):
+
+        self.shm = shm
+
+        # Obtain the address without leaving the buffer exported, which would prevent
+        # the block from closing after the last array is deleted
+        pointer = ctypes.c_char.from_buffer(shm.buf)
+        self.address = ctypes.addressof(pointer)
+        del pointer
+
+    def array(self, offset, shape, dtype):
+        """A read-only array at the given offset within the block."""
+
+        holder = _ArrayInterface(self, offset, shape, dtype)
+        array = np.asarray(holder)
+        array.flags['WRITEABLE'] = False
+        return array
+
+
+class _ArrayInterface:
+    """An object exposing one array in the block through the NumPy array interface."""
+
+    def __init__(self, block, offset, shape, dtype):
+
+        self.block = block
+        self.__array_interface__ = {
+            'shape'  : shape,
+            'typestr': dtype,
+            'data'   : (block.address + offset, True),
+            'version': 3,
+        }
+
+
+def _layout(obj):
+    """The record describing an object and the arrays to be stored with it.
+
+    Each array is given an offset within a block of memory, aligned to _ALIGNMENT bytes.
+    Shapeless values and masks are stored in the record itself.
+
+    Returns:
+        tuple: (record, list of (offset, array), total size in bytes).
+    """
+
+    arrays = []
+    size = 0
+
+    def part(value):
+        nonlocal size
+
+        if not isinstance(value, np.ndarray):
+            return ('value', value)
+
+        array = np.ascontiguousarray(value)
+        arrays.append((size, array))
+        entry = ('array', size, array.shape, array.dtype.str)
+        size += (array.nbytes + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+        return entry
+
+    def describe(obj):
+        derivs = tuple((key, describe(deriv)) for (key, deriv) in obj._derivs.items())
+        return (type(obj), obj._nrank, obj._drank, obj._unit, part(obj._values),
+                part(obj._mask), derivs)
+
+    record = describe(obj)
+    return (record, arrays, size)
+
+
+def _rebuild(record, array):
+    """Reconstruct an object from its record.
+
+    Parameters:
+        record (tuple): The record returned by _layout().
+        array (function): A function that takes an offset, shape and dtype string and
+            returns the stored array.
+
+    Returns:
+        Qube: The object.
+    """
+
+    def part(entry):
+        if entry[0] == 'value':
+            return entry[1]
+        (_, offset, shape, dtype) = entry
+        return array(offset, shape, dtype)
+
+    (cls, nrank, drank, unit, values, mask, derivs) = record
+    obj = cls._new_from_parts(part(values), part(mask), nrank=nrank, drank=drank,
+                              unit=unit)
+    obj.insert_derivs({key: _rebuild(deriv, array) for (key, deriv) in derivs})
+    return obj
+
+
+def to_shared(self):
+    """Copy this object into a new block of shared memory.
+
+    The values, the mask and every derivative are stored in one block. The returned
+    handle can be passed to other processes, where :meth:`from_shared` reconstructs the
+    object without copying its arrays. The caller owns the block and must call
+    :meth:`SharedQube.unlink` on the handle when it is no longer needed.
+
+    Returns:
+        SharedQube: A handle to the shared object.
+    """
+
+    (record, arrays, size) = _layout(self)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for (offset, array) in arrays:
+        target = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf, offset=offset)
+        target[...] = array
+        del target
+
+    return SharedQube(shm.name, shm.size, record, shm=shm)
+
+
+@staticmethod
+def from_shared(handle):
+    """Reconstruct an object from a handle returned by :meth:`to_shared`.
+
+    The values, mask and derivatives of the returned object are read-only views of the
+    shared memory, so nothing is copied. The object remains valid after the handle is
+    closed or even unlinked.
+
+    Parameters:
+        handle (SharedQube): The handle.
+
+    Returns:
+        Qube: A read-only object.
+
+    Raises:
+        TypeError: If `handle` is not a SharedQube.
+    """
+
+    if not isinstance(handle, SharedQube):
+        raise TypeError('Qube.from_shared() requires a SharedQube, not '
+                        f'{type(handle).__name__}')
+
+    block = _Block(handle._attach())
+    return _rebuild(handle.record, block.array).as_readonly()
+
+##########################################################################################
@@ -2,10 +2,24 @@
 # polymath/extensions/shrinker.py: shrink and unshrink operations
 ################################################################################
 
+import functools
+import math
 import numpy as np
+from polymath.extensions import masking
 from polymath.qube import Qube
 
-__all__ = ['shrink', 'unshrink']
+__all__ = ['ShrunkComputation', 'set_auto_shrink', 'shrink', 'shrunk', 'unshrink']
+
+# The masked fraction of an operand above which elementwise operations are computed only
+# over the unmasked elements; None to disable automatic shrinking
+_AUTO_SHRINK = None
+
+# Below this many elements, shrinking and unshrinking cost more than they save
+_AUTO_SHRINK_MIN_SIZE = 1000
+
+# Operations are computed inside the box bounding the unmasked elements, rather than over
+# the gathered elements, when the box holds no more than this many times as many elements
+_AUTO_BOX_RATIO = 2.
 
 
 def shrink(self, antimask):
@@ -200,4 +214,466 @@ def unshrink(self, antimask, shape=()):
 
     return obj
 
+
+class ShrunkComputation:
+    """A context for computing over the elements selected by one antimask.
+
+    The flat indices of the antimask are found once, when the context is created, and are
+    used to shrink every input given to :meth:`wrap` and to unshrink every result given to
+    :meth:`unwrap`, along with all of their derivatives. Unlike :meth:`Qube.shrink` and
+    :meth:`Qube.unshrink`, nothing is cached in the objects themselves.
+
+    Attributes:
+        shape (tuple): The shape of the antimask and of every unshrunk result.
+        index (numpy.ndarray): The flat indices of the True elements of the antimask; None
+            once the context has exited.
+    """
+
+    def __init__(self, antimask):
+        """Constructor for a ShrunkComputation object.
+
+        Parameters:
+            antimask (array-like): A boolean array, True where elements are to be
+                included.
+
+        Raises:
+            ValueError: If the antimask is not an array.
+        """
+
+        antimask = np.asarray(antimask, dtype=np.bool_)
+        if not antimask.shape:
+            raise ValueError('Qube.shrunk() requires an antimask array')
+
+        self.shape = antimask.shape
+        self.index = np.flatnonzero(antimask)
+        self._mask = np.logical_not(antimask)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.index = None
+        self._mask = None
+        return False
+
+    def __repr__(self):
+        if self.index is None:
+            return f'ShrunkComputation(shape={self.shape}, exited)'
+        return f'ShrunkComputation(shape={self.shape}, size={self.index.size})'
+
+    def _check_active(self, name):
+        if self.index is None:
+            raise ValueError(f'ShrunkComputation.{name}() used after its context exited')
+
+    def wrap(self, *objects):
+        """Shrink objects to the elements of the antimask.
+
+        Each Qube is broadcast to the shape of the antimask if necessary and converted to
+        a 1-D object holding only the selected elements, with its derivatives shrunk the
+        same way. Shapeless objects and anything other than a Qube are returned unchanged.
+
+        Parameters:
+            *objects: The objects to shrink.
+
+        Returns:
+            Qube or tuple: The shrunk object, or a tuple of them if more than one object
+            was given.
+
+        Raises:
+            ValueError: If the context has exited or an object does not broadcast to the
+                shape of the antimask.
+        """
+
+        self._check_active('wrap')
+
+        shrunk = []
+        for obj in objects:
+            if isinstance(obj, Qube) and obj._shape:
+                if obj._shape != self.shape:
+                    try:
+                        obj = obj.broadcast_to(self.shape)
+                    except ValueError:
+                        raise ValueError(f'shape {obj._shape} does not broadcast to the '
+                                         f'antimask shape {self.shape}') from None
+                obj = _take(obj, self.index)
+            shrunk.append(obj)
+
+        return shrunk[0] if len(shrunk) == 1 else tuple(shrunk)
+
+    def unwrap(self, *objects):
+        """Unshrink the results of a computation on objects returned by :meth:`wrap`.
+
+        Each 1-D Qube is expanded to the shape of the antimask, with its derivatives
+        expanded the same way. Elements outside the antimask are masked and hold the
+        default value of the class. Shapeless objects and anything other than a Qube are
+        returned unchanged.
+
+        Parameters:
+            *objects: The objects to unshrink.
+
+        Returns:
+            Qube or tuple: The unshrunk object, or a tuple of them if more than one object
+            was given.
+
+        Raises:
+            ValueError: If the context has exited or an object does not have one element
+                for each True element of the antimask.
+        """
+
+        self._check_active('unwrap')
+
+        unshrunk = []
+        for obj in objects:
+            if isinstance(obj, Qube) and obj._shape:
+                if obj._shape != self.index.shape:
+                    raise ValueError(f'shape {obj._shape} does not match the shrunk '
+                                     f'shape {self.index.shape}')
+                obj = _expand(obj, self.shape, self.index, self._mask)
+            unshrunk.append(obj)
+
+        return unshrunk[0] if len(unshrunk) == 1 else tuple(unshrunk)
+
+
+@staticmethod
+def shrunk(antimask):
+    """A context in which to compute over only the elements selected by an antimask.
+
+    Inputs are shrunk with :meth:`ShrunkComputation.wrap` and results are unshrunk with
+    :meth:`ShrunkComputation.unwrap`, all sharing the flat indices of the antimask, which
+    are found only once. For example::
+
+        with Qube.shrunk(antimask) as s:
+            (a, b) = s.wrap(a, b)
+            c = s.unwrap(a.sin() * b)
+
+    Parameters:
+        antimask (array-like): A boolean array, True where elements are to be included.
+
+    Returns:
+        ShrunkComputation: The context.
+
+    Raises:
+        ValueError: If the antimask is not an array.
+    """
+
+    return ShrunkComputation(antimask)
+
+
+@staticmethod
+def set_auto_shrink(threshold=None):
+    """Compute elementwise operations only over the unmasked elements of mostly masked
+    operands.
+
+    Under this policy, when any operand of an arithmetic operator or a Scalar function
+    such as :meth:`~Scalar.sin` or :meth:`~Scalar.sqrt` has more than the given fraction
+    of its elements masked, the operation is performed only where the operands are
+    unmasked, and the result is expanded back to the full shape. The result is the same
+    as without shrinking, except that the values at masked elements are the default value
+    of the class rather than whatever the operation produced there.
+
+    If the box given by the :attr:`corners` of the operands holds no more than twice as
+    many elements as are unmasked, as for a planet that fills a small part of an image,
+    the operation is performed on views of the operands inside the box, and the corners
+    are passed on to the result unless the operation masks anything more. Otherwise, the
+    operands are shrunk to the elements where all of them are unmasked.
+
+    Expanding a result costs about as much as a simple arithmetic operation on the full
+    object, so the time saved depends on the operation. Functions such as
+    :meth:`~Scalar.sin` run several times faster on operands that are more than half
+    masked, whereas addition and multiplication of Scalars gain only when nearly all of
+    the elements are masked.
+
+    Operations are not shrunk if the operands have different shapes, if an operand is an
+    array rather than a Qube or a number, if an `out` object is given, or if the
+    operands have fewer than 1000 elements.
+
+    Parameters:
+        threshold (float, optional): The masked fraction, from zero up to but not
+            including one, above which operations are shrunk; None to disable automatic
+            shrinking, which is the default.
+
+    Raises:
+        ValueError: If `threshold` is not None or a number in the range [0, 1).
+    """
+
+    global _AUTO_SHRINK
+
+    if threshold is not None:
+        if (not isinstance(threshold, (int, float, np.integer, np.floating))
+                or isinstance(threshold, (bool, np.bool_))
+                or not 0. <= threshold < 1.):
+            raise ValueError(f'invalid auto-shrink threshold: {threshold!r}')
+        threshold = float(threshold)
+
+    _AUTO_SHRINK = threshold
+
+
+def _auto_operands(self, args):
+    """The operands over which to shrink an operation and those among them with distinct
+    mask arrays; None if the operation should not be shrunk.
+    """
+
+    shape = self._shape
+    if self._size < _AUTO_SHRINK_MIN_SIZE or Qube._DISABLE_SHRINKING:
+        return None
+
+    operands = [self]
+    for arg in args:
+        if isinstance(arg, Qube):
+            if arg._shape == shape:
+                operands.append(arg)
+            elif arg._shape:
+                return None
+        elif np.shape(arg):
+            return None
+
+    # Shrink only if some operand is masked beyond the threshold
+    limit = _AUTO_SHRINK * self._size
+    masked = []
+    for obj in operands:
+        if np.shape(obj._mask):
+            if not any(obj._mask is other._mask for other in masked):
+                masked.append(obj)
+        elif obj._mask:
+            return None
+
+    if not any(_masked_count(obj) > limit for obj in masked):
+        return None
+
+    return (operands, masked)
+
+
+def _common_corners(masked):
+    """The corners of the box holding every element unmasked in all of these objects, or
+    None if there is no such element.
+    """
+
+    lower = np.max([obj.corners[0] for obj in masked], axis=0)
+    upper = np.min([obj.corners[1] for obj in masked], axis=0)
+    if np.any(lower >= upper):
+        return None
+
+    return (tuple(int(i) for i in lower), tuple(int(i) for i in upper))
+
+
+def _flat_plan(masked):
+    """The flat indices of the elements unmasked in all of these objects, and the mask of
+    a result where it is unmasked itself.
+    """
+
+    # With one distinct mask, it is the mask of the result
+    if len(masked) == 1:
+        return (_unmasked_index(masked[0]), masked[0]._mask)
+
+    antimask = masked[0].antimask
+    for obj in masked[1:]:
+        antimask = antimask & obj.antimask
+
+    return (np.flatnonzero(antimask), np.logical_not(antimask))
+
+
+def _masked_count(obj):
+    """The number of masked elements in an object with a mask array, cached."""
+
+    if Qube._DISABLE_CACHE:
+        return np.count_nonzero(obj._mask)
+
+    count = obj._cache.get('masked_count')
+    if count is None:
+        count = np.count_nonzero(obj._mask)
+        obj._cache['masked_count'] = count
+
+    return count
+
+
+def _unmasked_index(obj):
+    """The flat indices of the unmasked elements of an object with a mask array, cached.
+    """
+
+    if Qube._DISABLE_CACHE:
+        return np.flatnonzero(obj.antimask)
+
+    index = obj._cache.get('unmasked_index')
+    if index is None:
+        index = np.flatnonzero(obj.antimask)
+        obj._cache['unmasked_index'] = index
+
+    return index
+
+
+def _crop(obj, slicer):
+    """An object holding the elements of an object inside a box, with its derivatives.
+    The values and mask are views, not copies.
+    """
+
+    mask = obj._mask
+    if np.shape(mask):
+        mask = mask[slicer]
+
+    result = type(obj)._new_from_parts(np.asarray(obj._values)[slicer], mask,
+                                       nrank=obj._nrank, drank=obj._drank,
+                                       unit=obj._unit, example=obj)
+    for key, deriv in obj._derivs.items():
+        result.insert_deriv(key, _crop(deriv, slicer))
+
+    if obj._readonly:
+        result.as_readonly(recursive=False)
+
+    return result
+
+
+def _uncrop(obj, shape, slicer):
+    """An object of the given shape holding a cropped result inside a box and masked
+    default values elsewhere.
+    """
+
+    values = np.empty(shape + obj._item, dtype=np.asarray(obj._values).dtype)
+    values.reshape(-1)[...] = _fill_value(obj)
+    values[slicer] = obj._values
+
+    mask = np.ones(shape, dtype=np.bool_)
+    mask[slicer] = obj._mask
+
+    result = type(obj)._new_from_parts(values, mask, nrank=obj._nrank, drank=obj._drank,
+                                       unit=obj._unit, example=obj)
+    for key, deriv in obj._derivs.items():
+        result.insert_deriv(key, _uncrop(deriv, shape, slicer))
+
+    if obj._readonly:
+        result.as_readonly(recursive=False)
+
+    return result
+
+
+def _fill_value(obj):
+    """The default value of an object, as a single number if every part of it is equal.
+    Filling with a single number is much faster than broadcasting an item.
+    """
+
+    default = obj._default
+    if isinstance(default, Qube):
+        default = default._values
+
+    default = np.asarray(default)
+    if default.size and np.all(default == default.flat[0]):
+        return default.flat[0]
+
+    return default
+
+
+def _take(obj, index):
+    """A 1-D object holding the given flat elements of an object, with its derivatives.
+    """
+
+    values = np.take(np.asarray(obj._values).reshape((-1,) + obj._item), index, axis=0)
+
+    mask = obj._mask
+    if np.shape(mask):
+        mask = mask.ravel()[index]
+        if not mask.any():
+            mask = False
+
+    result = type(obj)._new_from_parts(values, mask, nrank=obj._nrank, drank=obj._drank,
+                                       unit=obj._unit, example=obj)
+    for key, deriv in obj._derivs.items():
+        result.insert_deriv(key, _take(deriv, index))
+
+    if obj._readonly:
+        result.as_readonly(recursive=False)
+
+    return result
+
+
+def _expand(obj, shape, index, mask):
+    """An object of the given shape holding a shrunk result at the given flat indices and
+    masked default values elsewhere.
+
+    The mask given is that of the result where the shrunk result itself is unmasked.
+    """
+
+    values = np.empty(shape + obj._item, dtype=np.asarray(obj._values).dtype)
+    values.reshape(-1)[...] = _fill_value(obj)
+    values.reshape((-1,) + obj._item)[index] = obj._values
+
+    if Qube.is_one_false(obj._mask):
+        new_mask = mask
+    elif np.all(obj._mask):
+        new_mask = True
+    else:
+        new_mask = mask.copy()
+        new_mask.ravel()[index] = obj._mask
+
+    result = type(obj)._new_from_parts(values, new_mask, nrank=obj._nrank,
+                                       drank=obj._drank, unit=obj._unit, example=obj)
+    for key, deriv in obj._derivs.items():
+        result.insert_deriv(key, _expand(deriv, shape, index, mask))
+
+    if obj._readonly:
+        result.as_readonly(recursive=False)
+
+    return result
+
+
+@staticmethod
+def _auto_shrink(func):
+    """Decorator for an elementwise operation, which combines sparse or packed masks
+    without converting them to arrays, and shrinks its operands when the policy set by
+    set_auto_shrink() calls for it.
+
+    The decorated function takes this object followed by any other operands as positional
+    arguments, and keyword options.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if masking._COMPACT_MASKS and kwargs.get('out') is None:
+            result = masking._compact_operation(func, self, args, kwargs)
+            if result is not None:
+                return result
+
+        if _AUTO_SHRINK is None or kwargs.get('out') is not None:
+            return func(self, *args, **kwargs)
+
+        found = _auto_operands(self, args)
+        if found is None:
+            return func(self, *args, **kwargs)
+
+        (operands, masked) = found
+        corners = _common_corners(masked)
+        if corners is None:
+            return func(self, *args, **kwargs)
+
+        # Computing inside the box avoids gathering and scattering, so it is preferred
+        # unless the box is mostly masked
+        shape = self._shape
+        box_size = math.prod(Qube._shape_from_corners(corners))
+        unmasked = min(obj._size - _masked_count(obj) for obj in masked)
+        if box_size <= _AUTO_BOX_RATIO * unmasked:
+            slicer = Qube._slicer_from_corners(corners)
+            args = [_crop(arg, slicer) if any(arg is obj for obj in operands[1:]) else arg
+                    for arg in args]
+            cropped = _crop(self, slicer)
+            result = func(cropped, *args, **kwargs)
+            expanded = _uncrop(result, shape, slicer)
+
+            # The corners are unchanged unless the operation masked something more
+            if (not Qube._DISABLE_CACHE and len(masked) == 1
+                    and corners == masked[0].corners
+                    and (Qube.is_one_false(result._mask)
+                         or any(result._mask is arg._mask
+                                for arg in [cropped] + args if isinstance(arg, Qube)))):
+                expanded._cache['corners'] = masked[0].corners
+                expanded._cache['masked_count'] = _masked_count(masked[0])
+
+            return expanded
+
+        (index, mask) = _flat_plan(masked)
+        args = [_take(arg, index) if any(arg is obj for obj in operands[1:]) else arg
+                for arg in args]
+        result = func(_take(self, index), *args, **kwargs)
+
+        return _expand(result, shape, index, mask)
+
+    return wrapper
+
 ################################################################################
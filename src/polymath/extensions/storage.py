@@ -0,0 +1,110 @@
+##########################################################################################
+# polymath/extensions/storage.py: memory-mapped storage of Qube objects
+##########################################################################################
+"""This module supports the storage of polymath objects in memory-mappable files.
+
+Unpickling an object decompresses all of its arrays at once. :meth:`~polymath.Qube.save`
+instead writes the values, the mask and each derivative as uncompressed blocks, and
+:meth:`~polymath.Qube.load` returns an object whose arrays are `numpy.memmap` views of
+the file. Only the parts of the file that are actually used are ever read from disk.
+
+The file contains:
+
+* the eight bytes "POLYMATH";
+* the length of the header, as an eight-byte little-endian integer;
+* the header, a pickled record of the class, unit, nrank, drank and derivative keys of
+  the object and the dtype, shape and location of each of its arrays;
+* the arrays, in C order, each beginning on a multiple of 64 bytes.
+"""
+
+import os
+import pickle
+import numpy as np
+
+from polymath.extensions.sharing import _ALIGNMENT, _layout, _rebuild
+
+__all__ = ['load', 'save']
+
+_MAGIC = b'POLYMATH'
+_MMAP_MODES = ('r', 'c', None)
+
+
+def _aligned(size):
+    """The given size rounded up to a multiple of _ALIGNMENT."""
+
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def save(self, path):
+    """Write this object to a file that :meth:`load` can memory-map.
+
+    The values, mask and derivatives are stored without compression, so the file is
+    about as large as the object in memory; use pickling for compact storage.
+
+    Parameters:
+        path (str or os.PathLike): The path of the file to write.
+    """
+
+    (record, arrays, size) = _layout(self)
+    header = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+    start = _aligned(len(_MAGIC) + 8 + len(header))
+
+    with open(path, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+
+        for (offset, array) in arrays:
+            f.seek(start + offset)
+            array.tofile(f)
+
+        f.truncate(start + size)
+
+
+@staticmethod
+def load(path, mmap_mode='r'):
+    """Read an object from a file written by :meth:`save`.
+
+    Parameters:
+        path (str or os.PathLike): The path of the file to read.
+        mmap_mode (str or None, optional): "r" to return a read-only object whose arrays
+            are memory-mapped from the file; "c" to memory-map them copy-on-write, so
+            that the object is writable but changes are never written to the file; None
+            to read the arrays into memory.
+
+    Returns:
+        Qube: The object.
+
+    Raises:
+        ValueError: If `mmap_mode` is invalid or if the file was not written by
+            :meth:`save`.
+    """
+
+    if mmap_mode not in _MMAP_MODES:
+        raise ValueError(f'invalid mmap_mode for Qube.load(): {mmap_mode!r}')
+
+    with open(path, 'rb') as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f'not a file written by Qube.save(): {os.fspath(path)}')
+
+        size = int.from_bytes(f.read(8), 'little')
+        record = pickle.loads(f.read(size))
+
+    start = _aligned(len(_MAGIC) + 8 + size)
+
+    def array(offset, shape, dtype):
+        count = int(np.prod(shape))
+        if mmap_mode is None or count == 0:
+            values = np.fromfile(path, dtype=dtype, count=count, offset=start + offset)
+            return values.reshape(shape)
+
+        return np.memmap(path, dtype=dtype, mode=mmap_mode, offset=start + offset,
+                         shape=shape)
+
+    obj = _rebuild(record, array)
+    if mmap_mode == 'r':
+        obj.as_readonly()
+
+    return obj
+
+##########################################################################################
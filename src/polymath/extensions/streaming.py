@@ -0,0 +1,183 @@
+##########################################################################################
+# polymath/extensions/streaming.py: streaming pickles of large Qube objects
+##########################################################################################
+"""This module supports the pickling of large polymath objects in blocks of rows.
+
+Pickling an object builds its entire encoded state in memory before anything is written,
+so a multi-gigabyte object briefly needs room for itself plus its compressed copy.
+:meth:`~polymath.Qube.dump_blocks` instead slices the object along its leading axis and
+pickles each block of rows to the file as soon as it is encoded, with the usual
+compression. :meth:`~polymath.Qube.iter_blocks` reads the blocks back one at a time, and
+:meth:`~polymath.Qube.load_blocks` assembles them into the full object. Either way, the
+memory needed beyond the object itself stays near one block. For example::
+
+    with open(path, 'wb') as f:
+        backplane.dump_blocks(f)
+
+    with open(path, 'rb') as f:
+        for block in Qube.iter_blocks(f):
+            ...
+
+The file contains a pickled header, the tuple ("polymath.blocks", class, shape, rows,
+count, readonly), followed by `count` pickled objects, each holding up to `rows` rows.
+"""
+
+import pickle
+import numpy as np
+
+__all__ = ['dump_blocks', 'iter_blocks', 'load_blocks']
+
+_BLOCKS_HEADER = 'polymath.blocks'
+
+# The default number of values in each block
+_BLOCK_VALUES = 2**22
+
+# The pickle settings that each block carries over from the object
+_PICKLE_ATTRS = ('_pickle_digits', '_pickle_reference', '_pickle_codec')
+
+
+def _copy_settings(source, block):
+    """Copy the pickle settings of an object and its derivatives onto a block of it."""
+
+    for attr in _PICKLE_ATTRS:
+        if hasattr(source, attr):
+            setattr(block, attr, getattr(source, attr))
+
+    for (key, deriv) in source._derivs.items():
+        _copy_settings(deriv, block._derivs[key])
+
+
+def dump_blocks(self, file, rows=None, protocol=None):
+    """Pickle this object to a file in blocks of rows, writing each one as it is encoded.
+
+    Each block is a slice along the leading axis, pickled with the compression settings
+    of this object and its derivatives. A reference given as "largest", "smallest" or
+    "auto" is evaluated separately for each block. A delta reference set by
+    :meth:`set_pickle_delta` and attributes added by :meth:`add_attr` are not retained.
+    A shapeless object is written as a single block.
+
+    Parameters:
+        file (file-like): A binary file open for writing.
+        rows (int, optional): The number of rows in each block; None for blocks of about
+            four million values.
+        protocol (int, optional): The pickle protocol; None for the default.
+
+    Raises:
+        ValueError: If `rows` is not a positive integer.
+    """
+
+    if self._shape:
+        length = self._shape[0]
+        if rows is None:
+            row_size = int(np.prod(self._shape[1:] + self._item))
+            rows = max(1, _BLOCK_VALUES // max(1, row_size))
+        elif not isinstance(rows, (int, np.integer)) or rows < 1:
+            raise ValueError(f'invalid number of rows for Qube.dump_blocks(): {rows!r}')
+        rows = int(rows)
+        count = max(1, -(-length // rows))
+    else:
+        rows = 1
+        count = 1
+
+    header = (_BLOCKS_HEADER, type(self), self._shape, rows, count, self._readonly)
+    pickle.dump(header, file, protocol=protocol)
+
+    if not self._shape:
+        pickle.dump(self, file, protocol=protocol)
+        return
+
+    for k in range(count):
+        block = self[k * rows:(k + 1) * rows]
+        _copy_settings(self, block)
+        pickle.dump(block, file, protocol=protocol)
+        del block
+
+
+def _read_header(file):
+    """The validated header of a file written by dump_blocks()."""
+
+    header = pickle.load(file)
+    if not (isinstance(header, tuple) and len(header) == 6
+            and header[0] == _BLOCKS_HEADER):
+        raise ValueError('not a file written by Qube.dump_blocks()')
+
+    return header[1:]
+
+
+def _blocks(file, count):
+    """A generator of the blocks of a file, after its header has been read."""
+
+    for _ in range(count):
+        yield pickle.load(file)
+
+
+@staticmethod
+def iter_blocks(file):
+    """Iterate over the blocks of rows in a file written by :meth:`dump_blocks`.
+
+    The header is read immediately; each block is read only when it is requested.
+
+    Parameters:
+        file (file-like): A binary file open for reading.
+
+    Returns:
+        iterator: The blocks, in order along the leading axis.
+
+    Raises:
+        ValueError: If the file was not written by :meth:`dump_blocks`.
+    """
+
+    (_, _, _, count, _) = _read_header(file)
+    return _blocks(file, count)
+
+
+def _empty_like(block, shape):
+    """A writable object of the given shape with the class, item, unit and derivatives of
+    a block, ready to be filled.
+    """
+
+    def empty(obj):
+        values = np.empty(shape + obj._item, dtype=np.asarray(obj._values).dtype)
+        return type(obj)._new_from_parts(values, False, nrank=obj._nrank,
+                                         drank=obj._drank, unit=obj._unit)
+
+    result = empty(block)
+    result.insert_derivs({key: empty(deriv) for (key, deriv) in block._derivs.items()})
+    return result
+
+
+@staticmethod
+def load_blocks(file):
+    """Read the full object from a file written by :meth:`dump_blocks`.
+
+    The object is allocated once and filled block by block, so no more than one encoded
+    block is held in memory at a time.
+
+    Parameters:
+        file (file-like): A binary file open for reading.
+
+    Returns:
+        Qube: The object.
+
+    Raises:
+        ValueError: If the file was not written by :meth:`dump_blocks`.
+    """
+
+    (_, shape, rows, count, readonly) = _read_header(file)
+    blocks = _blocks(file, count)
+    first = next(blocks)
+    if count == 1:
+        return first
+
+    obj = _empty_like(first, shape)
+    obj[:rows] = first
+    del first
+    for (k, block) in enumerate(blocks, start=1):
+        obj[k * rows:(k + 1) * rows] = block
+
+    if readonly:
+        obj.as_readonly()
+
+    return obj
+
+##########################################################################################
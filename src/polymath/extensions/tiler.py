@@ -0,0 +1,237 @@
+##########################################################################################
+# polymath/extensions/tiler.py: tiled evaluation of functions over large objects
+##########################################################################################
+
+import itertools
+import os
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from polymath.qube import Qube
+from polymath.unit import Unit
+
+__all__ = ['map_tiles']
+
+# Default tile size along each of the first two axes
+_DEFAULT_TILE = 256
+
+
+@staticmethod
+def map_tiles(func, *args, tile_shape=None, workers=None):
+    """Apply a function to an object tile by tile, using a pool of threads.
+
+    The Qube arguments are split into tiles along their leading axes, `func` is applied
+    to each tile, and the tiles it returns are stitched back into full-size objects. The
+    result is the same as `func(*args)`, except that the temporary arrays of each call are
+    only as large as one tile. Most NumPy functions release the GIL, so tiles are
+    processed in parallel.
+
+    Tiles are selected using the same slices as `__getitem__`. The arguments are
+    broadcast against one another, so an argument with a missing or unit axis is used in
+    full along that axis. Arguments that are not Qube objects are passed unchanged to
+    every call.
+
+    The function must operate elementwise on the leading axes and return a Qube, or a
+    tuple of Qubes, whose shape matches that of the tile. Values, masks, units and
+    derivatives are all stitched. A derivative that is missing from some tiles is zero in
+    those tiles. A result is read-only if every tile of it was read-only.
+
+    Parameters:
+        func (function): The function to apply.
+        *args: Arguments to the function.
+        tile_shape (int or tuple, optional): The size of the tiles along the leading
+            axes. Any axis beyond those given is not split. Default is 256 along each of
+            the first two axes.
+        workers (int, optional): The number of threads to use; 1 evaluates the tiles
+            serially. Default is the number of CPUs.
+
+    Returns:
+        Qube or tuple: The stitched result or results.
+
+    Raises:
+        TypeError: If `func` does not return a Qube or tuple of Qubes, or returns
+            different classes for different tiles.
+        ValueError: If the tiles returned are incompatible with one another or with the
+            tile shape.
+    """
+
+    shape = Qube.broadcasted_shape(*args)
+    if not shape:
+        return func(*args)
+
+    if tile_shape is None:
+        tile_shape = 2 * (_DEFAULT_TILE,)
+    elif isinstance(tile_shape, (int, np.integer)):
+        tile_shape = (tile_shape,)
+
+    tile_shape = tuple(tile_shape)[:len(shape)]
+    if any(size < 1 for size in tile_shape):
+        raise ValueError(f'invalid tile shape for Qube.map_tiles(): {tile_shape}')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # Define the tiles
+    ranges = [range(0, shape[k], step) for (k, step) in enumerate(tile_shape)]
+    tiles = []
+    for starts in itertools.product(*ranges):
+        tiles.append(tuple(slice(start, start + tile_shape[k])
+                           for (k, start) in enumerate(starts)))
+
+    def tile_func(indx):
+        return func(*[_tile_arg(arg, indx, len(shape)) for arg in args])
+
+    # Evaluate
+    stitchers = None
+    if workers == 1 or len(tiles) == 1:
+        for indx in tiles:
+            stitchers = _stitch(stitchers, shape, indx, tile_func(indx))
+
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(tile_func, indx): indx for indx in tiles}
+            try:
+                for future in as_completed(futures):
+                    stitchers = _stitch(stitchers, shape, futures[future],
+                                        future.result())
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
+    (results, is_tuple) = stitchers
+    results = tuple(stitcher.result() for stitcher in results)
+    return results if is_tuple else results[0]
+
+
+def _tile_arg(arg, indx, ndims):
+    """The tile of an argument selected by a tuple of slices along the leading axes of the
+    full shape.
+
+    Axes that the argument does not have, or along which it has unit size, are not
+    sliced, so the argument broadcasts against the other tiles as it would in full.
+    """
+
+    if not isinstance(arg, Qube) or not arg._shape:
+        return arg
+
+    offset = ndims - arg._ndims
+    arg_indx = []
+    for (k, size) in enumerate(arg._shape):
+        if size == 1 or k + offset >= len(indx):
+            arg_indx.append(slice(None))
+        else:
+            arg_indx.append(indx[k + offset])
+
+    if all(i == slice(None) for i in arg_indx):
+        return arg
+
+    return arg[tuple(arg_indx)]
+
+
+def _stitch(stitchers, shape, indx, results):
+    """Write the results of one tile into the stitchers, creating them if necessary.
+
+    Returns:
+        tuple: (list of _Stitcher, True if the function returns a tuple).
+    """
+
+    is_tuple = isinstance(results, tuple)
+    if not is_tuple:
+        results = (results,)
+
+    for result in results:
+        if not isinstance(result, Qube):
+            raise TypeError('function passed to Qube.map_tiles() must return a Qube or '
+                            f'a tuple of Qubes, not {type(result).__name__}')
+
+    if stitchers is None:
+        stitchers = ([_Stitcher(result, shape) for result in results], is_tuple)
+    elif len(results) != len(stitchers[0]) or is_tuple != stitchers[1]:
+        raise ValueError('function passed to Qube.map_tiles() returned a different '
+                         'number of results for different tiles')
+
+    for (stitcher, result) in zip(stitchers[0], results, strict=True):
+        stitcher.write(indx, result)
+
+    return stitchers
+
+
+class _Stitcher:
+    """The full-size values, mask and derivatives of one result of Qube.map_tiles()."""
+
+    def __init__(self, example, shape):
+
+        self.cls = type(example)
+        self.shape = shape
+        self.nrank = example._nrank
+        self.drank = example._drank
+        self.item = example._item
+        self.unit = example._unit
+        self.values = np.empty(shape + example._item,
+                               dtype=np.result_type(example._values))
+        self.mask = False
+        self.derivs = {}
+        self.readonly = True
+
+    def write(self, indx, tile):
+        """Write one tile into the full-size arrays.
+
+        The shapes of the tile, its mask and, through the recursive calls, its derivatives
+        must match the slice they are written into.
+        """
+
+        if type(tile) is not self.cls:
+            raise TypeError('function passed to Qube.map_tiles() returned both '
+                            f'{self.cls.__name__} and {type(tile).__name__}')
+        if tile._item != self.item or tile._drank != self.drank:
+            raise ValueError('function passed to Qube.map_tiles() returned item shapes '
+                             f'{self.item} and {tile._item}')
+
+        Unit.require_compatible(self.unit, tile._unit, 'Qube.map_tiles()')
+        if self.unit is None:
+            self.unit = tile._unit
+
+        # Assignment would broadcast a shapeless or undersized tile, so check first
+        shape = self.values[indx].shape[:len(self.shape)]
+        if tile._shape != shape:
+            raise ValueError('function passed to Qube.map_tiles() returned shape '
+                             f'{tile._shape} for a tile of shape {shape}')
+        if np.shape(tile._mask) not in ((), shape):
+            raise ValueError('function passed to Qube.map_tiles() returned mask shape '
+                             f'{np.shape(tile._mask)} for a tile of shape {shape}')
+
+        dtype = np.result_type(tile._values)
+        if not np.can_cast(dtype, self.values.dtype):
+            self.values = self.values.astype(np.result_type(self.values, dtype))
+
+        self.values[indx] = tile._values
+
+        if np.any(tile._mask):
+            if self.mask is False:
+                self.mask = np.zeros(self.shape, dtype=np.bool_)
+            self.mask[indx] = tile._mask
+        elif self.mask is not False:
+            self.mask[indx] = False
+
+        for (key, deriv) in tile._derivs.items():
+            if key not in self.derivs:
+                self.derivs[key] = _Stitcher(deriv, self.shape)
+                self.derivs[key].values.fill(0)
+            self.derivs[key].write(indx, deriv)
+
+        self.readonly = self.readonly and tile._readonly
+
+    def result(self):
+        """The stitched object."""
+
+        obj = self.cls._new_from_parts(self.values, self.mask, nrank=self.nrank,
+                                       drank=self.drank, unit=self.unit)
+        obj.insert_derivs({key: stitcher.result()
+                           for (key, stitcher) in self.derivs.items()})
+        if self.readonly:
+            obj.as_readonly()
+
+        return obj
+
+##########################################################################################
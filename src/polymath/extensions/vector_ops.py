@@ -190,7 +190,7 @@ def _zero_sized_result(self, axis):
 
 
 @staticmethod
-def dot(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
+def dot(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True, out=None):
     """Calculate the dot product of two objects.
 
     The axes must be in the numerator, and only one of the objects can have a denominator
@@ -211,6 +211,9 @@ def dot(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
             list is provided, the object will be an instance of the first suitable class
             in the list. Otherwise, a generic Qube object will be returned.
         recursive (bool, optional): True to include derivatives in the returned object.
+        out (Qube, optional): A writable object of the same shape and item as the result,
+            into which the result is written in place of a new object. Its class takes
+            the place of `classes`.
 
     Returns:
         Qube: The dot product of the two objects.
@@ -248,6 +251,17 @@ def dot(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
         raise ValueError(f'{type(arg1)}.dot() axes have different lengths: '
                          f'{arg1._numer[a1]}, {arg2._numer[a2]}')
 
+    # Locate the values of the output object if any
+    if out is None:
+        buffer = None
+    else:
+        item = (arg1._numer[:a1] + arg1._numer[a1+1:] + arg2._numer[:a2] +
+                arg2._numer[a2+1:] + arg1._denom + arg2._denom)
+        buffer = Qube._prep_out(out, Qube, Qube.broadcasted_shape(arg1, arg2), item,
+                                'dot()', arg1, arg2)
+        if buffer is None:
+            return Qube._copy_out(Qube.dot(arg1, arg2, a1, a2, recursive=recursive), out)
+
     # The general contraction below broadcasts the numerator axes of the two operands
     # against each other and reduces over the outer product, which is a great deal of work
     # for the matrix products that dominate ordinary use. Where the operands contract
@@ -258,9 +272,10 @@ def dot(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
             # Unlike einsum, matmul is much slower on strided input than it is on a
             # contiguous copy of the same values, and a transposed matrix is strided
             new_values = np.matmul(np.ascontiguousarray(arg1._values),
-                                   np.ascontiguousarray(arg2._values))
+                                   np.ascontiguousarray(arg2._values), out=buffer)
         elif arg1._nrank == 2 and arg2._nrank == 1:     # matrix times vector
-            new_values = np.einsum('...ij,...j->...i', arg1._values, arg2._values)
+            new_values = np.einsum('...ij,...j->...i', arg1._values, arg2._values,
+                                   out=buffer)
         else:
             new_values = None
     else:
@@ -286,17 +301,21 @@ def dot(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
         # the elementwise product, which matters for the large arrays this is used on. It
         # also reads strided input directly, so the operands need not be made contiguous
         # first.
-        new_values = np.einsum('...i,...i->...', array1, array2)
+        new_values = np.einsum('...i,...i->...', array1, array2, out=buffer)
 
     # Construct the object and cast
     new_nrank = arg1._nrank + arg2._nrank - 2
     new_drank = arg1._drank + arg2._drank
+    new_unit = Unit.mul_units(arg1._unit, arg2._unit)
 
-    obj = Qube._new_from_parts(new_values, Qube.or_(arg1._mask, arg2._mask),
-                               nrank=new_nrank, drank=new_drank,
-                               unit=Unit.mul_units(arg1._unit, arg2._unit),
-                               example=arg1)
-    obj = obj.cast(classes)
+    if out is None:
+        obj = Qube._new_from_parts(new_values, Qube.or_(arg1._mask, arg2._mask),
+                                   nrank=new_nrank, drank=new_drank, unit=new_unit,
+                                   example=arg1)
+        obj = obj.cast(classes)
+    else:
+        obj = Qube._fill_out(out, (arg1._mask, arg2._mask), new_unit)
+        classes = type(out)
 
     # Insert derivatives if necessary
     if recursive and (arg1._derivs or arg2._derivs):
@@ -325,7 +344,7 @@ def dot(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
 
 
 @staticmethod
-def norm(arg, axis=-1, *, classes=(), recursive=True):
+def norm(arg, axis=-1, *, classes=(), recursive=True, out=None):
     """Calculate the norm of an object along one axis.
 
     The axes must be in the numerator. The denominator must have zero rank.
@@ -340,6 +359,9 @@ def norm(arg, axis=-1, *, classes=(), recursive=True):
             list is provided, the object will be an instance of the first suitable class
             in the list. Otherwise, a generic Qube object will be returned.
         recursive (bool, optional): True to include derivatives in the returned object.
+        out (Qube, optional): A writable object of the same shape and item as the result,
+            into which the result is written in place of a new object. Its class takes
+            the place of `classes`.
 
     Returns:
         Qube: The norm of the object along the specified axis.
@@ -366,15 +388,29 @@ def norm(arg, axis=-1, *, classes=(), recursive=True):
                          f'{type(arg)}.norm(): {axis}')
     k1 = a1 + arg._ndims
 
+    # Locate the values of the output object if any
+    if out is None:
+        buffer = None
+    else:
+        buffer = Qube._prep_out(out, Qube, arg._shape,
+                                arg._numer[:a1] + arg._numer[a1+1:], 'norm()', arg)
+        if buffer is None:
+            return Qube._copy_out(Qube.norm(arg, a1, recursive=recursive), out)
+
     # Evaluate the norm. Contracting the axis against itself avoids the temporary that
     # squaring the whole array would allocate.
     values = np.moveaxis(arg._values, k1, -1)
-    new_values = np.sqrt(np.einsum('...i,...i->...', values, values))
+    new_values = np.sqrt(np.einsum('...i,...i->...', values, values, out=buffer),
+                         out=buffer)
 
     # Construct the object and cast
-    obj = Qube._new_from_parts(new_values, arg._mask, nrank=arg._nrank-1,
-                               drank=arg._drank, unit=arg._unit, example=arg)
-    obj = obj.cast(classes)
+    if out is None:
+        obj = Qube._new_from_parts(new_values, arg._mask, nrank=arg._nrank-1,
+                                   drank=arg._drank, unit=arg._unit, example=arg)
+        obj = obj.cast(classes)
+    else:
+        obj = Qube._fill_out(out, (arg._mask,), arg._unit)
+        classes = type(out)
 
     # Insert derivatives if necessary
     if recursive and arg._derivs:
@@ -451,7 +487,7 @@ def norm_sq(arg, axis=-1, *, classes=(), recursive=True):
 
 
 @staticmethod
-def cross(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
+def cross(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True, out=None):
     """Calculate the cross product of two objects.
 
     Axis lengths must be either two or three, and must be equal. At least one of the
@@ -469,6 +505,9 @@ def cross(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
             list is provided, the object will be an instance of the first suitable class
             in the list. Otherwise, a generic Qube object will be returned.
         recursive (bool, optional): True to include derivatives in the returned object.
+        out (Qube, optional): A writable object of the same shape and item as the result,
+            into which the result is written in place of a new object. Its class takes
+            the place of `classes`.
 
     Returns:
         Qube: The cross product of the two objects.
@@ -522,26 +561,51 @@ def cross(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
     array2 = np.moveaxis(array2, k2, -1)
 
     new_drank = arg1._drank + arg2._drank
+    if arg1._numer[a1] == 3:
+        new_nrank = arg1._nrank + arg2._nrank - 1
+    else:
+        new_nrank = arg1._nrank + arg2._nrank - 2
+
+    # Locate the values of the output object if any. The values are written directly
+    # only if the new axis is already where it belongs.
+    buffer = None
+    if out is not None:
+        shape = Qube.broadcasted_shape(arg1, arg2)
+        if arg1._numer[a1] == 3 and a1 != new_nrank + new_drank - 1:
+            values = None
+        else:
+            item = np.broadcast_shapes(array1.shape, array2.shape)[len(shape):]
+            if arg1._numer[a1] == 2:
+                item = item[:-1]
+            values = Qube._prep_out(out, Qube, shape, item, 'cross()', arg1, arg2)
+
+        if values is None:
+            return Qube._copy_out(Qube.cross(arg1, arg2, a1, a2, recursive=recursive),
+                                  out)
+
+        buffer = values
 
     # Construct the cross product values
     if arg1._numer[a1] == 3:
-        new_values = _cross_3x3(array1, array2)
+        new_values = _cross_3x3(array1, array2, out=buffer)
 
         # Roll the new axis back to its position in arg1
-        new_nrank = arg1._nrank + arg2._nrank - 1
         new_k1 = new_values.ndim - new_drank - new_nrank + a1
         new_values = np.moveaxis(new_values, -1, new_k1)
 
     else:
-        new_values = _cross_2x2(array1, array2)
-        new_nrank = arg1._nrank + arg2._nrank - 2
+        new_values = _cross_2x2(array1, array2, out=buffer)
 
     # Construct the object and cast
-    obj = Qube._new_from_parts(new_values, Qube.or_(arg1._mask, arg2._mask),
-                               nrank=new_nrank, drank=new_drank,
-                               unit=Unit.mul_units(arg1._unit, arg2._unit),
-                               example=arg1)
-    obj = obj.cast(classes)
+    new_unit = Unit.mul_units(arg1._unit, arg2._unit)
+    if out is None:
+        obj = Qube._new_from_parts(new_values, Qube.or_(arg1._mask, arg2._mask),
+                                   nrank=new_nrank, drank=new_drank, unit=new_unit,
+                                   example=arg1)
+        obj = obj.cast(classes)
+    else:
+        obj = Qube._fill_out(out, (arg1._mask, arg2._mask), new_unit)
+        classes = type(out)
 
     # Insert derivatives if necessary
     if recursive and (arg1._derivs or arg2._derivs):
@@ -570,7 +634,7 @@ def cross(arg1, arg2, axis1=-1, axis2=0, *, classes=(), recursive=True):
     return obj
 
 
-def _cross_3x3(a, b):
+def _cross_3x3(a, b, out=None):
     """Calculate the cross product of two 3-vectors.
 
     Internal helper function for computing cross products. The inputs are NumPy arrays
@@ -579,6 +643,7 @@ def _cross_3x3(a, b):
     Parameters:
         a (numpy.ndarray): First 3-vector array.
         b (numpy.ndarray): Second 3-vector array.
+        out (numpy.ndarray, optional): Array into which to write the result.
 
     Returns:
         numpy.ndarray: The cross product of the two 3-vectors.
@@ -591,7 +656,11 @@ def _cross_3x3(a, b):
     if not (a.shape[-1] == b.shape[-1] == 3):
         raise ValueError('_cross_3x3 requires 3-vectors')
 
-    new_values = np.empty(a.shape, dtype=np.result_type(a, b))
+    if out is None:
+        new_values = np.empty(a.shape, dtype=np.result_type(a, b))
+    else:
+        new_values = out
+
     new_values[..., 0] = a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1]
     new_values[..., 1] = a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2]
     new_values[..., 2] = a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
@@ -599,7 +668,7 @@ def _cross_3x3(a, b):
     return new_values
 
 
-def _cross_2x2(a, b):
+def _cross_2x2(a, b, out=None):
     """Calculate the cross product of two 2-vectors.
 
     Internal helper function for computing cross products. The inputs are NumPy arrays
@@ -608,6 +677,7 @@ def _cross_2x2(a, b):
     Parameters:
         a (numpy.ndarray): First 2-vector array.
         b (numpy.ndarray): Second 2-vector array.
+        out (numpy.ndarray, optional): Array into which to write the result.
 
     Returns:
         numpy.ndarray: The cross product of the two 2-vectors.
@@ -620,7 +690,7 @@ def _cross_2x2(a, b):
     if not (a.shape[-1] == b.shape[-1] == 2):
         raise ValueError('_cross_2x2 requires 2-vectors')
 
-    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+    return np.subtract(a[..., 0] * b[..., 1], a[..., 1] * b[..., 0], out=out)
 
 
 @staticmethod
@@ -23,6 +23,106 @@ _QUATERNION_PICKLE_CUTOFF = 30
 # of rotations.
 _UNITARY_PICKLE_TOLERANCE = 1.e-13
 
+# For each branch of the conversion to a quaternion, the rows of the table built by
+# _encode_quaternions() that supply the four encoded components. Branches 0-2 are those
+# where the diagonal element Qxx, Qyy or Qzz is the largest and branch 3 is that where
+# the trace is. Row 0 is zero, so that the dropped component is always zero.
+_QUATERNION_ROWS = np.array([[0, 1, 4, 5],
+                             [0, 4, 2, 6],
+                             [0, 5, 6, 3],
+                             [0, 1, 2, 3]])
+
+
+def _encode_quaternions(values, antimask=None, check=True):
+    """The unit quaternions of an array of rotation matrices, encoded for pickling.
+
+    The test of each matrix and its conversion to a quaternion share a single pass over
+    the nine matrix elements, each held as a contiguous array. The conversion follows
+    Quaternion.from_matrix3(), whose branch always makes the largest component of the
+    quaternion positive; that component is swapped into index zero and dropped, as
+    described in Matrix3.__getstate__().
+
+    Parameters:
+        values (np.ndarray): The matrices, with shape (..., 3, 3).
+        antimask (np.ndarray, optional): True where a matrix is unmasked; None if every
+            matrix is unmasked.
+        check (bool, optional): True to require that every unmasked matrix be orthogonal
+            to within _UNITARY_PICKLE_TOLERANCE with a positive determinant.
+
+    Returns:
+        tuple or None: (qvals, index), where qvals is an array of shape (..., 4) holding
+        the encoded quaternions and index is an integer array holding the slot from which
+        each dropped component came; None if the check fails.
+    """
+
+    shape = values.shape[:-2]
+    (a0, a1, a2, a3, a4, a5, a6, a7, a8) = np.ascontiguousarray(values.reshape(-1, 9).T)
+
+    if check:
+        # The rows must be orthonormal, with a positive triple product
+        error = np.abs(a0*a0 + a1*a1 + a2*a2 - 1.)
+        np.maximum(error, np.abs(a3*a3 + a4*a4 + a5*a5 - 1.), out=error)
+        np.maximum(error, np.abs(a6*a6 + a7*a7 + a8*a8 - 1.), out=error)
+        np.maximum(error, np.abs(a0*a3 + a1*a4 + a2*a5), out=error)
+        np.maximum(error, np.abs(a0*a6 + a1*a7 + a2*a8), out=error)
+        np.maximum(error, np.abs(a3*a6 + a4*a7 + a5*a8), out=error)
+        det = a0*(a4*a8 - a5*a7) + a1*(a5*a6 - a3*a8) + a2*(a3*a7 - a4*a6)
+
+        invalid = (error > _UNITARY_PICKLE_TOLERANCE) | ~(det > 0.)
+        if antimask is not None:
+            invalid &= antimask.ravel()
+        if invalid.any():
+            return None
+
+    # Select the branch as in Quaternion.from_matrix3()
+    candidates = np.empty((4, a0.size))
+    candidates[0] = a0
+    candidates[1] = a4
+    candidates[2] = a8
+    np.add(a0, a4, out=candidates[3])
+    candidates[3] += a8
+    branch = np.argmax(candidates, axis=0)
+    s = 0.5 / np.sqrt(1. + 2. * candidates.max(axis=0) - candidates[3])
+
+    # The differences and sums of off-diagonal elements that make up the components
+    table = np.empty((7, a0.size))
+    table[0] = 0.
+    np.subtract(a7, a5, out=table[1])
+    np.subtract(a2, a6, out=table[2])
+    np.subtract(a3, a1, out=table[3])
+    np.add(a1, a3, out=table[4])
+    np.add(a2, a6, out=table[5])
+    np.add(a5, a7, out=table[6])
+
+    qvals = table[_QUATERNION_ROWS[branch].T, np.arange(a0.size)].T
+    qvals *= s[:, np.newaxis]
+
+    # The largest component is that of the branch, which the trace puts at index zero
+    index = (branch + 1) % 4
+    return (qvals.reshape(shape + (4,)), index.reshape(shape))
+
+
+def _pack_index(index):
+    """An array of slot indices 0-3 packed four to a byte.
+
+    Random indices do not compress, and the fixed cost of a compression codec would
+    dominate the time to pickle a modest array, so the packed bytes are saved as they are.
+    """
+
+    padded = np.zeros(-(-index.size // 4) * 4, dtype='uint8')
+    padded[:index.size] = index.ravel()
+    packed = (padded[0::4] | (padded[1::4] << 2)
+              | (padded[2::4] << 4) | (padded[3::4] << 6))
+    return packed.tobytes()
+
+
+def _unpack_index(packed, shape):
+    """The array of slot indices from bytes returned by _pack_index()."""
+
+    packed = np.frombuffer(packed, dtype='uint8')
+    index = (packed[:, np.newaxis] >> np.array([0, 2, 4, 6], dtype='uint8')) & 3
+    return index.ravel()[:int(np.prod(shape))].reshape(shape)
+
 
 class Matrix3(Matrix):
     """Represent 3x3 rotation matrices in the PolyMath framework.
@@ -439,10 +539,12 @@ class Matrix3(Matrix):
 
         Qube._raise_unsupported_op('-', self)
 
-    def __add__(self, /, arg):
+    def __add__(self, /, arg, *, recursive=True, out=None):
         """Raise a TypeError; "self + arg" is not permitted for Matrix3 objects.
 
-        This is an override of :meth:`Qube.__add__`.
+        This is an override of :meth:`Qube.__add__`. The `recursive` and `out` keywords
+        are accepted for compatibility with that method but, like the operation itself,
+        are not supported.
         """
 
         Qube._raise_unsupported_op('+', self, arg)
@@ -463,10 +565,12 @@ class Matrix3(Matrix):
 
         Qube._raise_unsupported_op('+=', self, arg)
 
-    def __sub__(self, /, arg):
+    def __sub__(self, /, arg, *, recursive=True, out=None):
         """Raise a TypeError; "self - arg" is not permitted for Matrix3 objects.
 
-        This is an override of :meth:`Qube.__sub__`.
+        This is an override of :meth:`Qube.__sub__`. The `recursive` and `out` keywords
+        are accepted for compatibility with that method but, like the operation itself,
+        are not supported.
         """
 
         Qube._raise_unsupported_op('-', self, arg)
@@ -487,7 +591,7 @@ class Matrix3(Matrix):
 
         Qube._raise_unsupported_op('-=', self, arg)
 
-    def __mul__(self, /, arg, *, recursive=True):
+    def __mul__(self, /, arg, *, recursive=True, out=None):
         """self * arg, matrix multiplication.
 
         Matrix3 times Scalar returns the same type of Scalar. This overrides
@@ -496,6 +600,8 @@ class Matrix3(Matrix):
         Parameters:
             arg: The object to multiply with this Matrix3.
             recursive (bool, optional): True to include derivatives in the result.
+            out (Qube, optional): A writable object of the same class, shape and item as
+                the result, into which the result is written in place of a new object.
 
         Returns:
             Qube: The result of the multiplication.
@@ -514,10 +620,11 @@ class Matrix3(Matrix):
 
         # Rotate a scalar, returning the scalar unchanged except for new derivs
         if arg._nrank == 0:
-            return arg.wod if not recursive else arg
+            result = arg.wod if not recursive else arg
+            return result if out is None else Qube._copy_out(result, out, '*')
 
         # For every other purpose, use the default multiply
-        return Qube.__mul__(self, original_arg)
+        return Qube.__mul__(self, original_arg, recursive=recursive, out=out)
 
     def __rmul__(self, /, arg, *, recursive=True):
         """arg * self, matrix multiplication.
@@ -850,8 +957,8 @@ class Matrix3(Matrix):
 
         raise TypeError('Matrix3.mean() is not supported')
 
-    def _convertible_to_quaternion(self):
-        """True if this object and its derivatives are fully described by a Quaternion.
+    def _quaternion_encoding(self):
+        """The encoded unit Quaternion of this object, or None if it cannot be encoded.
 
         Every unmasked matrix must be orthogonal to within a tolerance of 1.e-13, with a
         positive determinant. In addition, every derivative must be tangent to the space
@@ -861,26 +968,35 @@ class Matrix3(Matrix):
         the space of rotations and cannot be recovered from the derivative of the
         equivalent quaternion.
 
+        The test of the matrices is cached for a read-only object, whose values cannot
+        change; derivatives, which can be added later, are tested on every call.
+
         Returns:
-            bool: True if the conversion to a Quaternion preserves this object and all
-            of its derivatives; False otherwise.
+            tuple or None: The tuple (qvals, index) returned by _encode_quaternions() if
+            the conversion to a Quaternion preserves this object and all of its
+            derivatives; None otherwise.
         """
 
-        values = self._values
-        if np.shape(self._mask):
-            values = values[self.antimask]
+        use_cache = self._readonly and not Qube._DISABLE_CACHE
+        known = self._cache.get('quaternion_convertible') if use_cache else None
+        if known is False:
+            return None
 
-        products = np.matmul(values, np.swapaxes(values, -1, -2))
-        if np.abs(products - np.identity(3)).max() > _UNITARY_PICKLE_TOLERANCE:
-            return False
+        antimask = self.antimask if np.shape(self._mask) else None
+        encoding = _encode_quaternions(self._values, antimask, check=(known is None))
+        if use_cache:
+            self._cache['quaternion_convertible'] = encoding is not None
+        if encoding is None:
+            return None
 
-        if not np.all(np.linalg.det(values) > 0.):
-            return False
+        values = self._values
+        if antimask is not None:
+            values = values[antimask]
 
         for deriv in self._derivs.values():
             dvals = deriv._values
-            if np.shape(self._mask):
-                dvals = dvals[self.antimask]
+            if antimask is not None:
+                dvals = dvals[antimask]
 
             mvals = values
             if deriv._drank:
@@ -892,9 +1008,9 @@ class Matrix3(Matrix):
             products = np.matmul(dvals, np.swapaxes(mvals, -1, -2))
             residual = np.abs(products + np.swapaxes(products, -1, -2)).max()
             if residual > _UNITARY_PICKLE_TOLERANCE * np.abs(products).max():
-                return False
+                return None
 
-        return True
+        return encoding
 
     def __getstate__(self):
         """The state of this object, encoded as a unit Quaternion where possible.
@@ -909,8 +1025,8 @@ class Matrix3(Matrix):
         is first made positive; because it is the largest, it is at least 0.5, so
         recovering it involves no loss of precision. It is swapped into index zero before
         it is dropped, so that the dropped component always occupies the same slot and
-        the remaining values compress well. A separate array of indices records the slot
-        each one came from.
+        the remaining values compress well. A separate array of indices, packed four to a
+        byte, records the slot each one came from.
 
         These objects fall back on the default encoding of Qube.__getstate__(), because
         the quaternion encoding cannot represent them:
@@ -919,6 +1035,8 @@ class Matrix3(Matrix):
         * objects smaller than 30 elements, for which the conversion does not pay for
           itself;
         * fully masked objects, which have no values to save;
+        * objects whose pickle digits are "raw", which must be saved exactly;
+        * objects pickled as differences from a reference object;
         * matrices that are not proper rotations;
         * objects with a derivative that is not tangent to the space of rotations.
 
@@ -935,32 +1053,30 @@ class Matrix3(Matrix):
         if (self._drank
                 or self._size < _QUATERNION_PICKLE_CUTOFF
                 or np.all(self._mask)
-                or not self._convertible_to_quaternion()):
+                or self.pickle_digits()[0] == 'raw'
+                or hasattr(self, '_pickle_delta')):
             return Qube.__getstate__(self)
 
-        quaternion = self.to_quaternion(recursive=True)
+        encoding = self._quaternion_encoding()
+        if encoding is None:
+            return Qube.__getstate__(self)
 
-        # Identify the largest component and make it positive. For a unit quaternion it
-        # is at least 0.5, so its sign is never zero.
-        index = np.argmax(np.abs(quaternion._values), axis=-1)
-        largest = np.take_along_axis(quaternion._values, index[..., np.newaxis],
-                                     axis=-1)
-        quaternion = quaternion * Scalar(np.where(largest[..., 0] < 0., -1., 1.))
+        (qvals, index) = encoding
 
-        # Swap the largest component into index zero, then drop it
-        qvals = quaternion._values.copy()
-        np.put_along_axis(qvals, index[..., np.newaxis], qvals[..., :1], axis=-1)
-        qvals[..., 0] = 0.
+        # The derivatives are those of the quaternion, in their original order. Its
+        # largest component is already positive, so they need no change of sign.
+        derivs = {}
+        if self._derivs:
+            derivs = self.to_quaternion(recursive=True)._derivs
 
-        # The derivatives are those of the quaternion, in their original order
-        carrier = Qube._QUATERNION_CLASS(qvals, self._mask,
-                                         derivs=quaternion._derivs)
+        carrier = Qube._QUATERNION_CLASS(qvals, self._mask, derivs=derivs)
         carrier._pickle_digits = self.pickle_digits()
         carrier._pickle_reference = self.pickle_reference()
+        carrier._pickle_codec = self.pickle_codec()
 
         return {'QUATERNION_ENCODING': True,
                 'QUATERNION': carrier.__getstate__(),
-                'INDEX': Scalar(index).__getstate__(),
+                'PACKED_INDEX': _pack_index(index),
                 'READONLY': self._readonly,
                 'PICKLE_DIGITS': self.pickle_digits(),
                 'PICKLE_REFERENCE': self.pickle_reference()}
@@ -982,9 +1098,14 @@ class Matrix3(Matrix):
         carrier = Qube.__new__(Qube._QUATERNION_CLASS)
         carrier.__setstate__(state['QUATERNION'])
 
-        index = Qube.__new__(Scalar)
-        index.__setstate__(state['INDEX'])
-        indices = index._values[..., np.newaxis]
+        # Pickles written before the indices were packed hold them as a Scalar
+        if 'PACKED_INDEX' in state:
+            indices = _unpack_index(state['PACKED_INDEX'], carrier._shape)
+        else:
+            index = Qube.__new__(Scalar)
+            index.__setstate__(state['INDEX'])
+            indices = index._values
+        indices = indices[..., np.newaxis]
 
         # Recover the dropped component from the unit length of the quaternion, then
         # swap it back into the slot it came from. The value at index zero must be read
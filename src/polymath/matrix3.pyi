@@ -21,18 +21,21 @@ __all__ = ['Matrix3']
 class Matrix3(Matrix):
     IDENTITY: Matrix3
     MASKED: Matrix3
-    def __add__(self, arg: Any) -> Any: ...  # type: ignore[override]
+    def __add__(self, arg: Any, *, recursive: bool = ...,  # type: ignore[override]
+        out: Qube | None = ...) -> Any: ...
     def __getstate__(self) -> dict[str, Any]: ...
-    def __iadd__(self, arg: Any) -> Any: ...  # type: ignore[override]
+    def __iadd__(self, arg: Any) -> Any: ...  # type: ignore[misc, override]
     def __imul__(self, arg: Any) -> _Arraylike: ...  # type: ignore[misc, override]
-    def __isub__(self, arg: Any) -> Any: ...  # type: ignore[override]
-    def __mul__(self, arg: Any, *, recursive: bool = ...) -> Qube: ...  # type: ignore[override]
+    def __isub__(self, arg: Any) -> Any: ...  # type: ignore[misc, override]
+    def __mul__(self, arg: Any, *, recursive: bool = ...,  # type: ignore[override]
+        out: Qube | None = ...) -> Qube: ...
     def __neg__(self) -> Any: ...  # type: ignore[override]
     def __radd__(self, arg: Any) -> Any: ...  # type: ignore[override]
     def __rmul__(self, arg: Any, *, recursive: bool = ...) -> Qube: ...  # type: ignore[override]
     def __rsub__(self, arg: Any) -> Any: ...  # type: ignore[override]
     def __setstate__(self, state: dict[str, Any]) -> None: ...
-    def __sub__(self, arg: Any) -> Any: ...  # type: ignore[override]
+    def __sub__(self, arg: Any, *, recursive: bool = ...,  # type: ignore[override]
+        out: Qube | None = ...) -> Any: ...
     @staticmethod
     def as_matrix3(arg: Any, *, recursive: bool = ...) -> _Arraylike: ...
     @staticmethod
@@ -239,11 +239,14 @@ class Polynomial(Vector):
 
         return Polynomial(-self.as_vector())
 
-    def __add__(self, arg):
+    def __add__(self, arg, *, out=None):
         """Add this polynomial to another polynomial or scalar.
 
         Parameters:
             arg: The polynomial or scalar to add to this polynomial.
+            out (Polynomial, optional): A writable Polynomial of the same shape and order
+                as the result, into which the result is written in place of a new object.
+                The result is computed first and then copied into it.
 
         Returns:
             Polynomial: The sum of the polynomials.
@@ -251,7 +254,8 @@ class Polynomial(Vector):
 
         arg = Polynomial.as_polynomial(arg).at_least_order(self.order)
         self = self.at_least_order(arg.order)
-        return Polynomial(self.as_vector() + arg.as_vector())
+        result = Polynomial(self.as_vector() + arg.as_vector())
+        return result if out is None else Qube._copy_out(result, out, '+')
 
     def __radd__(self, arg):
         """Add this polynomial to another polynomial or scalar (right addition).
@@ -311,11 +315,14 @@ class Polynomial(Vector):
         self._cache.clear()
         return self
 
-    def __sub__(self, arg):
+    def __sub__(self, arg, *, out=None):
         """Subtract another polynomial or scalar from this polynomial.
 
         Parameters:
             arg: The polynomial or scalar to subtract from this polynomial.
+            out (Polynomial, optional): A writable Polynomial of the same shape and order
+                as the result, into which the result is written in place of a new object.
+                The result is computed first and then copied into it.
 
         Returns:
             Polynomial: The difference of the polynomials.
@@ -323,7 +330,8 @@ class Polynomial(Vector):
 
         arg = Polynomial.as_polynomial(arg).at_least_order(self.order)
         self = self.at_least_order(arg.order)
-        return Polynomial(self.as_vector() - arg.as_vector())
+        result = Polynomial(self.as_vector() - arg.as_vector())
+        return result if out is None else Qube._copy_out(result, out, '-')
 
     def __rsub__(self, arg):
         """Subtract this polynomial from another polynomial or scalar.
@@ -385,11 +393,14 @@ class Polynomial(Vector):
         self._cache.clear()
         return self
 
-    def __mul__(self, arg):
+    def __mul__(self, arg, *, out=None):
         """Multiply this polynomial by another polynomial or scalar.
 
         Parameters:
             arg: The polynomial or scalar to multiply with this polynomial.
+            out (Polynomial, optional): A writable Polynomial of the same shape and order
+                as the result, into which the result is written in place of a new object.
+                The result is computed first and then copied into it.
 
         Returns:
             Polynomial: The product of the polynomials.
@@ -464,9 +475,10 @@ class Polynomial(Vector):
 
             result.insert_derivs(derivs)
 
-            return result
+        else:
+            result = Polynomial(self.as_vector() * arg)
 
-        return Polynomial(self.as_vector() * arg)
+        return result if out is None else Qube._copy_out(result, out, '*')
 
     def __rmul__(self, arg):
         """Multiply another polynomial or scalar by this polynomial.
@@ -496,11 +508,14 @@ class Polynomial(Vector):
         super().__imul__(arg)
         return Polynomial(self)
 
-    def __truediv__(self, arg):
+    def __truediv__(self, arg, *, out=None):
         """Divide this polynomial by another polynomial or scalar.
 
         Parameters:
             arg: The polynomial or scalar by which to divide this polynomial.
+            out (Polynomial, optional): A writable Polynomial of the same shape and order
+                as the result, into which the result is written in place of a new object.
+                The result is computed first and then copied into it.
 
         Returns:
             Polynomial: The quotient of the polynomials.
@@ -510,7 +525,8 @@ class Polynomial(Vector):
         if isinstance(arg, Vector) and arg.item == (1,):
             arg = arg.to_scalar(0)
 
-        return Polynomial(self.as_vector() / arg)
+        result = Polynomial(self.as_vector() / arg)
+        return result if out is None else Qube._copy_out(result, out, '/')
 
     def __itruediv__(self, arg):
         """Divide this polynomial by another polynomial or scalar in-place.
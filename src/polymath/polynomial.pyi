@@ -19,22 +19,26 @@ from polymath.vector import Vector
 __all__ = ['Polynomial']
 
 class Polynomial(Vector):
-    def __add__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
+    def __add__(self, arg: Any, *,  # type: ignore[override]
+        out: Polynomial | None = ...) -> _Arraylike: ...
     def __eq__(self, arg: object) -> Any: ...
-    def __iadd__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
-    def __imul__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
+    def __iadd__(self, arg: Any) -> _Arraylike: ...  # type: ignore[misc, override]
+    def __imul__(self, arg: Any) -> _Arraylike: ...  # type: ignore[misc, override]
     def __init__(self, *args: Any, **kwargs: Any) -> None: ...
-    def __isub__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
-    def __itruediv__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
-    def __mul__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
+    def __isub__(self, arg: Any) -> _Arraylike: ...  # type: ignore[misc, override]
+    def __itruediv__(self, arg: Any) -> _Arraylike: ...  # type: ignore[misc, override]
+    def __mul__(self, arg: Any, *,  # type: ignore[override]
+        out: Polynomial | None = ...) -> _Arraylike: ...
     def __ne__(self, arg: object) -> Any: ...
     def __neg__(self) -> _Arraylike: ...  # type: ignore[override]
     def __pow__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
     def __radd__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
     def __rmul__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
     def __rsub__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
-    def __sub__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
-    def __truediv__(self, arg: Any) -> _Arraylike: ...  # type: ignore[override]
+    def __sub__(self, arg: Any, *,  # type: ignore[override]
+        out: Polynomial | None = ...) -> _Arraylike: ...
+    def __truediv__(self, arg: Any, *,  # type: ignore[override]
+        out: Polynomial | None = ...) -> _Arraylike: ...
     @staticmethod
     def as_polynomial(arg: Any, *, recursive: bool = ...) -> _Arraylike: ...
     def as_vector(self, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
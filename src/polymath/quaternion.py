@@ -548,7 +548,7 @@ class Quaternion(Vector):
     # Overrides of arithmetic operators
     ######################################################################################
 
-    def __mul__(self, /, arg, *, recursive=True):
+    def __mul__(self, /, arg, *, recursive=True, out=None):
         """The product of this quaternion and another object.
 
         Parameters:
@@ -558,6 +558,9 @@ class Quaternion(Vector):
                 operator is used.
             recursive (bool, optional): If True, the returned object will include
                 derivatives.
+            out (Qube, optional): A writable object of the same class, shape and item as
+                the result, into which the result is written in place of a new object. The
+                product of two quaternions is computed first and then copied into it.
 
         Returns:
             Quaternion: The product of this quaternion and the argument.
@@ -568,7 +571,7 @@ class Quaternion(Vector):
 
         # Use default operator for anything but a Qube subclass
         if not isinstance(arg, Qube):
-            return Qube.__mul__(self, arg, recursive=recursive)
+            return Qube.__mul__(self, arg, recursive=recursive, out=out)
 
         # Convert any 3-vector to a Quaternion
         if arg._numer == (3,):
@@ -576,7 +579,7 @@ class Quaternion(Vector):
 
         # Send any other object to the default operator
         if type(arg) is not Quaternion:
-            return Qube.__mul__(self, arg, recursive=recursive)
+            return Qube.__mul__(self, arg, recursive=recursive, out=out)
 
         # Check denominators
         if self._drank and arg._drank:
@@ -623,7 +626,7 @@ class Quaternion(Vector):
 
             obj.insert_derivs(new_derivs)
 
-        return obj
+        return obj if out is None else Qube._copy_out(obj, out, '*')
 
     @staticmethod
     def mul_values(a, b):
@@ -683,13 +686,15 @@ class Quaternion(Vector):
         # Send any other object to the default operator
         return Qube.__mul__(self, arg, recursive=recursive)
 
-    def __truediv__(self, /, arg, *, recursive=True):
+    def __truediv__(self, /, arg, *, recursive=True, out=None):
         """The result of dividing this quaternion by another object.
 
         Parameters:
             arg: The object to divide this quaternion by.
             recursive (bool, optional): If True, the returned object will include
                 derivatives.
+            out (Qube, optional): A writable object of the same class, shape and item as
+                the result, into which the result is written in place of a new object.
 
         Returns:
             Quaternion: The result of dividing this quaternion by the argument.
@@ -697,7 +702,7 @@ class Quaternion(Vector):
 
         # Use default operator for anything but a Qube subclass
         if not isinstance(arg, Qube):
-            return Qube.__truediv__(self, arg, recursive=recursive)
+            return Qube.__truediv__(self, arg, recursive=recursive, out=out)
 
         # Convert any 3-vector to a Quaternion
         if arg._numer == (3,):
@@ -705,10 +710,11 @@ class Quaternion(Vector):
 
         # Send any other subclass to the default operator
         if type(arg) is not Quaternion:
-            return Qube.__truediv__(self, arg, recursive=recursive)
+            return Qube.__truediv__(self, arg, recursive=recursive, out=out)
 
         # Multiply by the reciprocal
-        return self.__mul__(arg.reciprocal(recursive=recursive), recursive=recursive)
+        return self.__mul__(arg.reciprocal(recursive=recursive), recursive=recursive,
+                            out=out)
 
     def reciprocal(self, *, recursive=True):
         """The reciprocal of this quaternion.
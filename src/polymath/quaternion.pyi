@@ -14,7 +14,7 @@ from typing import Any
 
 from numpy.typing import NDArray
 
-from polymath.qube import _Arraylike, _ShapeOrTuple
+from polymath.qube import Qube, _Arraylike, _ShapeOrTuple
 from polymath.vector import Vector
 
 __all__ = ['Quaternion']
@@ -26,9 +26,11 @@ class Quaternion(Vector):
     YAXIS: Quaternion
     ZAXIS: Quaternion
     ZERO: Quaternion
-    def __mul__(self, arg: Any, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
+    def __mul__(self, arg: Any, *, recursive: bool = ...,  # type: ignore[override]
+        out: Qube | None = ...) -> _Arraylike: ...
     def __rmul__(self, arg: Any, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
-    def __truediv__(self, arg: Any, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
+    def __truediv__(self, arg: Any, *, recursive: bool = ...,  # type: ignore[override]
+        out: Qube | None = ...) -> _Arraylike: ...
     @staticmethod
     def as_quaternion(arg: Any, *, recursive: bool = ...) -> _Arraylike: ...
     def conj(self, *, recursive: bool = ...) -> _Arraylike: ...
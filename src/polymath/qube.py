@@ -426,7 +426,8 @@ class Qube:
                            '_readonly', '_truth_if_any', '_truth_if_all', '_default')
 
     # Attributes that an object carries only once something has set them
-    _OPTIONAL_ATTRS = ('_pickle_digits', '_pickle_reference')
+    _OPTIONAL_ATTRS = ('_pickle_digits', '_pickle_reference', '_pickle_codec',
+                       '_pickle_delta')
 
     # The names of the attributes added by add_attr(). This class-level value is shared by
     # every object that has not added one, so it is never modified in place; add_attr()
@@ -11,8 +11,10 @@ where they do not, rather than guessed at.
 """
 
 import builtins
-from collections.abc import Iterator
-from typing import Any, ClassVar, Self, TypeAlias
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor
+from typing import Any, ClassVar, Self, SupportsIndex, TypeAlias
 
 import numpy as np
 from numpy.typing import NDArray
@@ -36,8 +38,13 @@ class Qube:
     # Qube compares by value and is mutable, so it is not hashable
     __hash__: ClassVar[None]  # type: ignore[assignment]
     def __abs__(self, *, recursive: bool = ...) -> Qube: ...
-    def __add__(self, arg: _Arraylike, *, recursive: bool = ...) -> Qube: ...
+    def __add__(self, arg: _Arraylike, *, recursive: bool = ...,
+        out: Qube | None = ...) -> Qube: ...
     def __and__(self, arg: Any) -> Any: ...
+    def __array_function__(self, func: Any, types: Any, args: Any,
+        kwargs: Any) -> Any: ...
+    def __array_ufunc__(self, ufunc: Any, method: str, *inputs: Any,
+        **kwargs: Any) -> Any: ...
     def __bool__(self) -> bool: ...
     def __copy__(self) -> Self: ...
     def __eq__(self, arg: object) -> Any: ...
@@ -70,7 +77,8 @@ class Qube:
     def __lt__(self, arg: _Arraylike) -> _Arraylike: ...  # type: ignore[misc]
     def __matmul__(self, arg: Qube) -> Qube: ...
     def __mod__(self, arg: _Arraylike, *, recursive: bool = ...) -> Qube: ...
-    def __mul__(self, arg: _Arraylike, *, recursive: bool = ...) -> Qube: ...
+    def __mul__(self, arg: _Arraylike, *, recursive: bool = ...,
+        out: Qube | None = ...) -> Qube: ...
     def __ne__(self, arg: object) -> Any: ...
     def __neg__(self, *, recursive: bool = ...) -> Qube: ...
     @staticmethod
@@ -80,6 +88,7 @@ class Qube:
     def __pow__(self, arg: _Arraylike) -> Qube: ...
     def __radd__(self, arg: _Arraylike, *, recursive: bool = ...) -> Qube: ...
     def __rand__(self, arg: Any) -> Any: ...
+    def __reduce_ex__(self, protocol: SupportsIndex) -> str | tuple[Any, ...]: ...
     def __repr__(self) -> str: ...
     def __rfloordiv__(self, arg: _Arraylike) -> Qube: ...
     def __rmod__(self, arg: _Arraylike, *, recursive: bool = ...) -> Qube: ...
@@ -91,8 +100,10 @@ class Qube:
     def __setitem__(self, indx: Any, arg: _Arraylike) -> None: ...
     def __setstate__(self, state: dict[str, Qube]) -> None: ...
     def __str__(self) -> str: ...
-    def __sub__(self, arg: _Arraylike, *, recursive: bool = ...) -> Qube: ...
-    def __truediv__(self, arg: _Arraylike, *, recursive: bool = ...) -> Qube: ...
+    def __sub__(self, arg: _Arraylike, *, recursive: bool = ...,
+        out: Qube | None = ...) -> Qube: ...
+    def __truediv__(self, arg: _Arraylike, *, recursive: bool = ...,
+        out: Qube | None = ...) -> Qube: ...
     def __xor__(self, arg: Any) -> Any: ...
     def abs(self) -> Any: ...
     def add_attr(self, name: str, value: Any = ...) -> Qube: ...
@@ -129,7 +140,9 @@ class Qube:
     @staticmethod
     def as_one_bool(value: Any) -> Any: ...
     def as_one_masked(self, *, recursive: bool = ...) -> Qube: ...
+    def as_packed_mask(self, *, recursive: bool = ...) -> Qube: ...
     def as_readonly(self, *, recursive: bool = ...) -> Qube: ...
+    def as_sparse_mask(self, *, recursive: bool = ...) -> Qube: ...
     def as_size_zero(self, axis: builtins.int = ..., *, recursive: Any = ...) -> Qube: ...
     def as_this_type(self, arg: _Arraylike, *, recursive: bool = ..., coerce: bool = ...,
         op: str = ...) -> Qube: ...
@@ -158,7 +171,7 @@ class Qube:
     def cross(arg1: Qube, arg2: Qube, axis1: builtins.int = ...,
         axis2: builtins.int = ..., *,
         classes: type | tuple[type, ...] | list[type] = ...,
-        recursive: bool = ...) -> Qube: ...
+        recursive: bool = ..., out: Qube | None = ...) -> Qube: ...
     @property
     def default(self) -> Any: ...
     def delete_deriv(self, key: str, *, override: bool = ...) -> Any: ...
@@ -171,12 +184,25 @@ class Qube:
     @staticmethod
     def dot(arg1: Qube, arg2: Qube, axis1: builtins.int = ..., axis2: builtins.int = ...,
         *, classes: type | tuple[type, ...] | list[type] = ...,
-        recursive: bool = ...) -> Qube: ...
+        recursive: bool = ..., out: Qube | None = ...) -> Qube: ...
     @property
     def drank(self) -> builtins.int: ...
     @property
     def dsize(self) -> builtins.int: ...
     def dtype(self) -> Any: ...
+    async def dump_async(self, path: str | os.PathLike[str],
+                         protocol: builtins.int | None = ...,
+                         executor: Executor | None = ...) -> None: ...
+    @staticmethod
+    async def dump_batch_async(objects: Iterable[Qube],
+                               paths: Iterable[str | os.PathLike[str]],
+                               protocol: builtins.int | None = ...,
+                               executor: Executor | None = ...) -> None: ...
+    def dump_blocks(self, file: Any, rows: builtins.int | None = ...,
+                    protocol: builtins.int | None = ...) -> None: ...
+    @staticmethod
+    def dump_many(objects: Any, file: Any,
+                  protocol: builtins.int | None = ...) -> None: ...
     def expand_mask(self, *, recursive: bool = ...) -> Qube: ...
     def extract_denom(self, axis: builtins.int, index: builtins.int,
         classes: type | tuple[type, ...] | list[type] = ...) -> Qube: ...
@@ -195,6 +221,8 @@ class Qube:
     @classmethod
     def from_scalars(cls, *scalars: _Arraylike, recursive: bool = ...,
         readonly: bool = ..., classes: Any = ...) -> Qube: ...
+    @staticmethod
+    def from_shared(handle: Any) -> Qube: ...
     def identity(self) -> Any: ...
     def insert_deriv(self, key: str, deriv: Qube, *, override: bool = ...) -> Qube: ...
     def insert_derivs(self, derivs: dict[str, Qube], *, override: bool = ...) -> Qube: ...
@@ -221,9 +249,28 @@ class Qube:
     def isize(self) -> builtins.int: ...
     @property
     def item(self) -> _ShapeOrTuple: ...
+    @staticmethod
+    def iter_blocks(file: Any) -> Iterator[Qube]: ...
     def join_items(self, classes: type | tuple[type, ...] | list[type]) -> Qube: ...
+    def lazy(self) -> Any: ...
     def len(self) -> Any: ...
+    @staticmethod
+    def load(path: str | os.PathLike[str], mmap_mode: str | None = ...) -> Qube: ...
+    @staticmethod
+    async def load_async(path: str | os.PathLike[str],
+                         executor: Executor | None = ...) -> Any: ...
+    @staticmethod
+    async def load_batch_async(paths: Iterable[str | os.PathLike[str]],
+                               executor: Executor | None = ...) -> list[Any]: ...
+    @staticmethod
+    def load_blocks(file: Any) -> Qube: ...
+    @staticmethod
+    def load_many(file: Any) -> Any: ...
     def logical_not(self) -> Any: ...
+    @staticmethod
+    def map_tiles(func: Any, *args: Any,
+        tile_shape: builtins.int | tuple[builtins.int, ...] | None = ...,
+        workers: builtins.int | None = ...) -> Any: ...
     @property
     def mask(self) -> Any: ...
     def mask_where(self, mask: _Arraylike, replace: Any = ..., *, remask: bool = ...,
@@ -263,7 +310,7 @@ class Qube:
     @staticmethod
     def norm(arg: Qube, axis: builtins.int = ..., *,
         classes: type | tuple[type, ...] | list[type] = ...,
-        recursive: bool = ...) -> Qube: ...
+        recursive: bool = ..., out: Qube | None = ...) -> Qube: ...
     @staticmethod
     def norm_sq(arg: Any, axis: builtins.int = ..., *,
         classes: type | tuple[type, ...] | list[type] = ...,
@@ -284,6 +331,9 @@ class Qube:
     def outer(arg1: Qube, arg2: Qube,
         classes: type | tuple[type, ...] | list[type] = ...,
         recursive: bool = ...) -> Qube: ...
+    @staticmethod
+    def pack(objects: Iterable[Qube]) -> Any: ...
+    def pickle_codec(self) -> str: ...
     def pickle_digits(self) -> str | float | builtins.int: ...
     def pickle_reference(self) -> str | float | builtins.int: ...
     @staticmethod
@@ -293,6 +343,11 @@ class Qube:
     @property
     def readonly(self) -> bool: ...
     def reciprocal(self, *, recursive: Any = ..., nozeros: Any = ...) -> Any: ...
+    @staticmethod
+    def register_pickle_codec(name: str, compress: Callable[[Any], bytes],
+        decompress: Callable[[bytes], Any]) -> None: ...
+    @staticmethod
+    def register_pickle_delta(name: str, reference: Qube | None) -> None: ...
     def remask(self, mask: _Arraylike, *, recursive: bool = ...,
         check: bool = ...) -> Qube: ...
     def remask_or(self, mask: _Arraylike, *, recursive: bool = ...,
@@ -308,13 +363,28 @@ class Qube:
     def rms(self) -> _Arraylike: ...
     def roll_axis(self, axis: builtins.int, start: builtins.int = ..., *,
         recursive: bool = ..., rank: builtins.int | None = ...) -> Qube: ...
+    def save(self, path: str | os.PathLike[str]) -> None: ...
+    @staticmethod
+    def set_auto_shrink(threshold: float | None = ...) -> None: ...
+    @staticmethod
+    def set_default_pickle_codec(codec: str = ...) -> None: ...
     @staticmethod
     def set_default_pickle_digits(digits: Any = ..., reference: Any = ...) -> Any: ...
+    @staticmethod
+    def set_pickle_auto_budget(budget: float | None = ...) -> None: ...
+    def set_pickle_codec(self, codec: str | None = ...) -> None: ...
+    def set_pickle_delta(self, reference: Qube | str | None = ...) -> None: ...
     def set_pickle_digits(self, digits: Any = ..., reference: Any = ...) -> Any: ...
+    @staticmethod
+    def set_pickle_lazy(lazy: bool = ...) -> None: ...
+    @staticmethod
+    def set_pickle_workers(workers: builtins.int | None = ...) -> None: ...
     def set_unit(self, unit: Unit | None, *, override: bool = ...) -> Any: ...
     @property
     def shape(self) -> _ShapeOrTuple: ...
     def shrink(self, antimask: Any) -> Any: ...
+    @staticmethod
+    def shrunk(antimask: Any) -> Any: ...
     @property
     def size(self) -> builtins.int: ...
     def slice_numer(self, axis: builtins.int, index1: builtins.int, index2: builtins.int,
@@ -329,6 +399,7 @@ class Qube:
     def swap_axes(self, axis1: builtins.int, axis2: builtins.int, *,
         recursive: bool = ...) -> Qube: ...
     def swap_items(self, classes: type | tuple[type, ...] | list[type]) -> Qube: ...
+    def to_shared(self) -> Any: ...
     def transpose_denom(self, axis1: builtins.int = ...,
         axis2: builtins.int = ...) -> Qube: ...
     def transpose_numer(self, axis1: builtins.int = ..., axis2: builtins.int = ..., *,
@@ -358,6 +429,8 @@ class Qube:
     def unit_(self) -> Any: ...
     @property
     def units(self) -> Any: ...
+    @staticmethod
+    def unpack(packed: Any) -> list[Qube]: ...
     def unshrink(self, antimask: _Arraylike, shape: _ShapeOrTuple = ...) -> Qube: ...
     @property
     def vals(self) -> Any: ...
@@ -328,12 +328,45 @@ class Scalar(Qube):
 
         return obj
 
-    def sin(self, *, recursive=True):
+    def _unary_out(self, func, out, op, invalid=False, replace=None, unit=None):
+        """Write a function of the values of this Scalar into an existing Scalar.
+
+        Parameters:
+            func (numpy.ufunc): The function.
+            out (Scalar): The writable Scalar to receive the result.
+            op (str): Name of the operation, for an error message.
+            invalid (array-like or bool, optional): True where the function is undefined.
+                These locations are masked and the value of `func(replace)` is written
+                there instead.
+            replace (float, optional): The input value to use at invalid locations.
+            unit (Unit, optional): The unit of the result.
+
+        Returns:
+            (Scalar or None): `out`, updated but without derivatives; None if `out` shares
+            memory with this object.
+        """
+
+        values = Qube._prep_out(out, Scalar, self._shape, (), op, self)
+        if values is None:
+            return None
+
+        if not np.any(invalid):
+            func(self._values, out=values)
+            return Qube._fill_out(out, (self._mask,), unit)
+
+        func(self._values, out=values, where=np.logical_not(invalid))
+        values[invalid] = func(replace)
+        return Qube._fill_out(out, (self._mask, invalid), unit)
+
+    @Qube._auto_shrink
+    def sin(self, *, recursive=True, out=None):
         """The sine of each value.
 
         Parameters:
             recursive (bool, optional): True to include the derivatives of the sine inside
                 the returned object. Defaults to True.
+            out (Scalar, optional): A writable Scalar of the same shape, into which the
+                result is written in place of a new object.
 
         Returns:
             Scalar: The sine values.
@@ -347,8 +380,13 @@ class Scalar(Qube):
 
         self._require_angle('sin()')
 
-        obj = Scalar._new_from_parts(np.sin(self._values), self._mask, nrank=0,
-                                     example=self)
+        if out is None:
+            obj = Scalar._new_from_parts(np.sin(self._values), self._mask, nrank=0,
+                                         example=self)
+        else:
+            obj = self._unary_out(np.sin, out, 'sin()')
+            if obj is None:
+                return Qube._copy_out(self.sin(recursive=recursive), out)
 
         if recursive and self._derivs:
             factor = self.wod.cos()
@@ -357,12 +395,15 @@ class Scalar(Qube):
 
         return obj
 
-    def cos(self, *, recursive=True):
+    @Qube._auto_shrink
+    def cos(self, *, recursive=True, out=None):
         """The cosine of each value.
 
         Parameters:
             recursive (bool, optional): True to include the derivatives of the cosine
                 inside the returned object. Defaults to True.
+            out (Scalar, optional): A writable Scalar of the same shape, into which the
+                result is written in place of a new object.
 
         Returns:
             Scalar: The cosine values.
@@ -376,8 +417,13 @@ class Scalar(Qube):
 
         self._require_angle('cos()')
 
-        obj = Scalar._new_from_parts(np.cos(self._values), self._mask, nrank=0,
-                                     example=self)
+        if out is None:
+            obj = Scalar._new_from_parts(np.cos(self._values), self._mask, nrank=0,
+                                         example=self)
+        else:
+            obj = self._unary_out(np.cos, out, 'cos()')
+            if obj is None:
+                return Qube._copy_out(self.cos(recursive=recursive), out)
 
         if recursive and self._derivs:
             factor = -self.wod.sin()
@@ -386,6 +432,7 @@ class Scalar(Qube):
 
         return obj
 
+    @Qube._auto_shrink
     def tan(self, *, recursive=True):
         """The tangent of each value.
 
@@ -415,6 +462,7 @@ class Scalar(Qube):
 
         return obj
 
+    @Qube._auto_shrink
     def arcsin(self, *, recursive=True, check=True):
         """The arcsine of each value.
 
@@ -476,6 +524,7 @@ class Scalar(Qube):
 
         return obj
 
+    @Qube._auto_shrink
     def arccos(self, *, recursive=True, check=True):
         """The arccosine of each value.
 
@@ -537,6 +586,7 @@ class Scalar(Qube):
 
         return obj
 
+    @Qube._auto_shrink
     def arctan(self, *, recursive=True):
         """The arctangent of each value.
 
@@ -566,6 +616,7 @@ class Scalar(Qube):
 
         return obj
 
+    @Qube._auto_shrink
     def arctan2(self, arg, *, recursive=True):
         """The four-quadrant value of arctan2(y,x).
 
@@ -613,7 +664,8 @@ class Scalar(Qube):
 
         return obj
 
-    def sqrt(self, *, recursive=True, check=True):
+    @Qube._auto_shrink
+    def sqrt(self, *, recursive=True, check=True, out=None):
         """The square root, masking imaginary values.
 
         If this object is read-only, the returned object will also be read-only.
@@ -625,6 +677,8 @@ class Scalar(Qube):
                 before taking the square root. If False, a ValueError will be raised any
                 negative value encountered. Check=True is slightly faster if we already
                 know at the time of the call that all input values are valid.
+            out (Scalar, optional): A writable Scalar of the same shape, into which the
+                result is written in place of a new object.
 
         Returns:
             Scalar: The square root values.
@@ -637,31 +691,43 @@ class Scalar(Qube):
         if self._drank:
             raise ValueError('Scalar.sqrt() does not support denominators')
 
-        if check:
-            no_negs = self.mask_where_lt(0., replace=1.)
-            sqrt_vals = np.sqrt(no_negs._values)
+        if out is not None:
+            invalid = np.less(self._values, 0.)
+            if not check and np.any(invalid):
+                raise ValueError('Scalar.sqrt() of negative value')
+
+            obj = self._unary_out(np.sqrt, out, 'sqrt()', invalid, 1.,
+                                  Unit.sqrt_unit(self._unit))
+            if obj is None:
+                return Qube._copy_out(self.sqrt(recursive=recursive, check=check), out)
 
         else:
-            no_negs = self
-            with warnings.catch_warnings():
-                warnings.filterwarnings('error')
-                try:
-                    sqrt_vals = np.sqrt(no_negs._values)
-                except RuntimeWarning as err:
-                    raise ValueError('Scalar.sqrt() of negative value') from err
+            if check:
+                no_negs = self.mask_where_lt(0., replace=1.)
+                sqrt_vals = np.sqrt(no_negs._values)
 
-        obj = Scalar._new_from_parts(sqrt_vals, no_negs._mask, nrank=0,
-                                     unit=Unit.sqrt_unit(no_negs._unit),
-                                     example=no_negs)
+            else:
+                no_negs = self
+                with warnings.catch_warnings():
+                    warnings.filterwarnings('error')
+                    try:
+                        sqrt_vals = np.sqrt(no_negs._values)
+                    except RuntimeWarning as err:
+                        raise ValueError('Scalar.sqrt() of negative value') from err
+
+            obj = Scalar._new_from_parts(sqrt_vals, no_negs._mask, nrank=0,
+                                         unit=Unit.sqrt_unit(no_negs._unit),
+                                         example=no_negs)
 
-        if recursive and no_negs._derivs:
+        if recursive and self._derivs:
             factor = 0.5 / obj
             for key, deriv in self._derivs.items():
                 obj.insert_deriv(key, factor * deriv)
 
         return obj
 
-    def log(self, *, recursive=True, check=True):
+    @Qube._auto_shrink
+    def log(self, *, recursive=True, check=True, out=None):
         """The natural log, masking undefined values.
 
         If this object is read-only, the returned object will also be read-only.
@@ -673,6 +739,8 @@ class Scalar(Qube):
                 before taking the log. If False, a ValueError will be raised any value <=
                 0 is encountered. Check=True is slightly faster if we already know at the
                 time of the call that all input values are valid. Defaults to True.
+            out (Scalar, optional): A writable Scalar of the same shape, into which the
+                result is written in place of a new object.
 
         Returns:
             Scalar: The natural logarithm values.
@@ -685,28 +753,42 @@ class Scalar(Qube):
         if self._drank:
             raise ValueError('Scalar.log() does not support denominators')
 
-        if check:
-            no_negs = self.mask_where_le(0., replace=1.)
-            log_values = np.log(no_negs._values)
+        if out is not None:
+            invalid = np.less_equal(self._values, 0.)
+            if not check and np.any(invalid):
+                raise ValueError('Scalar.log() of non-positive value')
+
+            obj = self._unary_out(np.log, out, 'log()', invalid, 1.)
+            if obj is None:
+                return Qube._copy_out(self.log(recursive=recursive, check=check), out)
+
+            if recursive and self._derivs:
+                no_negs = self.mask_where(invalid, replace=1.)
+
         else:
-            no_negs = self
-            with warnings.catch_warnings():
-                warnings.filterwarnings('error')
-                try:
-                    log_values = np.log(no_negs._values)
-                except RuntimeWarning as err:
-                    raise ValueError('Scalar.log() of non-positive value') from err
+            if check:
+                no_negs = self.mask_where_le(0., replace=1.)
+                log_values = np.log(no_negs._values)
+            else:
+                no_negs = self
+                with warnings.catch_warnings():
+                    warnings.filterwarnings('error')
+                    try:
+                        log_values = np.log(no_negs._values)
+                    except RuntimeWarning as err:
+                        raise ValueError('Scalar.log() of non-positive value') from err
 
-        obj = Scalar._new_from_parts(log_values, no_negs._mask, nrank=0,
-                                     example=no_negs)
+            obj = Scalar._new_from_parts(log_values, no_negs._mask, nrank=0,
+                                         example=no_negs)
 
-        if recursive and no_negs._derivs:
+        if recursive and self._derivs:
             for key, deriv in self._derivs.items():
                 obj.insert_deriv(key, deriv / no_negs)
 
         return obj
 
-    def exp(self, *, recursive=True, check=False):
+    @Qube._auto_shrink
+    def exp(self, *, recursive=True, check=False, out=None):
         """This Scalar raised to the given power or powers.
 
         If this object is read-only, the returned object will also be read-only.
@@ -718,6 +800,8 @@ class Scalar(Qube):
                 overflow to infinity. If False, a ValueError will be raised any value
                 overflows. Check=True is slightly faster if we already know at the time of
                 the call that all input values are valid.
+            out (Scalar, optional): A writable Scalar of the same shape, into which the
+                result is written in place of a new object.
 
         Returns:
             Scalar: The exponential values.
@@ -732,21 +816,33 @@ class Scalar(Qube):
 
         self._require_unitless('exp()')
 
-        if check:
-            no_oflow = self.mask_where_gt(_EXP_CUTOFF, replace=_EXP_CUTOFF)
-            exp_values = np.exp(no_oflow._values)
+        if out is not None:
+            invalid = np.greater(self._values, _EXP_CUTOFF)
+            if not check and np.any(invalid):
+                raise ValueError('Scalar.exp() overflow encountered')
+
+            obj = self._unary_out(np.exp, out, 'exp()', invalid, _EXP_CUTOFF)
+            if obj is None:
+                return Qube._copy_out(self.exp(recursive=recursive, check=check), out)
+
+            exp_values = obj._values
 
         else:
-            no_oflow = self
-            with warnings.catch_warnings():
-                warnings.filterwarnings('error')
-                try:
-                    exp_values = np.exp(no_oflow._values)
-                except RuntimeWarning as err:
-                    raise ValueError('Scalar.exp() overflow encountered') from err
+            if check:
+                no_oflow = self.mask_where_gt(_EXP_CUTOFF, replace=_EXP_CUTOFF)
+                exp_values = np.exp(no_oflow._values)
+
+            else:
+                no_oflow = self
+                with warnings.catch_warnings():
+                    warnings.filterwarnings('error')
+                    try:
+                        exp_values = np.exp(no_oflow._values)
+                    except RuntimeWarning as err:
+                        raise ValueError('Scalar.exp() overflow encountered') from err
 
-        obj = Scalar._new_from_parts(exp_values, no_oflow._mask, nrank=0,
-                                     example=no_oflow)
+            obj = Scalar._new_from_parts(exp_values, no_oflow._mask, nrank=0,
+                                         example=no_oflow)
 
         if recursive and self._derivs:
             for key, deriv in self._derivs.items():
@@ -1678,6 +1774,7 @@ class Scalar(Qube):
     # Other operators
     ######################################################################################
 
+    @Qube._auto_shrink
     def __abs__(self, *, recursive=True):
         """abs(self), element-by-element absolute value.
 
@@ -1864,6 +1961,7 @@ class Scalar(Qube):
     }
 
     # Generic exponentiation, PolyMath scalar to a single scalar power
+    @Qube._auto_shrink
     def __pow__(self, expo, *, recursive=True):
 
         self._disallow_denom('**')
@@ -55,16 +55,18 @@ class Scalar(Qube):
         masked: Any = ...) -> _ShapeOrTuple: ...
     @staticmethod
     def as_scalar(arg: Any, *, recursive: bool = ...) -> _Arraylike: ...
-    def cos(self, *, recursive: bool = ...) -> _Arraylike: ...
+    def cos(self, *, recursive: bool = ..., out: Scalar | None = ...) -> _Arraylike: ...
     def eval_quadratic(self, a: Any, b: Any, c: Any, *,
         recursive: bool = ...) -> _Arraylike: ...
-    def exp(self, *, recursive: bool = ..., check: bool = ...) -> _Arraylike: ...
+    def exp(self, *, recursive: bool = ..., check: bool = ...,
+        out: Scalar | None = ...) -> _Arraylike: ...
     def frac(self, *, recursive: bool = ...) -> _Arraylike: ...
     def identity(self) -> _Arraylike: ...
     def int(self, top: builtins.int | None = ..., *, remask: bool = ...,
         clip: bool = ..., inclusive: bool = ..., shift: bool | None = ...,
         builtins: bool | None = ..., masked: Any = ...) -> _Arraylike | builtins.int: ...
-    def log(self, *, recursive: bool = ..., check: bool = ...) -> _Arraylike: ...
+    def log(self, *, recursive: bool = ..., check: bool = ...,
+        out: Scalar | None = ...) -> _Arraylike: ...
     def max(self, axis: Any = ..., *, builtins: bool | None = ..., masked: Any = ...,
         out: Any = ...) -> _Arraylike | float | builtins.int: ...
     @staticmethod
@@ -78,12 +80,13 @@ class Scalar(Qube):
     def reciprocal(self, *, recursive: bool = ..., nozeros: bool = ...) -> _Arraylike: ...
     def sign(self, *, zeros: bool = ..., builtins: bool | None = ...,
         masked: Any = ...) -> _Arraylike | builtins.int: ...
-    def sin(self, *, recursive: bool = ...) -> _Arraylike: ...
+    def sin(self, *, recursive: bool = ..., out: Scalar | None = ...) -> _Arraylike: ...
     @staticmethod
     def solve_quadratic(a: Any, b: Any, c: Any, *, recursive: bool = ...,
         include_antimask: bool = ...) -> _ShapeOrTuple: ...
     def sort(self, axis: builtins.int = ...) -> _Arraylike: ...
-    def sqrt(self, *, recursive: bool = ..., check: bool = ...) -> _Arraylike: ...
+    def sqrt(self, *, recursive: bool = ..., check: bool = ...,
+        out: Scalar | None = ...) -> _Arraylike: ...
     def tan(self, *, recursive: bool = ...) -> _Arraylike: ...
     def to_scalar(self, indx: builtins.int, *, recursive: bool = ...) -> _Arraylike: ...
 
@@ -666,6 +666,12 @@ class Unit:
 
         return self.__copy__()
 
+    def __reduce__(self):
+        """Reduce this Unit to the arguments of its constructor, for compact, fast
+        pickling. The factors are recomputed from the triple."""
+
+        return (Unit, (self.exponents, self.triple, self.name))
+
     ######################################################################################
     # String operations
     ######################################################################################
@@ -80,6 +80,7 @@ class Unit:
     def __ne__(self, arg: object) -> Any: ...
     def __pow__(self, power: float | builtins.int | bool) -> Unit: ...
     def __rdiv__(self, arg: Any) -> Any: ...
+    def __reduce__(self) -> tuple[Any, ...]: ...
     def __repr__(self) -> str: ...
     def __rmul__(self, arg: Any) -> Any: ...
     def __rtruediv__(self, arg: Any) -> Unit: ...
@@ -413,31 +413,43 @@ class Vector(Qube):
 
         return Qube.as_diagonal(self, 0, Qube._MATRIX_CLASS, recursive=recursive)
 
-    def dot(self, arg, *, recursive=True):
+    def dot(self, arg, *, recursive=True, out=None):
         """Calculate the dot product of this vector and another.
 
         Parameters:
             arg (Vector or vector-like): The vector to dot with this one.
             recursive (bool, optional): If True, include derivatives in the result.
+            out (Scalar, optional): A writable Scalar of the same shape as the result,
+                into which the result is written in place of a new object.
 
         Returns:
             Scalar: The dot product as a Scalar.
         """
 
         arg = self.as_this_type(arg, recursive=recursive, coerce=False)
-        return Qube.dot(self, arg, 0, 0, classes=[Scalar], recursive=recursive)
+        if out is not None and not isinstance(out, Scalar):
+            raise TypeError(f'invalid class for out in {type(self).__name__}.dot(): '
+                            f'{type(out).__name__}')
 
-    def norm(self, *, recursive=True):
+        return Qube.dot(self, arg, 0, 0, classes=[Scalar], recursive=recursive, out=out)
+
+    def norm(self, *, recursive=True, out=None):
         """Calculate the Euclidean length (magnitude) of this Vector.
 
         Parameters:
             recursive (bool, optional): If True, include derivatives in the result.
+            out (Scalar, optional): A writable Scalar of the same shape as the result,
+                into which the result is written in place of a new object.
 
         Returns:
             Scalar: The Euclidean norm of this Vector.
         """
 
-        return Qube.norm(self, 0, classes=[Scalar], recursive=recursive)
+        if out is not None and not isinstance(out, Scalar):
+            raise TypeError(f'invalid class for out in {type(self).__name__}.norm(): '
+                            f'{type(out).__name__}')
+
+        return Qube.norm(self, 0, classes=[Scalar], recursive=recursive, out=out)
 
     def norm_sq(self, *, recursive=True):
         """Calculate the squared length of this Vector.
@@ -485,12 +497,15 @@ class Vector(Qube):
         else:
             return self.wod * (norm / self.norm(recursive=False))
 
-    def cross(self, arg, *, recursive=True):
+    def cross(self, arg, *, recursive=True, out=None):
         """Calculate the cross product of this vector with another.
 
         Parameters:
             arg (Vector or vector-like): The vector to cross with this one.
             recursive (bool, optional): If True, include derivatives in the result.
+            out (Vector or Scalar, optional): A writable object of the same class and
+                shape as the result, into which the result is written in place of a new
+                object.
 
         Returns:
             Vector: The cross product vector. For 3-vectors, returns a Vector; for
@@ -500,8 +515,14 @@ class Vector(Qube):
         arg = self.as_this_type(arg, recursive=recursive, coerce=False)
 
         # type(self) is for 3-vectors, Scalar is for 2-vectors...
+        if out is not None:
+            cls = type(self) if self._numer == (3,) else Scalar
+            if not isinstance(out, cls):
+                raise TypeError(f'invalid class for out in {type(self).__name__}.'
+                                f'cross(): {type(out).__name__}')
+
         return Qube.cross(self, arg, 0, 0, classes=(type(self), Scalar),
-                          recursive=recursive)
+                          recursive=recursive, out=out)
 
     def ucross(self, arg, *, recursive=True):
         """Calculate the unit vector in the direction of the cross product.
@@ -41,9 +41,11 @@ class Vector(Qube):
         remask: bool = ...) -> _Arraylike: ...
     @classmethod
     def combos(cls, *args: Any) -> _Arraylike: ...
-    def cross(self, arg: Any, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
+    def cross(self, arg: Any, *, recursive: bool = ...,  # type: ignore[override]
+        out: Qube | None = ...) -> _Arraylike: ...
     def cross_product_as_matrix(self, *, recursive: bool = ...) -> _Arraylike: ...
-    def dot(self, arg: Any, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
+    def dot(self, arg: Any, *, recursive: bool = ...,  # type: ignore[override]
+        out: Qube | None = ...) -> _Arraylike: ...
     def element_div(self, arg: Any, recursive: bool = ...) -> _Arraylike: ...
     def element_mul(self, arg: Any, *, recursive: bool = ...) -> _Arraylike: ...
     @staticmethod
@@ -60,7 +62,8 @@ class Vector(Qube):
         remask: bool = ...) -> _Arraylike: ...
     def mask_where_component_lt(self, axis: builtins.int, limit: Any, replace: Any = ...,
         remask: bool = ...) -> _Arraylike: ...
-    def norm(self, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
+    def norm(self, *, recursive: bool = ...,  # type: ignore[override]
+        out: Qube | None = ...) -> _Arraylike: ...
     def norm_sq(self, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
     def outer(self, arg: Any, *, recursive: bool = ...) -> _Arraylike: ...  # type: ignore[override]
     def perp(self, arg: Any, *, recursive: bool = ...) -> _Arraylike: ...
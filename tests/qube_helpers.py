@@ -0,0 +1,49 @@
+##########################################################################################
+# tests/qube_helpers.py
+#
+# Comparisons of Qube objects shared by the unit tests of the Qube extensions
+##########################################################################################
+
+import numpy as np
+
+
+def assert_same(a, b, *, readonly=True) -> None:
+    """Values, masks, units and derivatives all match exactly.
+
+    Masked values are not compared, because they are not preserved by pickling. Use
+    readonly=False to ignore the read-only status, for objects that are restored read-only.
+    """
+
+    _assert_match(a, b, np.array_equal, readonly)
+
+
+def assert_close(a, b, *, readonly=True) -> None:
+    """Values, masks, units and derivatives all match to within rounding error."""
+
+    _assert_match(a, b, np.allclose, readonly)
+
+
+def _assert_match(a, b, compare, readonly) -> None:
+    """Compare two objects and, recursively, their derivatives."""
+
+    assert type(a) is type(b)
+    assert a.shape == b.shape
+    assert a.item == b.item
+    assert a.denom == b.denom
+    assert a.unit_ == b.unit_
+    if readonly:
+        assert a.readonly == b.readonly
+    assert np.all(a.mask == b.mask)
+
+    antimask = a.antimask
+    if np.shape(antimask):
+        assert compare(a.values[antimask], b.values[antimask])
+    elif antimask:
+        assert compare(a.values, b.values)
+
+    assert set(a.derivs) == set(b.derivs)
+    for key in a.derivs:
+        _assert_match(a.derivs[key], b.derivs[key], compare, readonly)
+        assert getattr(a, 'd_d' + key) is a.derivs[key]
+
+##########################################################################################
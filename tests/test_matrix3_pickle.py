@@ -6,7 +6,8 @@ import numpy as np
 import pickle
 import pytest
 
-from polymath import Matrix, Matrix3, Quaternion
+from polymath import Matrix, Matrix3, Quaternion, Qube, Scalar
+from polymath.matrix3 import _encode_quaternions
 
 
 def _rotations(shape: tuple[int, ...]) -> Matrix3:
@@ -302,4 +303,70 @@ def test_matrix3_pickle_accepts_a_zero_derivative() -> None:
     assert np.abs(restored.d_dt.values).max() <= 1.e-13
 
 
+def test_matrix3_pickle_encoding_matches_from_matrix3() -> None:
+    """The fused encoder reproduces Quaternion.from_matrix3() on every branch."""
+
+    np.random.seed(8021)
+
+    angles = np.random.randn(400, 3)
+    angles[:100] *= 1.e-3                   # near the identity, where the trace wins
+    angles[100:200, 0] = np.pi              # near 180 degrees
+    matrix = Matrix3.from_euler(angles[:, 0], angles[:, 1], angles[:, 2], 'rzxz')
+
+    (qvals, index) = _encode_quaternions(matrix.values)
+    assert set(index.tolist()) == {0, 1, 2, 3}
+
+    expected = Quaternion.from_matrix3(matrix).values
+    largest = np.take_along_axis(expected, index[:, np.newaxis], axis=-1)[:, 0]
+    assert np.all(largest > 0.)
+    assert np.all(largest >= np.abs(expected).max(axis=-1) - 1.e-15)
+
+    decoded = qvals.copy()
+    decoded[:, 0] = largest
+    rows = np.arange(400)
+    (decoded[rows, 0], decoded[rows, index]) = (decoded[rows, index], decoded[rows, 0])
+    assert np.abs(decoded - expected).max() <= 1.e-15
+
+
+def test_matrix3_pickle_caches_the_rotation_test() -> None:
+    """The test of a read-only object's matrices is cached."""
+
+    np.random.seed(8021)
+
+    matrix = _rotations((500,)).as_readonly()
+    assert _uses_quaternion(matrix)
+    assert matrix._cache['quaternion_convertible'] is True
+    assert _uses_quaternion(matrix)
+
+    # A tangent derivative added later is still tested
+    matrix = _rotations((500,)).as_readonly()
+    assert _uses_quaternion(matrix)
+    matrix.insert_deriv('t', Matrix(np.random.randn(500, 3, 3)))
+    assert not _uses_quaternion(matrix)
+
+    matrix = Matrix3(np.random.randn(500, 3, 3)).as_readonly()
+    assert not _uses_quaternion(matrix)
+    assert matrix._cache['quaternion_convertible'] is False
+
+    # Writable objects are never cached
+    matrix = _rotations((500,))
+    assert _uses_quaternion(matrix)
+    assert 'quaternion_convertible' not in matrix._cache
+
+
+def test_matrix3_pickle_reads_unpacked_indices() -> None:
+    """Pickles that saved the slot indices as a Scalar can still be read."""
+
+    np.random.seed(8021)
+
+    matrix = _rotations((500,))
+    state = matrix.__getstate__()
+    (_, slots) = _encode_quaternions(matrix.values)
+    state['INDEX'] = Scalar(slots).__getstate__()
+    del state['PACKED_INDEX']
+
+    restored = Qube.__new__(Matrix3)
+    restored.__setstate__(state)
+    assert np.abs(restored.values - matrix.values).max() <= 1.e-14
+
 ##########################################################################################
@@ -0,0 +1,111 @@
+##########################################################################################
+# tests/test_qube_ext_async_ops.py
+#
+# Unit tests for asyncio pickling with Qube.dump_async(), Qube.load_async() and their
+# batch variants
+##########################################################################################
+
+import asyncio
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from polymath import Qube, Scalar, Unit, Vector3
+
+from tests.qube_helpers import assert_same
+
+
+def test_qube_ext_async_ops_round_trip(tmp_path) -> None:
+    """Objects pickled by a coroutine are identical to ordinary pickles."""
+
+    np.random.seed(5529)
+
+    v = Vector3(np.random.randn(200, 100, 3), unit=Unit.KM,
+                derivs={'t': Vector3(np.random.randn(200, 100, 3))})
+    path = tmp_path / 'v.pickle'
+
+    async def main():
+        await v.dump_async(path)
+        return await Qube.load_async(str(path))
+
+    assert_same(asyncio.run(main()), v)
+    assert path.read_bytes() == pickle.dumps(v)
+
+
+def test_qube_ext_async_ops_event_loop(tmp_path) -> None:
+    """Other tasks keep running while a large object is pickled."""
+
+    a = Scalar(np.random.default_rng(1712).random((1000, 1000)))
+    path = tmp_path / 'a.pickle'
+
+    async def ticker(done):
+        ticks = 0
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0)
+        return ticks
+
+    async def main():
+        done = asyncio.Event()
+        task = asyncio.create_task(ticker(done))
+        await a.dump_async(path)
+        b = await Qube.load_async(path)
+        done.set()
+        return (b, await task)
+
+    (b, ticks) = asyncio.run(main())
+    assert_same(b, a)
+    assert ticks > 1
+
+
+def test_qube_ext_async_ops_batch(tmp_path) -> None:
+    """Batches of objects are written and read in order."""
+
+    objects = [Scalar(np.arange(k, k + 500.)) for k in range(6)]
+    objects.append(Scalar(1.5, mask=True))
+    paths = [tmp_path / f'{k}.pickle' for k in range(len(objects))]
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            await Qube.dump_batch_async(objects, paths, executor=executor)
+            return await Qube.load_batch_async(iter(paths), executor=executor)
+
+    loaded = asyncio.run(main())
+    assert len(loaded) == len(objects)
+    for (a, b) in zip(loaded, objects, strict=True):
+        assert_same(a, b)
+
+    with pytest.raises(ValueError):
+        asyncio.run(Qube.dump_batch_async(objects, paths[:2]))
+
+
+def test_qube_ext_async_ops_lazy(tmp_path) -> None:
+    """Objects are decoded in the executor even when lazy decoding is selected."""
+
+    np.random.seed(6630)
+
+    v = Vector3(np.random.randn(100, 50, 3), mask=np.random.rand(100, 50) < 0.2,
+                derivs={'t': Vector3(np.random.randn(100, 50, 3))})
+    w = Scalar(np.random.randn(40, 60), derivs={'t': Scalar(np.random.randn(40, 60))})
+    paths = [tmp_path / 'v.pickle', tmp_path / 'w.pickle']
+
+    async def main():
+        await Qube.dump_batch_async([v, [w, {'w': w}]], paths)
+        return (await Qube.load_async(paths[0]), await Qube.load_batch_async(paths))
+
+    try:
+        Qube.set_pickle_lazy(True)
+        (loaded, batch) = asyncio.run(main())
+    finally:
+        Qube.set_pickle_lazy(False)
+
+    for obj in (loaded, batch[0], batch[1][0], batch[1][1]['w']):
+        for item in [obj, *obj.derivs.values()]:
+            assert '_values' in vars(item)
+            assert '_mask' in vars(item)
+            assert '_lazy_state' not in vars(item)
+
+    assert_same(loaded, pickle.loads(pickle.dumps(v)))
+    assert_same(batch[1][0], w)
@@ -0,0 +1,131 @@
+##########################################################################################
+# tests/test_qube_ext_lazy.py
+#
+# Unit tests for deferred evaluation with Qube.lazy()
+##########################################################################################
+
+import numpy as np
+import pytest
+
+from polymath import Qube, Scalar, Unit, Vector3
+from polymath.extensions.lazy import LazyQube
+
+from tests.qube_helpers import assert_close
+
+
+def test_qube_ext_lazy_chain_matches_eager() -> None:
+    """A long chain of operations matches the immediate result."""
+
+    np.random.seed(5471)
+
+    a = Scalar(np.random.randn(20, 30), mask=np.random.rand(20, 30) < 0.1)
+    b = Scalar(np.random.randn(20, 30))
+    c = Scalar(np.random.rand(30) + 0.5, mask=np.random.rand(30) < 0.1)
+
+    expr = ((a.lazy() + b) * c - 2.) / c + b.lazy().sin() * a - (a * 3.).lazy().cos()
+    assert isinstance(expr, LazyQube)
+    assert expr.shape == (20, 30)
+
+    eager = ((a + b) * c - 2.) / c + b.sin() * a - (a * 3.).cos()
+    assert_close(expr.evaluate(), eager)
+
+
+def test_qube_ext_lazy_numbers_on_the_left() -> None:
+    """Numbers can be the left operand of any operator."""
+
+    np.random.seed(8821)
+
+    a = Scalar(np.random.rand(10) + 1.)
+    assert_close((2. - a.lazy()).evaluate(), 2. - a)
+    assert_close((3. + a.lazy()).evaluate(), 3. + a)
+    assert_close((4. * a.lazy()).evaluate(), 4. * a)
+    assert_close((5. / a.lazy()).evaluate(), 5. / a)
+    assert_close((-a.lazy()).evaluate(), -a)
+
+
+def test_qube_ext_lazy_domain_masks() -> None:
+    """Division by zero, and sqrt and log of invalid values, are masked."""
+
+    a = Scalar([4., -1., 0., 9.])
+    b = Scalar([2., 0., 1., 3.])
+
+    result = (a.lazy() / b).evaluate()
+    assert list(result.mask) == [False, True, False, False]
+
+    result = a.lazy().sqrt().evaluate()
+    assert_close(result, a.sqrt())
+    assert list(result.mask) == [False, True, False, False]
+
+    result = (a.lazy() * 1.).log().evaluate()
+    assert_close(result, a.log())
+    assert list(result.mask) == [False, True, True, False]
+
+    result = (a.lazy() / 0.).evaluate()
+    assert np.all(result.mask)
+
+
+def test_qube_ext_lazy_vectors_and_units() -> None:
+    """Vector items and units are carried through."""
+
+    np.random.seed(3306)
+
+    v = Vector3(np.random.randn(8, 3), unit=Unit.KM)
+    s = Scalar(np.random.rand(8) + 1., unit=Unit.S)
+
+    result = (v.lazy() / s * 2. + v / s).evaluate()
+    eager = v / s * 2. + v / s
+    assert type(result) is Vector3
+    assert result.unit_ == Unit.KM / Unit.S
+    assert np.allclose(result.values, eager.values)
+
+    result = (s.lazy() * v).evaluate()
+    assert type(result) is Vector3
+    assert np.allclose(result.values, (s * v).values)
+
+
+def test_qube_ext_lazy_errors_raised_while_building() -> None:
+    """Incompatible operands raise before anything is computed."""
+
+    s = Scalar([1., 2.], unit=Unit.KM)
+    t = Scalar([1., 2.], unit=Unit.S)
+    v = Vector3([1., 2., 3.])
+
+    with pytest.raises(ValueError):
+        s.lazy() + t
+    with pytest.raises(ValueError):
+        s.lazy().sin()
+    with pytest.raises(ValueError):
+        s.lazy() + Scalar([1., 2., 3.])
+    with pytest.raises(ValueError):
+        v.lazy() + s
+    with pytest.raises(TypeError):
+        v.lazy() * v
+    with pytest.raises(TypeError):
+        v.lazy().cos()
+
+
+def test_qube_ext_lazy_derivs_fall_back_to_eager() -> None:
+    """Derivatives are evaluated exactly, one operation at a time."""
+
+    np.random.seed(1947)
+
+    a = Scalar(np.random.rand(6) + 1., derivs={'t': Scalar(np.random.randn(6))})
+    b = Scalar(np.random.rand(6) + 1.)
+
+    result = (a.lazy() * b + a.lazy().sqrt()).evaluate()
+    eager = a * b + a.sqrt()
+    assert_close(result, eager)
+    assert np.allclose(result.d_dt.values, eager.d_dt.values)
+
+
+def test_qube_ext_lazy_leaves_inputs_unchanged() -> None:
+    """Buffers are reused only when they were allocated by the evaluation."""
+
+    a = Scalar(np.arange(5.))
+    b = Scalar(np.ones(5))
+    saved = a.values.copy()
+
+    result = ((a.lazy() + 1.) * b - a).evaluate()
+    assert np.all(result.values == 1.)
+    assert np.all(a.values == saved)
+    assert isinstance(Qube.lazy(a), LazyQube)
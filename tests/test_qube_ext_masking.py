@@ -0,0 +1,103 @@
+##########################################################################################
+# tests/test_qube_ext_masking.py
+#
+# Unit tests for compact masks, from Qube.as_sparse_mask() and Qube.as_packed_mask()
+##########################################################################################
+
+import pickle
+
+import numpy as np
+
+from polymath import Qube, Scalar, Vector3
+
+from tests.qube_helpers import assert_close
+
+
+def _is_compact(obj) -> bool:
+    return '_mask' not in obj.__dict__ and '_compact_mask' in obj.__dict__
+
+
+def test_qube_ext_masking_sparse_operations() -> None:
+    """Operations on sparse masks match those on mask arrays and stay sparse."""
+
+    np.random.seed(3318)
+
+    mask = np.random.rand(50, 40) < 0.01
+    a = Scalar(np.random.rand(50, 40) + 0.5, mask=mask,
+               derivs={'t': Scalar(np.random.randn(50, 40), mask=mask)})
+    bmask = np.random.rand(50, 40) < 0.02
+    b = Scalar(np.random.rand(50, 40) - 0.2, mask=bmask,
+               derivs={'t': Scalar(np.random.randn(50, 40), mask=bmask)})
+    v = Vector3(np.random.randn(50, 40, 3))
+    (sa, sb) = (a.as_sparse_mask(), b.as_sparse_mask())
+    assert _is_compact(sa)
+    assert _is_compact(sa.d_dt)
+    assert sa.count_masked() == np.sum(mask)
+    assert sa.count_unmasked() == a.count_unmasked()
+
+    for (dense, sparse) in [(lambda: a * b + a, lambda: sa * sb + sa),
+                            (lambda: 2. - a, lambda: 2. - sa),
+                            (lambda: v * a, lambda: v * sa),
+                            (lambda: a.sin(), lambda: sa.sin()),
+                            (lambda: a + Scalar(3.), lambda: sa + Scalar(3.)),
+                            (lambda: -a.as_readonly(), lambda: -sa.as_readonly())]:
+        result = sparse()
+        assert _is_compact(result)
+        assert_close(result, dense())
+
+    # Operations that mask more produce mask arrays
+    assert_close(sa / sb, a / b)
+    assert_close(sb.log(), b.log())
+
+    # So do operations on masked operands with different derivatives
+    assert_close(sa + sb.wod, a + b.wod)
+    assert_close(sa * sb.wod, a * b.wod)
+
+    # Anything else converts the mask to an array
+    c = sa * sb
+    assert c.mask.shape == (50, 40)
+    assert not _is_compact(c)
+    assert_close(pickle.loads(pickle.dumps(sa)), a)
+    assert_close(sa.reshape((40, 50)).reshape((50, 40)), a)
+
+    # Objects with a single mask value are unchanged
+    d = Scalar(np.arange(10.))
+    assert d.as_sparse_mask() is d
+    assert Qube.is_one_false(d.as_sparse_mask().mask)
+
+
+def test_qube_ext_masking_packed_operations() -> None:
+    """Operations on packed masks match those on mask arrays and stay packed."""
+
+    np.random.seed(9056)
+
+    # 1001 elements leaves seven padding bits in the last byte
+    mask = np.random.rand(7, 143) < 0.3
+    a = Scalar(np.random.rand(7, 143) + 0.5, mask=mask,
+               derivs={'t': Scalar(np.random.randn(7, 143), mask=mask)})
+    bmask = np.random.rand(7, 143) < 0.2
+    b = Scalar(np.random.rand(7, 143) - 0.2, mask=bmask,
+               derivs={'t': Scalar(np.random.randn(7, 143), mask=bmask)})
+    cmask = np.random.rand(7, 143) < 0.01
+    c = Scalar(np.random.rand(7, 143), mask=cmask,
+               derivs={'t': Scalar(np.random.randn(7, 143), mask=cmask)})
+    (pa, pb, sc) = (a.as_packed_mask(), b.as_packed_mask(), c.as_sparse_mask())
+    assert _is_compact(pa)
+    assert _is_compact(pa.d_dt)
+    assert pa.__dict__['_compact_mask'].words.nbytes == 126
+    assert pa.count_masked() == np.sum(mask)
+
+    for (dense, packed) in [(lambda: a * b + a, lambda: pa * pb + pa),
+                            (lambda: a - c, lambda: pa - sc),
+                            (lambda: c * b, lambda: sc * pb),
+                            (lambda: a.cos(), lambda: pa.cos()),
+                            (lambda: 1. / a.as_readonly(), lambda: 1. / pa.as_readonly())]:
+        result = packed()
+        assert _is_compact(result)
+        assert result.count_masked() == dense().count_masked()
+        assert_close(result, dense())
+
+    # Operations that mask more produce mask arrays
+    assert_close(pa / pb, a / b)
+    assert_close(pb.sqrt(), b.sqrt())
+    assert np.all(pa.antimask == a.antimask)
@@ -0,0 +1,228 @@
+##########################################################################################
+# tests/test_qube_ext_numpy_ops.py
+#
+# Unit tests for the NumPy ufunc and array function protocols
+##########################################################################################
+
+import numpy as np
+import pytest
+
+from polymath import Boolean, Polynomial, Quaternion, Scalar, Unit, Vector3
+
+from tests.qube_helpers import assert_close
+
+
+def test_qube_ext_numpy_ops_unary() -> None:
+    """Unary ufuncs call the matching methods, including derivatives."""
+
+    np.random.seed(3017)
+
+    a = Scalar(np.random.rand(12) + 0.5, mask=np.random.rand(12) < 0.3,
+               derivs={'t': Scalar(np.random.randn(12))})
+
+    assert_close(np.sin(a), a.sin())
+    assert_close(np.cos(a), a.cos())
+    assert_close(np.sqrt(a), a.sqrt())
+    assert_close(np.log(a), a.log())
+    assert_close(np.exp(a), a.exp())
+    assert_close(np.negative(a), -a)
+    assert_close(np.absolute(a), abs(a))
+
+    b = Boolean(np.random.rand(12) < 0.5)
+    assert_close(np.logical_not(b), b.logical_not())
+
+
+def test_qube_ext_numpy_ops_binary() -> None:
+    """Binary ufuncs call the matching methods in either order."""
+
+    np.random.seed(8150)
+
+    a = Scalar(np.random.rand(4, 5) + 1., mask=np.random.rand(4, 5) < 0.2,
+               unit=Unit.KM)
+    b = Scalar(np.random.rand(5) + 1., mask=np.random.rand(5) < 0.2)
+    x = np.random.rand(4, 5) + 1.
+
+    assert_close(np.add(a, a), a + a)
+    assert_close(np.multiply(a, b), a * b)
+    assert_close(np.true_divide(b, a), b / a)
+    assert_close(np.subtract(x, b), x - b)
+    assert_close(np.add(x, b), x + b)
+    assert_close(np.true_divide(x, b), x / b)
+    assert_close(np.less(b, x), b < x)
+    assert_close(np.less(x, b), b > x)
+
+    # The ndarray operators defer to Qube
+    result = x - b
+    assert type(result) is Scalar
+    assert np.allclose(result.values, x - b.values)
+
+    with pytest.raises(ValueError):
+        np.add(a, Scalar(1., unit=Unit.S))
+
+    # Ufuncs without a reflected method convert a left operand to a Scalar
+    c = Scalar(np.random.rand(4, 5), derivs={'t': Scalar(np.random.randn(4, 5))})
+    assert_close(x ** c, Scalar(x) ** c)
+    assert_close(np.power(x, c), Scalar(x) ** c)
+    assert_close(np.power(2., c), Scalar(2.) ** c)
+    assert_close(np.arctan2(x, c), Scalar(x).arctan2(c))
+    assert_close(np.arctan2(1., c), Scalar(1.).arctan2(c))
+
+
+def test_qube_ext_numpy_ops_other_ufuncs() -> None:
+    """Other ufuncs apply to the values of unitless Scalars and Booleans."""
+
+    a = Scalar([1., 4., 9.], mask=[False, True, False])
+    result = np.cbrt(a)
+    assert type(result) is Scalar
+    assert np.allclose(result.values, np.cbrt([1., 4., 9.]))
+    assert list(result.mask) == [False, True, False]
+
+    result = np.isfinite(a)
+    assert type(result) is Boolean
+
+    with pytest.raises(TypeError):
+        np.cbrt(Scalar([1., 2.], unit=Unit.KM))
+    with pytest.raises(TypeError):
+        np.cbrt(Vector3([1., 2., 3.]))
+    with pytest.raises(TypeError):
+        np.add.reduce(a)
+
+
+def test_qube_ext_numpy_ops_out_and_where() -> None:
+    """The out and where arguments apply to Qube results."""
+
+    np.random.seed(6403)
+
+    a = Scalar(np.random.rand(10) + 1., derivs={'t': Scalar(np.random.randn(10))})
+    b = Scalar(np.random.rand(10) + 1.)
+    x = np.random.rand(10)
+
+    out = Scalar(np.zeros(10))
+    buffer = out.values
+    assert np.add(a, b, out=out) is out
+    assert out.values is buffer
+    assert_close(out, a + b)
+
+    assert np.multiply(x, a, out=out) is out
+    assert_close(out, a * x)
+
+    assert np.sin(a, out=out) is out
+    assert_close(out, a.sin())
+
+    assert np.subtract(x, a, out=out) is out
+    assert_close(out, x - a)
+
+    where = np.arange(10) < 4
+    result = np.add(a, b, where=where)
+    assert list(result.mask) == 4 * [False] + 6 * [True]
+    assert np.allclose(result.values[:4], (a + b).values[:4])
+
+    out = Scalar(np.full(10, 7.))
+    np.add(a.wod, b, out=out, where=where)
+    assert np.allclose(out.values[:4], (a + b).values[:4])
+    assert np.all(out.values[4:] == 7.)
+
+    # Derivatives of out are replaced only where selected
+    b = Scalar(b.values, derivs={'u': Scalar(np.random.randn(10))})
+    out = Scalar(np.full(10, 7.), derivs={'t': Scalar(np.full(10, 8.)),
+                                           'v': Scalar(np.full(10, 9.))})
+    expected = a + b
+    np.add(a, b, out=out, where=where)
+    assert set(out.derivs) == {'t', 'u', 'v'}
+    assert np.allclose(out.d_dt.values[:4], expected.d_dt.values[:4])
+    assert np.allclose(out.d_du.values[:4], expected.d_du.values[:4])
+    assert np.all(out.d_dv.values[:4] == 0.)
+    assert np.all(out.d_dt.values[4:] == 8.)
+    assert np.all(out.d_du.values[4:] == 0.)
+    assert np.all(out.d_dv.values[4:] == 9.)
+
+    with pytest.raises(TypeError):
+        np.add(a, b, out=np.zeros(10))
+
+
+def test_qube_ext_numpy_ops_divide_out_subclasses() -> None:
+    """Division with out works for subclasses that override the operator."""
+
+    np.random.seed(1187)
+
+    q = Quaternion(np.random.randn(6, 4))
+    b = Boolean(np.random.rand(6) < 0.5)
+    p = Polynomial(np.random.randn(6, 3))
+    a = Scalar(np.random.rand(6) + 1.)
+
+    for ufunc in (np.divide, np.true_divide):
+        out = Quaternion(np.zeros((6, 4)))
+        assert ufunc(q, 2., out=out) is out
+        assert_close(out, q / 2.)
+        assert_close(ufunc(q, a, out=out), q / a)
+
+        out = Scalar(np.zeros(6))
+        assert ufunc(b, a, out=out) is out
+        assert_close(out, b / a)
+
+        out = Polynomial(np.zeros((6, 3)))
+        assert ufunc(p, a, out=out) is out
+        assert_close(out, p / a)
+
+
+def test_qube_ext_numpy_ops_concatenate() -> None:
+    """np.concatenate() joins values, masks, units and derivatives."""
+
+    np.random.seed(5508)
+
+    a = Vector3(np.random.randn(3, 4, 3), mask=np.random.rand(3, 4) < 0.3,
+                unit=Unit.KM, derivs={'t': Vector3(np.random.randn(3, 4, 3))})
+    b = Vector3(np.random.randn(2, 4, 3), unit=Unit.M)
+
+    result = np.concatenate([a, b])
+    assert type(result) is Vector3
+    assert result.shape == (5, 4)
+    assert result.unit_ == Unit.KM
+    assert np.all(result.values[:3] == a.values)
+    assert np.all(result.values[3:] == b.values)
+    assert np.all(result.mask[:3] == a.mask)
+    assert not np.any(result.mask[3:])
+    assert np.all(result.d_dt.values[:3] == a.d_dt.values)
+    assert np.all(result.d_dt.values[3:] == 0.)
+
+    result = np.concatenate((a, a), axis=-1)
+    assert result.shape == (3, 8)
+    assert np.all(result.values[:, 4:] == a.values)
+
+    with pytest.raises(ValueError):
+        np.concatenate([a, Vector3(np.ones((2, 3)), unit=Unit.S)])
+    with pytest.raises(ValueError):
+        np.concatenate([a, a], axis=2)
+
+
+def test_qube_ext_numpy_ops_stack_and_where() -> None:
+    """np.stack() and np.where() return Qube objects."""
+
+    np.random.seed(2093)
+
+    a = Scalar(np.random.randn(6), mask=np.random.rand(6) < 0.3,
+               derivs={'t': Scalar(np.random.randn(6))})
+    b = Scalar(np.random.randn(6))
+
+    result = np.stack([a, b])
+    assert_close(result, Scalar.stack(a, b))
+    result = np.stack([a, b], axis=1)
+    assert result.shape == (6, 2)
+    assert np.all(result.values[:, 0] == a.values)
+
+    cond = a.values > 0.
+    result = np.where(cond, a, b)
+    assert type(result) is Scalar
+    assert np.all(result.values == np.where(cond, a.values, b.values))
+    assert np.all(result.mask == (cond & a.mask))
+    assert np.all(result.d_dt.values == np.where(cond, a.d_dt.values, 0.))
+
+    v = Vector3(np.random.randn(6, 3))
+    result = np.where(Boolean(cond, mask=[True] + 5 * [False]), v, Vector3.ZERO)
+    assert type(result) is Vector3
+    assert np.all(result.values[cond] == v.values[cond])
+    assert np.all(result.values[~cond] == 0.)
+    assert result.mask[0]
+
+    # Other functions behave as before
+    assert np.sum(a) == a.sum()
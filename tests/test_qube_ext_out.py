@@ -0,0 +1,213 @@
+##########################################################################################
+# tests/test_qube_ext_out.py
+#
+# Unit tests for the out= argument of arithmetic, unary and vector operations
+##########################################################################################
+
+import numpy as np
+import pytest
+
+from polymath import (Boolean, Matrix3, Polynomial, Quaternion, Scalar, Unit, Vector,
+                      Vector3)
+
+from tests.qube_helpers import assert_close
+
+
+def test_qube_ext_out_arithmetic() -> None:
+    """+, -, * and / write into the out object's existing buffer."""
+
+    np.random.seed(6234)
+
+    a = Scalar(np.random.randn(4, 5), mask=np.random.rand(4, 5) < 0.2, unit=Unit.KM)
+    b = Scalar(np.random.randn(4, 5) + 3., unit=Unit.KM)
+    c = Scalar(np.random.randn(5) + 3., mask=np.random.rand(5) < 0.2)
+    out = Scalar(np.zeros((4, 5)))
+    buffer = out.values
+
+    for (func, arg) in [('__add__', b), ('__sub__', b), ('__mul__', c),
+                        ('__truediv__', c), ('__mul__', 2.), ('__truediv__', 2.),
+                        ('__truediv__', 0.)]:
+        result = getattr(a, func)(arg, out=out)
+        assert result is out
+        assert result.values is buffer
+        assert_close(result, getattr(a, func)(arg))
+
+
+def test_qube_ext_out_derivs() -> None:
+    """Derivatives are replaced by those of the result."""
+
+    np.random.seed(2815)
+
+    a = Scalar(np.random.rand(6) + 1., derivs={'t': Scalar(np.random.randn(6))})
+    b = Scalar(np.random.rand(6) + 1., derivs={'x': Scalar(np.random.randn(6))})
+    out = Scalar(np.zeros(6), derivs={'y': Scalar(np.ones(6))})
+
+    assert_close(a.__mul__(b, out=out), a * b)
+    assert_close(a.__add__(b, out=out, recursive=False), a.__add__(b, recursive=False))
+    assert_close(a.sqrt(out=out), a.sqrt())
+
+
+def test_qube_ext_out_aliased_operand() -> None:
+    """An out object that is also an operand gives the same result."""
+
+    np.random.seed(4410)
+
+    a = Scalar(np.random.rand(6) + 1., derivs={'t': Scalar(np.random.randn(6))})
+    b = Scalar(np.random.rand(6) + 1.)
+    expected = a * b
+    expected_sin = (a * b).sin()
+
+    out = a.copy()
+    assert out.__mul__(b, out=out) is out
+    assert_close(out, expected)
+    assert out.sin(out=out) is out
+    assert_close(out, expected_sin)
+
+
+def test_qube_ext_out_scalar_functions() -> None:
+    """Unary Scalar functions mask invalid values exactly as without out=."""
+
+    np.random.seed(7092)
+
+    a = Scalar(np.random.randn(30) * 3., mask=np.random.rand(30) < 0.2,
+               derivs={'t': Scalar(np.random.randn(30))})
+    out = Scalar(np.empty(30))
+
+    assert_close(a.sin(out=out), a.sin())
+    assert_close(a.cos(out=out), a.cos())
+    assert_close(a.sqrt(out=out), a.sqrt())
+    assert_close(a.log(out=out), a.log())
+    assert_close(a.exp(out=out), a.exp())
+
+    with pytest.raises(ValueError):
+        a.without_mask().sqrt(check=False, out=out)
+
+
+def test_qube_ext_out_vector_ops() -> None:
+    """Vector dot, cross and norm accept out=."""
+
+    np.random.seed(1186)
+
+    v = Vector3(np.random.randn(7, 3), mask=np.random.rand(7) < 0.3)
+    w = Vector3(np.random.randn(7, 3), derivs={'t': Vector3(np.random.randn(7, 3))})
+
+    s_out = Scalar(np.zeros(7))
+    assert_close(v.dot(w, out=s_out), v.dot(w))
+    assert_close(v.norm(out=s_out), v.norm())
+
+    v_out = Vector3(np.zeros((7, 3)))
+    buffer = v_out.values
+    assert_close(v.cross(w, out=v_out), v.cross(w))
+    assert v_out.values is buffer
+
+    p = Vector(np.random.randn(7, 2))
+    q = Vector(np.random.randn(7, 2))
+    assert_close(p.cross(q, out=s_out), p.cross(q))
+
+
+def test_qube_ext_out_subclass_operators() -> None:
+    """Subclasses that override the operators accept out or reject the operation."""
+
+    np.random.seed(2291)
+
+    a = Scalar(np.random.randn(7), derivs={'t': Scalar(np.random.randn(7))})
+    v = Vector3(np.random.randn(7, 3))
+    m = Matrix3.z_rotation(Scalar(np.random.randn(7)))
+    v_out = Vector3(np.zeros((7, 3)))
+    assert_close(m.__mul__(v, out=v_out), m * v)
+    assert_close(m.__mul__(a, out=Scalar(np.zeros(7))), m * a)
+    with pytest.raises(TypeError):
+        m.__add__(m, out=Matrix3(np.zeros((7, 3, 3))))
+    with pytest.raises(TypeError):
+        m.__sub__(m, out=Matrix3(np.zeros((7, 3, 3))))
+
+    q = Quaternion(np.random.randn(7, 4))
+    r = Quaternion(np.random.randn(7, 4))
+    q_out = Quaternion(np.zeros((7, 4)))
+    assert_close(q.__mul__(r, out=q_out), q * r)
+    assert_close(q.__mul__(a, out=q_out), q * a)
+    with pytest.raises(ValueError):
+        q.__mul__(r, out=Quaternion(np.zeros((6, 4))))
+
+    b = Boolean(np.random.randn(7) > 0)
+    s_out = Scalar(np.zeros(7))
+    for op in ('__add__', '__sub__', '__mul__'):
+        assert_close(getattr(b, op)(a, out=s_out), getattr(b, op)(a))
+
+    p = Polynomial(np.random.randn(7, 3))
+    c = Polynomial(np.random.randn(7, 2))
+    p_out = Polynomial(np.zeros((7, 3)))
+    assert_close(p.__add__(c, out=p_out), p + c)
+    assert_close(p.__sub__(c, out=p_out), p - c)
+    assert_close(p.__mul__(a.wod, out=p_out), p * a.wod)
+    assert_close(p.__mul__(c, out=Polynomial(np.zeros((7, 4)))), p * c)
+    with pytest.raises(ValueError):
+        p.__mul__(c, out=p_out)
+
+
+def test_qube_ext_out_quaternion_division() -> None:
+    """Quaternion division writes into out."""
+
+    np.random.seed(7712)
+
+    q = Quaternion(np.random.randn(7, 4), derivs={'t': Quaternion(np.random.randn(7, 4))})
+    r = Quaternion(np.random.randn(7, 4))
+    a = Scalar(np.random.rand(7) + 1.)
+    q_out = Quaternion(np.zeros((7, 4)))
+
+    assert q.__truediv__(r, out=q_out) is q_out
+    assert_close(q_out, q / r)
+    assert_close(q.__truediv__(a, out=q_out), q / a)
+    assert_close(q.__truediv__(2., out=q_out), q / 2.)
+    with pytest.raises(ValueError):
+        q.__truediv__(r, out=Quaternion(np.zeros((6, 4))))
+
+
+def test_qube_ext_out_boolean_division() -> None:
+    """Boolean division writes into a Scalar out."""
+
+    np.random.seed(7713)
+
+    b = Boolean(np.random.randn(7) > 0)
+    a = Scalar(np.random.rand(7) + 1.)
+    s_out = Scalar(np.zeros(7))
+
+    assert b.__truediv__(a, out=s_out) is s_out
+    assert_close(s_out, b / a)
+    assert_close(b.__truediv__(4., out=s_out), b / 4.)
+    with pytest.raises(TypeError):
+        b.__truediv__(a, out=Boolean(np.zeros(7, dtype='bool')))
+
+
+def test_qube_ext_out_polynomial_division() -> None:
+    """Polynomial division writes into a Polynomial out."""
+
+    np.random.seed(7714)
+
+    p = Polynomial(np.random.randn(7, 3))
+    a = Scalar(np.random.rand(7) + 1.)
+    p_out = Polynomial(np.zeros((7, 3)))
+
+    assert p.__truediv__(a, out=p_out) is p_out
+    assert_close(p_out, p / a)
+    assert_close(p.__truediv__(Polynomial(np.full((7, 1), 2.)), out=p_out), p / 2.)
+    with pytest.raises(ValueError):
+        p.__truediv__(a, out=Polynomial(np.zeros((7, 2))))
+
+
+def test_qube_ext_out_errors() -> None:
+    """Invalid out objects are rejected."""
+
+    a = Scalar(np.arange(4.))
+    v = Vector3(np.ones((4, 3)))
+
+    with pytest.raises(ValueError):
+        a.__add__(a, out=Scalar(np.zeros(5)))
+    with pytest.raises(TypeError):
+        a.__add__(a, out=v)
+    with pytest.raises(ValueError):
+        a.__add__(a, out=Scalar(np.zeros(4)).as_readonly())
+    with pytest.raises(TypeError):
+        v.norm(out=v)
+    with pytest.raises(ValueError):
+        Scalar(1.).sin(out=Scalar(0.))
@@ -0,0 +1,111 @@
+##########################################################################################
+# tests/test_qube_ext_packing.py
+#
+# Unit tests for batch pickling with Qube.pack() and Qube.unpack()
+##########################################################################################
+
+import pickle
+
+import numpy as np
+import pytest
+
+from polymath import Boolean, Qube, Scalar, Unit, Vector, Vector3
+from polymath.extensions.packing import PackedQubes
+
+from tests.qube_helpers import assert_same
+
+
+def test_qube_ext_packing_round_trip() -> None:
+    """A mixed list of objects survives packing, pickling and unpacking in order."""
+
+    np.random.seed(4477)
+
+    objects = []
+    for k in range(300):
+        mask = (k % 7 == 0)
+        objects.append(Vector3(np.random.randn(3), mask=mask,
+                               derivs={'t': Vector3(np.random.randn(3), mask=mask)}))
+        objects.append(Scalar(np.random.randn(), unit=Unit.KM))
+        objects.append(Scalar(k))
+        objects.append(Boolean(k % 3 == 0))
+    objects += [Scalar(np.random.randn(4, 5), mask=np.random.rand(4, 5) < 0.3),
+                Scalar(np.random.randn(4, 5)),
+                Vector(np.random.randn(2, 3, 2), drank=1),
+                Scalar(1.5, unit=Unit.DEG).as_readonly(),
+                Scalar(2.5, unit=Unit.DEG).as_readonly()]
+
+    packed = Qube.pack(objects)
+    assert isinstance(packed, PackedQubes)
+    assert len(packed) == len(objects)
+    assert len(packed.groups) == 7
+
+    restored = Qube.unpack(pickle.loads(pickle.dumps(packed)))
+    assert len(restored) == len(objects)
+    for (a, b) in zip(restored, objects, strict=True):
+        assert_same(a, b)
+
+        # Unpacked objects have every attribute that the constructor sets
+        assert set(vars(a)) == set(vars(b))
+        for key in a.derivs:
+            assert set(vars(a.derivs[key])) == set(vars(b.derivs[key]))
+
+    # Unpacked objects are independent and usable
+    restored[0][...] = Vector3.ZERO
+    assert restored[4] != Vector3.ZERO
+    assert np.all((restored[1] * 2).values == objects[1].values * 2)
+    assert isinstance(restored[1].values, float)
+
+    # Much smaller than pickling each object separately
+    assert len(pickle.dumps(packed)) < 0.7 * len(pickle.dumps(objects))
+
+
+def test_qube_ext_packing_pickle_settings() -> None:
+    """Objects with different pickle settings fall into different groups."""
+
+    np.random.seed(8080)
+
+    objects = [Scalar(np.random.randn()) for _ in range(400)]
+    for obj in objects[::2]:
+        obj.set_pickle_digits(3, 1.)
+
+    packed = Qube.pack(objects)
+    assert len(packed.groups) == 2
+    restored = Qube.unpack(pickle.loads(pickle.dumps(packed)))
+    for (k, (a, b)) in enumerate(zip(restored, objects, strict=True)):
+        if k % 2:
+            assert a.values == b.values
+        else:
+            assert abs(a.values - b.values) <= 0.5e-3
+
+
+def test_qube_ext_packing_dtypes() -> None:
+    """Objects whose values differ in precision are never stacked together."""
+
+    np.random.seed(6102)
+
+    values = np.random.randn(6, 3)
+    objects = [Vector3(values[k].astype(np.float32 if k % 2 else np.float64),
+                       derivs={'t': Vector3(values[k].astype(np.float32))})
+               for k in range(6)]
+    objects += [Scalar(np.arange(3, dtype=np.int16)), Scalar(np.arange(3))]
+
+    packed = Qube.pack(objects)
+    assert len(packed.groups) == 4
+    restored = Qube.unpack(pickle.loads(pickle.dumps(packed)))
+    for (a, b) in zip(restored, objects, strict=True):
+        assert_same(a, b)
+        assert a.values.dtype == b.values.dtype
+        for key in a.derivs:
+            assert a.derivs[key].values.dtype == b.derivs[key].values.dtype
+
+
+def test_qube_ext_packing_empty_and_errors() -> None:
+    """Empty lists are supported and invalid arguments are rejected."""
+
+    assert Qube.unpack(Qube.pack([])) == []
+    assert Qube.unpack(Qube.pack(iter([Scalar(1.)])))[0] == 1.
+
+    with pytest.raises(TypeError):
+        Qube.pack([Scalar(1.), 2.])
+    with pytest.raises(TypeError):
+        Qube.unpack([Scalar(1.)])
@@ -3,12 +3,14 @@
 # Unit tests for Qube pickling operations
 ##########################################################################################
 
+import bz2
+import io
 import numpy as np
 import pytest
 import pickle
 from typing import Any
 
-from polymath import Qube, Scalar, Vector, Vector3, Boolean
+from polymath import Qube, Scalar, Unit, Vector, Vector3, Boolean, Matrix, Pair
 
 
 def test_qube_ext_pickler_test_set_pickle_digits_set_the_desired_number_of_decimal_dig() -> None:
@@ -1344,3 +1346,717 @@ def test_qube_ext_pickler_keeps_the_array_flag_of_a_complete_state() -> None:
     obj = pickle.loads(pickle.dumps(Scalar(np.arange(5.))))
 
     assert obj._is_array is True
+
+
+def test_qube_ext_pickler_raw_digits_skip_encoding() -> None:
+    """The "raw" digits store every array exactly, including the derivatives."""
+
+    np.random.seed(7710)
+
+    mask = np.random.rand(30, 20) < 0.2
+    a = Vector3(np.random.randn(30, 20, 3), mask=mask,
+                derivs={'t': Vector3(np.random.randn(30, 20, 3))})
+    a.set_pickle_digits('raw')
+    assert a.pickle_digits() == ('raw', 'raw')
+
+    state = a.__getstate__()
+    assert state['VALS_ENCODING'] == []
+    assert state['MASK_ENCODING'] == []
+    assert np.shares_memory(state['_values'], a.values)
+
+    b = pickle.loads(pickle.dumps(a))
+    assert np.all(b.values == a.values)
+    assert np.all(b.mask == a.mask)
+    assert np.all(b.d_dt.values == a.d_dt.values)
+    b.values[0, 0, 0] = 99.                 # writable
+
+    ints = Scalar(np.arange(1000).reshape(10, 100))
+    ints.set_pickle_digits('raw')
+    assert np.all(pickle.loads(pickle.dumps(ints)).values == ints.values)
+
+    with pytest.raises(ValueError):
+        a.set_pickle_digits('rawest')
+
+
+def test_qube_ext_pickler_raw_digits_use_out_of_band_buffers() -> None:
+    """Protocol 5 passes the arrays of a "raw" object as out-of-band buffers."""
+
+    np.random.seed(1062)
+
+    a = Scalar(np.random.randn(200, 100), mask=np.random.rand(200, 100) < 0.5,
+               derivs={'t': Scalar(np.random.randn(200, 100))})
+    a.set_pickle_digits('raw')
+
+    buffers = []
+    data = pickle.dumps(a, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 3
+    assert len(data) < 10000
+
+    b = pickle.loads(data, buffers=buffers)
+    assert np.all(b.values == a.values)
+    assert np.all(b.mask == a.mask)
+    assert np.all(b.d_dt.values == a.d_dt.values)
+    assert np.shares_memory(b.values, np.asarray(buffers[0]))
+
+    # Read-only buffers are copied unless the object itself is read-only
+    frozen = [bytes(buffer.raw()) for buffer in buffers]
+    b = pickle.loads(data, buffers=frozen)
+    assert not b.readonly
+    b.values[0, 0] = 1.
+
+    a.as_readonly()
+    data = pickle.dumps(a, protocol=5, buffer_callback=buffers.append)
+    b = pickle.loads(data, buffers=[bytes(buffer.raw()) for buffer in buffers[-3:]])
+    assert b.readonly
+
+
+@pytest.mark.parametrize('digits', ['double', 'single', 10])
+def test_qube_ext_pickler_parallel_workers_match_serial(digits: Any) -> None:
+    """Encoding with a pool of threads gives the same bytes as serial encoding."""
+
+    np.random.seed(5092)
+
+    derivs = {key: Vector3(np.random.randn(40, 50, 3)) for key in 'xyz'}
+    a = Vector3(np.random.randn(40, 50, 3), mask=np.random.rand(40, 50) < 0.2,
+                derivs=derivs)
+    a.set_pickle_digits(digits, 'fpzip' if isinstance(digits, str) else 'mean')
+
+    serial = pickle.dumps(a)
+    try:
+        Qube.set_pickle_workers(4)
+        parallel = pickle.dumps(a)
+        b = pickle.loads(parallel)
+    finally:
+        Qube.set_pickle_workers(1)
+
+    assert parallel == serial
+    c = pickle.loads(serial)
+    assert np.all(b.values == c.values)
+    assert np.all(b.mask == c.mask)
+    for key in 'xyz':
+        assert np.all(b.derivs[key].values == c.derivs[key].values)
+
+    with pytest.raises(ValueError):
+        Qube.set_pickle_workers(0)
+
+
+@pytest.mark.parametrize('codec', ['bz2', 'zlib', 'lzma', 'raw'])
+def test_qube_ext_pickler_codecs_round_trip(codec: str) -> None:
+    """Every codec restores masks, integers, booleans and scaled floats."""
+
+    np.random.seed(4387)
+
+    mask = np.random.rand(30, 40) < 0.3
+    objects = [Scalar(np.random.randint(0, 1000, (30, 40)), mask=mask),
+               Boolean(np.random.rand(30, 40) < 0.5, mask=mask),
+               Vector3(np.random.randn(30, 40, 3), mask=mask,
+                       derivs={'t': Vector3(np.random.randn(30, 40, 3))})]
+    objects[2].set_pickle_digits(8, 'largest')
+
+    for obj in objects:
+        obj.set_pickle_codec(codec)
+        assert obj.pickle_codec() == codec
+
+        state = obj.__getstate__()
+        if codec == 'bz2':
+            assert all(len(encoding) == 3 for encoding in state['MASK_ENCODING'][1:])
+        else:
+            assert state['MASK_ENCODING'][-1][-1] == codec
+
+        restored = pickle.loads(pickle.dumps(obj))
+        assert np.all(restored.mask == obj.mask)
+        if obj.is_float():
+            assert np.allclose(restored.values[obj.antimask], obj.values[obj.antimask],
+                               atol=1.e-6)
+            assert np.allclose(restored.d_dt.values[obj.antimask],
+                               obj.d_dt.values[obj.antimask], atol=1.e-6)
+        else:
+            assert np.all(restored.values[obj.antimask] == obj.values[obj.antimask])
+
+
+def test_qube_ext_pickler_default_codec_and_registry() -> None:
+    """The default codec applies to objects without their own, and new codecs can be
+    registered."""
+
+    a = Scalar(np.arange(1000) % 7, mask=np.arange(1000) % 5 == 0)
+    old_bytes = pickle.dumps(a)
+
+    try:
+        Qube.set_default_pickle_codec('zlib')
+        assert a.pickle_codec() == 'zlib'
+        assert pickle.dumps(a) != old_bytes
+        b = pickle.loads(pickle.dumps(a))
+        assert np.all(b.values[a.antimask] == a.values[a.antimask])
+
+        calls = []
+
+        def compress(data):
+            calls.append('compress')
+            return bytes(data)[::-1]
+
+        def decompress(data):
+            calls.append('decompress')
+            return data[::-1]
+
+        Qube.register_pickle_codec('reverse', compress, decompress)
+        a.set_pickle_codec('reverse')
+        b = pickle.loads(pickle.dumps(a))
+        assert np.all(b.values[a.antimask] == a.values[a.antimask])
+        assert 'compress' in calls
+        assert 'decompress' in calls
+
+    finally:
+        Qube.set_default_pickle_codec('bz2')
+
+    # Objects that use BZ2 pickle exactly as before
+    a.set_pickle_codec(None)
+    assert pickle.dumps(a) == old_bytes
+
+    with pytest.raises(ValueError):
+        a.set_pickle_codec('gzip')
+    with pytest.raises(ValueError):
+        Qube.set_default_pickle_codec(['bz2'])
+
+
+def test_qube_ext_pickler_lazy_decoding() -> None:
+    """Lazily unpickled objects decode each array on first use and match eager ones."""
+
+    np.random.seed(4417)
+
+    v = Vector3(np.random.randn(30, 20, 3), mask=np.random.rand(30, 20) < 0.3,
+                derivs={'t': Vector3(np.random.randn(30, 20, 3)),
+                        'xy': Vector3(np.random.randn(30, 20, 3, 2), drank=1)})
+    data = pickle.dumps(v)
+    eager = pickle.loads(data)
+
+    try:
+        Qube.set_pickle_lazy(True)
+        lazy = pickle.loads(data)
+    finally:
+        Qube.set_pickle_lazy(False)
+
+    # Nothing is decoded yet
+    assert lazy.shape == (30, 20)
+    assert '_values' not in vars(lazy)
+    assert '_mask' not in vars(lazy)
+    assert '_values' not in vars(lazy.d_dt)
+
+    # One derivative decodes the parent mask but not the parent values
+    assert np.all(lazy.d_dt.values == eager.d_dt.values)
+    assert '_values' not in vars(lazy)
+    assert '_values' not in vars(lazy.d_dxy)
+    assert lazy.d_dt.mask is lazy.mask
+
+    assert np.all(lazy.values == eager.values)
+    assert np.all(lazy.mask == eager.mask)
+    assert '_lazy_state' not in vars(lazy)
+    assert np.all(lazy.d_dxy.values == eager.d_dxy.values)
+
+    # Lazy objects pickle again like any other
+    assert pickle.dumps(lazy) == pickle.dumps(eager)
+
+
+def test_qube_ext_pickler_lazy_decoding_other_objects() -> None:
+    """Read-only, unmasked, shapeless and fully masked objects unpickle lazily."""
+
+    objects = [Scalar(np.arange(500.), mask=np.arange(500) % 3 == 0).as_readonly(),
+               Scalar(np.arange(500) % 11),
+               Scalar(7.5, derivs={'t': Scalar(2.)}),
+               Boolean(np.arange(300) % 2 == 0, mask=True)]
+
+    try:
+        Qube.set_pickle_lazy(True)
+        restored = [pickle.loads(pickle.dumps(obj)) for obj in objects]
+    finally:
+        Qube.set_pickle_lazy(False)
+
+    for obj, lazy in zip(objects, restored, strict=True):
+        assert type(lazy) is type(obj)
+        assert lazy.readonly == obj.readonly
+        assert np.all(lazy.mask == obj.mask)
+        assert np.all((lazy.values == obj.values) | obj.mask)
+        if obj.readonly:
+            assert not lazy.values.flags['WRITEABLE']
+        for key in obj.derivs:
+            assert lazy.derivs[key] == obj.derivs[key]
+
+    with pytest.raises(AttributeError):
+        Scalar._values.__get__(Scalar.__new__(Scalar))
+
+
+def test_qube_ext_pickler_dump_many_shares_masks() -> None:
+    """Objects with identical masks pickled together store the mask once."""
+
+    np.random.seed(8803)
+
+    mask = np.random.rand(40, 50) < 0.2
+    objects = {'a': Scalar(np.random.randn(40, 50), mask=mask).as_readonly(),
+               'b': Vector3(np.random.randn(40, 50, 3), mask=mask,
+                            derivs={'t': Vector3(np.random.randn(40, 50, 3))}),
+               'c': Scalar(np.arange(2000).reshape(40, 50), mask=mask.copy()),
+               'd': Scalar(np.random.randn(40, 50), mask=np.random.rand(40, 50) < 0.2),
+               'e': Scalar(np.random.randn(40, 50)).as_readonly(),
+               'n': 17}
+
+    f = io.BytesIO()
+    Qube.dump_many(objects, f)
+    f.seek(0)
+    (_, entries) = pickle.load(f)
+    assert len(entries) == 2
+
+    f.seek(0)
+    loaded = Qube.load_many(f)
+    expected = pickle.loads(pickle.dumps(objects))
+    assert loaded['n'] == 17
+    for key in 'abcde':
+        assert np.all(loaded[key].mask == expected[key].mask)
+        assert np.all(loaded[key].values == expected[key].values)
+        assert loaded[key].readonly == expected[key].readonly
+    assert np.all(loaded['b'].d_dt.values == expected['b'].d_dt.values)
+    assert loaded['b'].d_dt.mask is loaded['b'].mask
+
+    # The writable object has its own copy of the shared mask
+    assert not loaded['a'].mask.flags['WRITEABLE']
+    assert loaded['b'].mask.flags['WRITEABLE']
+    assert loaded['b'].mask is not loaded['a'].mask
+
+    # Lazily unpickled objects decode the shared mask after loading
+    f.seek(0)
+    try:
+        Qube.set_pickle_lazy(True)
+        lazy = Qube.load_many(f)
+    finally:
+        Qube.set_pickle_lazy(False)
+    assert np.all(lazy['c'].values == loaded['c'].values)
+    assert np.all(lazy['b'].d_dt.values == loaded['b'].d_dt.values)
+
+
+def test_qube_ext_pickler_dump_many_workers() -> None:
+    """Batches are written identically and read back with any number of workers."""
+
+    np.random.seed(4470)
+
+    # The objects are unmasked, so the derivatives keep masks of their own, which are
+    # shared and are encoded in the pool threads
+    deriv_mask = np.random.rand(30, 40) < 0.1
+    objects = []
+    for _ in range(3):
+        derivs = {key: Scalar(np.random.randn(30, 40), mask=deriv_mask.copy())
+                  for key in 'xyz'}
+        objects.append(Scalar(np.random.randn(30, 40), derivs=derivs))
+
+    files = {}
+    try:
+        for workers in (1, 4):
+            Qube.set_pickle_workers(workers)
+            f = io.BytesIO()
+            Qube.dump_many(objects, f)
+            files[workers] = f.getvalue()
+
+        assert files[1] == files[4]
+        expected = pickle.loads(pickle.dumps(objects))
+        for (write, read) in ((1, 4), (4, 1)):
+            Qube.set_pickle_workers(read)
+            loaded = Qube.load_many(io.BytesIO(files[write]))
+            for (a, b) in zip(loaded, expected, strict=True):
+                assert np.all(a.mask == b.mask)
+                assert np.all(a.values == b.values)
+                for key in 'xyz':
+                    assert np.all(a.derivs[key].mask == b.derivs[key].mask)
+                    assert np.all(a.derivs[key].values == b.derivs[key].values)
+    finally:
+        Qube.set_pickle_workers(1)
+
+
+def test_qube_ext_pickler_load_many_errors() -> None:
+    """Only files written by dump_many() can be loaded by load_many()."""
+
+    a = Scalar(np.arange(1000.), mask=np.arange(1000) % 3 == 0)
+
+    f = io.BytesIO()
+    pickle.dump(a, f)
+    f.seek(0)
+    with pytest.raises(ValueError):
+        Qube.load_many(f)
+
+    f = io.BytesIO()
+    Qube.dump_many([a], f)
+    f.seek(0)
+    pickle.load(f)
+    with pytest.raises(ValueError):
+        pickle.load(f)
+
+
+def test_qube_ext_pickler_delta_encoding() -> None:
+    """Objects pickled as differences from a reference decode to the usual values."""
+
+    np.random.seed(6021)
+
+    (y, x) = np.mgrid[:60, :80] / 80.
+    mask = (x - 0.5)**2 + (y - 0.4)**2 > 0.1
+    reference = Scalar(np.sin(3. * x) * np.cos(2. * y), mask=mask)
+    reference.set_pickle_digits(7, 'fpzip')
+    frame = Scalar(np.sin(3. * x + 0.001) * np.cos(2. * y), mask=mask)
+    frame.set_pickle_digits(8, 1.)
+    expected = pickle.loads(pickle.dumps(frame))
+
+    # A reference object is pickled once along with the frames
+    frame.set_pickle_delta(reference)
+    data = pickle.dumps([reference, frame])
+    assert len(data) < len(pickle.dumps([reference, expected]))
+    (_, restored) = pickle.loads(data)
+    assert np.all(restored.mask == frame.mask)
+    assert np.allclose(restored.values[frame.antimask], frame.values[frame.antimask],
+                       rtol=0., atol=1.e-8)
+
+    # A named reference is not pickled, and must be registered to unpickle
+    try:
+        Qube.register_pickle_delta('frame0', reference)
+        frame.set_pickle_delta('frame0')
+        data = pickle.dumps(frame)
+        assert len(data) < len(pickle.dumps(expected))
+        restored = pickle.loads(data)
+        assert np.allclose(restored.values[frame.antimask],
+                           frame.values[frame.antimask], rtol=0., atol=1.e-8)
+    finally:
+        Qube.register_pickle_delta('frame0', None)
+
+    with pytest.raises(ValueError):
+        pickle.loads(data)
+    with pytest.raises(ValueError):
+        frame.set_pickle_delta('frame0')
+    with pytest.raises(ValueError):
+        frame.set_pickle_delta(frame)
+    with pytest.raises(TypeError):
+        frame.set_pickle_delta(7)
+
+
+def test_qube_ext_pickler_delta_encoding_sizes() -> None:
+    """Frames pickled separately shrink only with a named reference."""
+
+    (y, x) = np.mgrid[:120, :160] / 160.
+    reference = Scalar(np.sin(3. * x) * np.cos(2. * y))
+    frames = [Scalar(np.sin(3. * x + 0.001 * k) * np.cos(2. * y)) for k in range(1, 6)]
+    for frame in frames:
+        frame.set_pickle_digits(6, 1.)
+
+    plain = sum(len(pickle.dumps(frame)) for frame in frames)
+
+    try:
+        Qube.register_pickle_delta('frame0', reference)
+        for frame in frames:
+            frame.set_pickle_delta('frame0')
+        named = sum(len(pickle.dumps(frame)) for frame in frames)
+    finally:
+        Qube.register_pickle_delta('frame0', None)
+
+    assert named < 0.8 * plain
+
+    # An object reference is carried by every separate pickle
+    for frame in frames:
+        frame.set_pickle_delta(reference)
+    separate = sum(len(pickle.dumps(frame)) for frame in frames)
+    assert separate > plain
+
+    # ...but stored once when the frames are pickled together
+    together = len(pickle.dumps(frames))
+    assert together < 0.5 * separate
+    assert together < len(pickle.dumps(reference)) + 1.1 * named
+
+
+def test_qube_ext_pickler_delta_encoding_is_exact() -> None:
+    """Lossless and integer delta encodings reproduce the values exactly."""
+
+    np.random.seed(3310)
+
+    reference = Vector3(np.random.randn(30, 40, 3))
+    frame = Vector3(reference.values + 1.e-3 * np.random.randn(30, 40, 3))
+    frame.set_pickle_delta(reference)
+    (_, restored) = pickle.loads(pickle.dumps([reference, frame]))
+    assert np.all(restored.values == frame.values)
+
+    ids = Scalar(np.random.randint(0, 1000, (50, 50)))
+    changed = Scalar(ids.values + (np.random.rand(50, 50) < 0.01))
+    changed.set_pickle_delta(ids)
+    state = changed.__getstate__()
+    assert state['VALS_ENCODING'][0][0] == 'DELTA'
+    (_, restored) = pickle.loads(pickle.dumps([ids, changed]))
+    assert np.all(restored.values == changed.values)
+
+    # An incompatible reference is ignored, and then not pickled
+    other = Scalar(np.random.randint(0, 1000, (10, 10)))
+    changed.set_pickle_delta(other)
+    state = changed.__getstate__()
+    assert not state['VALS_ENCODING'] or state['VALS_ENCODING'][0][0] != 'DELTA'
+    assert '_pickle_delta' not in state
+    assert np.all(pickle.loads(pickle.dumps(changed)).values == changed.values)
+
+    changed.set_pickle_delta(None)
+    assert not hasattr(changed, '_pickle_delta')
+
+
+@pytest.mark.parametrize('digits', [1, 3, 4.5, 6])
+@pytest.mark.parametrize('reference', ['fpzip', 'smallest', 'largest', 'mean', 'median',
+                                       'logmean', 10.])
+def test_qube_ext_pickler_low_digits_error_bounds(digits: float, reference: Any) -> None:
+    """Digits below single precision honor the documented error bounds."""
+
+    np.random.seed(7102)
+
+    (y, x) = np.mgrid[:120, :150] / 150.
+    values = np.exp(3. * np.sin(5. * x) * np.cos(4. * y))
+    values *= np.where(np.random.rand(120, 150) < 0.5, -1., 1.)
+    vectors = np.stack([values, 2. * values + 1., np.cos(values)], axis=-1)
+
+    for obj in (Scalar(values), Vector3(vectors, mask=np.random.rand(120, 150) < 0.1)):
+        obj.set_pickle_digits(digits, reference)
+        assert obj.pickle_digits()[0] == digits
+
+        restored = pickle.loads(pickle.dumps(obj))
+        original = obj.values[obj.antimask]
+        error = np.abs(restored.values[obj.antimask] - original)
+
+        # Each item component is encoded separately, so its bound is referenced to
+        # that component alone
+        for k in range(np.shape(original)[-1] if obj.rank else 1):
+            component = original[..., k] if obj.rank else original
+            err = error[..., k] if obj.rank else error
+            abs_values = np.abs(component)
+            if reference == 'fpzip':
+                assert np.all(err < 10.**(-digits) * abs_values)
+                continue
+
+            ref_value = {'smallest': np.min(abs_values),
+                         'largest': np.max(abs_values),
+                         'mean': np.mean(abs_values),
+                         'median': np.median(abs_values),
+                         'logmean': np.exp(np.mean(np.log(abs_values)))
+                         }.get(reference, reference)
+            assert np.all(err <= 0.5 * 10.**(-digits) * ref_value * (1. + 1.e-9))
+
+    # A few digits take less space than single precision
+    if digits > 3:
+        return
+
+    a = Scalar(values)
+    a.set_pickle_digits(digits, reference)
+    b = Scalar(values)
+    b.set_pickle_digits('single')
+    assert len(pickle.dumps(a)) < len(pickle.dumps(b))
+
+
+def test_qube_ext_pickler_digits_are_clamped() -> None:
+    """Numbers of digits are limited to the range fpzip supports."""
+
+    a = Scalar(np.arange(1000.))
+    a.set_pickle_digits(0.2, 'largest')
+    assert a.pickle_digits() == (1., 1.)
+    a.set_pickle_digits(20, 'fpzip')
+    assert a.pickle_digits()[0] == pytest.approx(np.log10(2**52))
+
+    # A numeric reference leaves the digits as given
+    a.set_pickle_digits(0.5, 1000.)
+    assert a.pickle_digits() == (0.5, 0.5)
+
+
+def test_qube_ext_pickler_run_length_masks() -> None:
+    """Masks are run-length encoded when that is smaller than packed bits."""
+
+    from polymath.extensions import pickler
+
+    np.random.seed(2718)
+
+    (y, x) = np.mgrid[:300, :400] / 300.
+    r2 = (x - 0.6)**2 + (y - 0.5)**2
+    values = np.random.randn(300, 400)
+    masks = {'disk': r2 > 0.1,
+             'ring': (r2 < 0.05) | (r2 > 0.15),
+             'sparse': np.random.rand(300, 400) < 0.001,
+             'stripes': np.arange(400) % 200 < 3 + np.zeros((300, 1), dtype='int'),
+             'noise': np.random.rand(300, 400) < 0.5}
+
+    for (name, mask) in masks.items():
+        a = Scalar(values, mask=mask)
+        state = a.__getstate__()
+        methods = [encoding[0] for encoding in state['MASK_ENCODING']]
+        if name in ('disk', 'ring'):
+            assert 'RLE' in methods
+        if name == 'noise':
+            assert 'BOOL' in methods
+
+        # Whichever encoding is chosen is the smaller
+        trimmed = mask[a._slicer]
+        assert len(state['_mask']) <= len(bz2.compress(np.packbits(trimmed)))
+        runs = pickler._encode_runs(trimmed)
+        assert runs is None or len(state['_mask']) <= len(runs[0])
+
+        b = pickle.loads(pickle.dumps(a))
+        assert np.all(b.mask == mask)
+        assert b.mask.flags['WRITEABLE']
+        assert np.all(b.values[~mask] == values[~mask])
+
+        # With another codec
+        a.set_pickle_codec('zlib')
+        assert np.all(pickle.loads(pickle.dumps(a)).mask == mask)
+
+    # A disk's runs take far less space than its packed and compressed bits
+    state = Scalar(values, mask=masks['disk']).__getstate__()
+    assert len(state['_mask']) < 0.5 * len(bz2.compress(np.packbits(masks['disk'])))
+
+
+def test_qube_ext_pickler_small_objects() -> None:
+    """Shapeless and small objects take the compact path and round-trip exactly."""
+
+    np.random.seed(5150)
+
+    objects = [Scalar(1.5), Scalar(7), Scalar(-2., mask=True), Boolean(True),
+               Scalar(3., unit=Unit.KM, derivs={'t': Scalar(0.5, unit=Unit.KM / Unit.S)}),
+               Vector3(np.random.randn(10, 3), mask=np.random.rand(10) < 0.5),
+               Vector(np.random.randn(4, 2, 3), drank=1),
+               Scalar(np.arange(12).reshape(3, 4), unit=Unit.DEG),
+               Scalar(np.random.randn(5)).as_readonly(),
+               Scalar(np.random.randn(6), derivs={'xy': Scalar(np.random.randn(6, 2),
+                                                               drank=1)})]
+    for obj in objects:
+        assert len(obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)) == 2   # no state
+
+        copy = pickle.loads(pickle.dumps(obj))
+        assert type(copy) is type(obj)
+        assert copy.shape == obj.shape
+        assert copy.item == obj.item
+        assert copy.denom == obj.denom
+        assert copy.unit_ == obj.unit_
+        assert copy.readonly == obj.readonly
+        assert np.all(copy.mask == obj.mask)
+        assert np.all(copy.values == obj.values)
+        assert np.all(copy.default == obj.default)
+        assert set(copy.derivs) == set(obj.derivs)
+        for key, deriv in obj.derivs.items():
+            assert np.all(getattr(copy, 'd_d' + key).values == deriv.values)
+
+        # The result is fully usable
+        assert np.all((copy + copy).values == (obj + obj).values)
+        if not copy.readonly:
+            copy[...] = copy.default
+            copy = pickle.loads(pickle.dumps(obj))
+
+    # The compact state is smaller than the full one
+    assert len(pickle.dumps(Scalar(1.5))) < 0.5 * len(pickle.dumps(Scalar(1.5).__dict__))
+
+    # Read-only arrays stay read-only
+    copy = pickle.loads(pickle.dumps(objects[8]))
+    assert not copy.values.flags['WRITEABLE']
+
+
+def _assert_same_attributes(a, b) -> None:
+    """Two objects have the same attributes, with equal values apart from their arrays,
+    caches and derivatives."""
+
+    assert set(vars(a)) == set(vars(b))
+    for (name, value) in vars(a).items():
+        if name in ('_values', '_mask', '_default', '_cache', '_derivs'):
+            assert np.all(value == vars(b)[name])
+        elif name.startswith('d_d'):
+            _assert_same_attributes(value, vars(b)[name])
+        else:
+            assert value == vars(b)[name], name
+
+
+def test_qube_ext_pickler_small_objects_attributes() -> None:
+    """The compact path restores every attribute that the constructor sets."""
+
+    np.random.seed(4021)
+
+    objects = [Scalar(1.5), Scalar(np.arange(4), unit=Unit.KM),
+               Scalar(np.random.randn(5), mask=np.random.rand(5) < 0.5,
+                      derivs={'t': Scalar(np.random.randn(5))}),
+               Vector3(np.random.randn(6, 3), derivs={'t': Vector3(np.random.randn(6, 3))}),
+               Vector3(np.random.randn(3)).as_readonly(),
+               Boolean(True), Boolean(np.random.rand(7) < 0.5),
+               Matrix(np.random.randn(2, 3, 3)), Matrix(np.random.randn(2, 3), mask=True),
+               Pair(np.random.randn(4, 2), drank=0, unit=Unit.DEG),
+               Pair(np.random.randn(4, 2, 3), drank=1)]
+
+    for obj in objects:
+        assert len(obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)) == 2   # compact path
+        copy = pickle.loads(pickle.dumps(obj))
+
+        built = type(obj)(obj.values, obj.mask, drank=obj.drank, unit=obj.unit_,
+                          derivs=obj.derivs)
+        if obj.readonly:
+            built.as_readonly()
+
+        _assert_same_attributes(copy, built)
+
+
+def test_qube_ext_pickler_small_objects_standard_path() -> None:
+    """Objects that the compact path cannot describe use the full state."""
+
+    large = Scalar(np.arange(1000.))
+    a = Scalar(np.arange(10.))
+    a.set_pickle_digits(3, 1.)
+    b = Scalar(2.).add_attr('label', 'target')
+    for obj in (large, a, b):
+        assert len(obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)) > 2    # with state
+
+    assert pickle.loads(pickle.dumps(a)).pickle_digits() == (3, 3)
+    assert pickle.loads(pickle.dumps(b)).label == 'target'
+    assert np.all(pickle.loads(pickle.dumps(large)).values == large.values)
+
+
+def test_qube_ext_pickler_auto_reference() -> None:
+    """The reference "auto" picks the most compact method that keeps the digits."""
+
+    np.random.seed(1618)
+
+    (y, x) = np.mgrid[:300, :400] / 400.
+    smooth = Scalar(np.sin(3. * x) * np.cos(2. * y) + 2.,
+                    derivs={'t': Scalar(np.cos(3. * x) * np.cos(2. * y) + 2.)})
+    offset = Scalar(1000. + np.round(np.random.rand(300, 400) * 100.) / 100.)
+
+    for (obj, expected) in ((smooth, 'fpzip'), (offset, 'smallest')):
+        obj.set_pickle_digits(5, 'auto')
+        state = obj.__getstate__()
+        assert state['VALS_ENCODING'][-1] == ('FLOAT', 5., expected)
+
+        other = obj.copy()
+        other.set_pickle_digits(5, 'fpzip' if expected == 'smallest' else 'smallest')
+        assert len(pickle.dumps(obj)) <= len(pickle.dumps(other))
+
+        # Every value keeps its digits
+        copy = pickle.loads(pickle.dumps(obj))
+        assert np.all(np.abs(copy.values - obj.values) < 1.e-5 * np.abs(obj.values))
+        for key in obj.derivs:
+            error = copy.derivs[key].values - obj.derivs[key].values
+            assert np.all(np.abs(error) < 1.e-5 * np.abs(obj.derivs[key].values))
+
+    # Only digits need a choice
+    offset.set_pickle_digits('double', 'auto')
+    assert np.all(pickle.loads(pickle.dumps(offset)).values == offset.values)
+
+    with pytest.raises(ValueError):
+        offset.set_pickle_digits(5, 'best')
+
+
+def test_qube_ext_pickler_auto_budget() -> None:
+    """A time budget excludes slow methods; without any affordable, the fastest wins."""
+
+    np.random.seed(3141)
+
+    offset = Scalar(1000. + np.round(np.random.rand(300, 400) * 100.) / 100.)
+    offset.set_pickle_digits(5, 'auto')
+    try:
+        Qube.set_pickle_auto_budget(1.e-9)
+        method = offset.__getstate__()['VALS_ENCODING'][-1]
+        assert method[2] == 'fpzip'         # lossy or single precision, never scaled
+        assert np.all(np.abs(pickle.loads(pickle.dumps(offset)).values - offset.values)
+                      < 1.e-5 * offset.values)
+
+        Qube.set_pickle_auto_budget(1.e6)
+        assert offset.__getstate__()['VALS_ENCODING'][-1] == ('FLOAT', 5., 'smallest')
+
+        for budget in (0., -1., 'fast'):
+            with pytest.raises(ValueError):
+                Qube.set_pickle_auto_budget(budget)
+    finally:
+        Qube.set_pickle_auto_budget(None)
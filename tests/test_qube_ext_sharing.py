@@ -0,0 +1,80 @@
+##########################################################################################
+# tests/test_qube_ext_sharing.py
+#
+# Unit tests for shared-memory transport with Qube.to_shared() and Qube.from_shared()
+##########################################################################################
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from polymath import Boolean, Qube, Scalar, Unit, Vector3
+from polymath.extensions.sharing import SharedQube
+
+from tests.qube_helpers import assert_same
+
+
+def _worker(handle):
+    """Sum of an object shared with another process."""
+
+    return Qube.from_shared(handle).norm().sum().vals
+
+
+def test_qube_ext_sharing_round_trip() -> None:
+    """Shared objects match the original and are read-only views."""
+
+    np.random.seed(9034)
+
+    v = Vector3(np.random.randn(5, 7, 3), mask=np.random.rand(5, 7) < 0.3,
+                unit=Unit.KM,
+                derivs={'t': Vector3(np.random.randn(5, 7, 3), unit=Unit.KM / Unit.S),
+                        'x': Vector3(np.random.randn(5, 7, 3, 2), drank=1)})
+    handle = v.to_shared()
+    try:
+        assert isinstance(handle, SharedQube)
+        copy = Qube.from_shared(handle)
+        assert_same(copy, v, readonly=False)
+        assert copy.readonly
+        assert copy.d_dt.readonly
+
+        # A pickled handle is small and attaches to the same memory
+        state = pickle.dumps(handle)
+        assert len(state) < 1000
+        other = Qube.from_shared(pickle.loads(state))
+        assert_same(other, v, readonly=False)
+        assert not other.values.flags['OWNDATA']
+    finally:
+        handle.unlink()
+
+    # Objects outlive the handle
+    assert_same(copy, v, readonly=False)
+
+
+def test_qube_ext_sharing_shapeless_and_booleans() -> None:
+    """Shapeless objects and Booleans with scalar masks are supported."""
+
+    for obj in (Scalar(3.5, unit=Unit.DEG), Scalar(2, mask=True),
+                Boolean([True, False, True]), Scalar(np.arange(6).reshape(2, 3))):
+        handle = obj.to_shared()
+        assert_same(Qube.from_shared(handle), obj, readonly=False)
+        handle.unlink()
+
+    with pytest.raises(TypeError):
+        Qube.from_shared(Scalar(1.))
+
+
+def test_qube_ext_sharing_process_pool() -> None:
+    """A worker process attaches to the shared object."""
+
+    np.random.seed(1234)
+
+    v = Vector3(np.random.randn(100, 3))
+    handle = v.to_shared()
+    try:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(_worker, handle).result()
+        assert result == pytest.approx(v.norm().sum().vals)
+    finally:
+        handle.unlink()
@@ -5,6 +5,7 @@
 ##########################################################################################
 
 import numpy as np
+import pytest
 
 from polymath import Boolean, Qube, Scalar, Vector, Vector3
 
@@ -1325,4 +1326,142 @@ def test_qube_ext_shrinker_test_unshrink_with_derivatives_3() -> None:
         assert c.d_dt.d_ds.shape == a.shape
 
 
+
+def test_qube_ext_shrinker_auto_shrink() -> None:
+    """Operations under the auto-shrink policy match the same operations without it."""
+
+    np.random.seed(4107)
+
+    mask = np.random.rand(60, 50) < 0.8
+    a = Scalar(np.random.rand(60, 50) + 0.5, mask=mask,
+               derivs={'t': Scalar(np.random.randn(60, 50), mask=mask)})
+    b = Scalar(np.random.rand(60, 50) + 0.5, mask=np.random.rand(60, 50) < 0.2)
+    v = Vector3(np.random.randn(60, 50, 3), mask=mask)
+
+    operations = [lambda: a + b, lambda: 2. - a, lambda: a * b, lambda: v * a,
+                  lambda: v / b, lambda: -v, lambda: a ** 2, lambda: a.sin(),
+                  lambda: a.sqrt(), lambda: a.arctan2(b), lambda: a.as_readonly().log(),
+                  lambda: a + Scalar(3.), lambda: a + Scalar(np.ones((2, 60, 50)))]
+
+    try:
+        for operation in operations:
+            Qube.set_auto_shrink(None)
+            expected = operation()
+            Qube.set_auto_shrink(0.5)
+            result = operation()
+
+            assert type(result) is type(expected)
+            assert result.shape == expected.shape
+            assert result.readonly == expected.readonly
+            assert np.all(result.mask == expected.mask)
+            antimask = result.antimask
+            assert np.allclose(result.values[antimask], expected.values[antimask])
+            assert set(result.derivs) == set(expected.derivs)
+            for key in result.derivs:
+                assert np.allclose(result.derivs[key].values[antimask],
+                                   expected.derivs[key].values[antimask])
+
+        # Masked elements hold the default value
+        Qube.set_auto_shrink(0.5)
+        assert np.all(a.sin().values[mask] == 1.)
+
+        # Operands below the threshold are not shrunk
+        Qube.set_auto_shrink(0.9)
+        assert np.all((a + b).values == a.values + b.values)
+    finally:
+        Qube.set_auto_shrink(None)
+
+    for threshold in (1., -0.1, True, '0.5'):
+        with pytest.raises(ValueError):
+            Qube.set_auto_shrink(threshold)
+
+
+
+def test_qube_ext_shrinker_auto_shrink_corners() -> None:
+    """Operations on a compact unmasked region are computed inside its corners."""
+
+    np.random.seed(7781)
+
+    (y, x) = np.mgrid[:100, :120]
+    mask = (x - 70)**2 + (y - 40)**2 > 15**2
+    a = Scalar(np.random.rand(100, 120) + 0.5, mask=mask,
+               derivs={'t': Scalar(np.random.randn(100, 120), mask=mask)})
+    b = Scalar(np.random.randn(100, 120), mask=mask)
+    v = Vector3(np.random.randn(100, 120, 3))
+
+    try:
+        for operation in (lambda: a.sin(), lambda: a * b + a, lambda: v * a,
+                          lambda: (b - 0.5).log(), lambda: -a.as_readonly()):
+            Qube.set_auto_shrink(None)
+            expected = operation()
+            Qube.set_auto_shrink(0.5)
+            result = operation()
+
+            assert result.shape == expected.shape
+            assert result.readonly == expected.readonly
+            assert np.all(result.mask == expected.mask)
+            antimask = result.antimask
+            assert np.allclose(result.values[antimask], expected.values[antimask])
+            assert result.corners == result._find_corners()
+
+        # Corners pass from operand to result without being searched again
+        Qube.set_auto_shrink(0.5)
+        result = a.sin()
+        assert result._cache['corners'] == a.corners
+        assert np.allclose(result.d_dt.values[~mask], (a.cos() * a.d_dt).values[~mask])
+
+        # A log of negative values masks more, so its corners are found anew
+        assert 'corners' not in b.log()._cache
+    finally:
+        Qube.set_auto_shrink(None)
+
+
+def test_qube_ext_shrinker_shrunk_context() -> None:
+    """Qube.shrunk() shares one antimask across inputs, results and derivatives."""
+
+    np.random.seed(5214)
+
+    antimask = np.random.rand(40, 30) < 0.3
+    mask = np.random.rand(40, 30) < 0.1
+    a = Scalar(np.random.rand(40, 30) + 0.5, mask=mask,
+               derivs={'t': Scalar(np.random.randn(40, 30), mask=mask)})
+    v = Vector3(np.random.randn(30, 3))
+
+    with Qube.shrunk(antimask) as s:
+        (sa, sv, number) = s.wrap(a, v, 2.)
+        assert sa.shape == (np.sum(antimask),)
+        assert sv.shape == sa.shape
+        assert number == 2.
+        assert s.wrap(Scalar(3.)) == Scalar(3.)
+
+        (c, w) = s.unwrap(sa.sqrt() * number, sv * sa)
+        assert s.unwrap(Scalar(3.)) == Scalar(3.)
+
+    expected = (a.sqrt() * 2.).mask_where(~antimask)
+    assert c.shape == a.shape
+    assert np.all(c.mask == expected.mask)
+    assert np.allclose(c.values[c.antimask], expected.values[c.antimask])
+    assert np.allclose(c.d_dt.values[c.antimask], expected.d_dt.values[c.antimask])
+    assert np.all(c.values[~antimask] == 1.)
+
+    expected = (v * a).mask_where(~antimask)
+    assert np.all(w.mask == expected.mask)
+    assert np.allclose(w.values[w.antimask], expected.values[w.antimask])
+
+    # The plan is released on exit
+    with pytest.raises(ValueError):
+        s.wrap(a)
+    with pytest.raises(ValueError):
+        s.unwrap(c)
+
+    with Qube.shrunk(antimask) as s:
+        with pytest.raises(ValueError):
+            s.wrap(Scalar(np.ones(7)))
+        with pytest.raises(ValueError):
+            s.unwrap(Scalar(np.ones(7)))
+
+    with pytest.raises(ValueError):
+        Qube.shrunk(True)
+
+
 ##########################################################################################
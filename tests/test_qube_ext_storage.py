@@ -0,0 +1,79 @@
+##########################################################################################
+# tests/test_qube_ext_storage.py
+#
+# Unit tests for memory-mapped storage with Qube.save() and Qube.load()
+##########################################################################################
+
+import numpy as np
+import pytest
+
+from polymath import Boolean, Qube, Scalar, Unit, Vector3
+
+from tests.qube_helpers import assert_same
+
+
+def test_qube_ext_storage_round_trip(tmp_path) -> None:
+    """Saved objects load as read-only memory maps."""
+
+    np.random.seed(3391)
+
+    v = Vector3(np.random.randn(40, 30, 3), mask=np.random.rand(40, 30) < 0.3,
+                unit=Unit.KM,
+                derivs={'t': Vector3(np.random.randn(40, 30, 3), unit=Unit.KM / Unit.S),
+                        'xy': Vector3(np.random.randn(40, 30, 3, 2), drank=1)})
+    path = tmp_path / 'v.qube'
+    v.save(path)
+
+    loaded = Qube.load(path)
+    assert_same(loaded, v, readonly=False)
+    assert loaded.readonly
+    assert loaded.d_dxy.readonly
+    assert isinstance(loaded.values, np.memmap)
+    assert isinstance(loaded.d_dt.values, np.memmap)
+    assert loaded.values.offset % 64 == 0
+
+    # Random access to a few rows
+    assert_same(loaded[7:9], v[7:9], readonly=False)
+
+    loaded = Qube.load(str(path), mmap_mode=None)
+    assert_same(loaded, v, readonly=False)
+    assert not loaded.readonly
+    assert not isinstance(loaded.values, np.memmap)
+
+
+def test_qube_ext_storage_copy_on_write(tmp_path) -> None:
+    """Copy-on-write objects can be modified without changing the file."""
+
+    a = Scalar(np.arange(10.))
+    path = tmp_path / 'a.qube'
+    a.save(path)
+
+    loaded = Qube.load(path, mmap_mode='c')
+    assert not loaded.readonly
+    loaded[3] = -1.
+    assert loaded.values[3] == -1.
+    assert_same(Qube.load(path), a, readonly=False)
+
+
+def test_qube_ext_storage_other_objects(tmp_path) -> None:
+    """Shapeless objects, Booleans and empty objects are supported."""
+
+    path = tmp_path / 'x.qube'
+    for obj in (Scalar(2.5, unit=Unit.DEG), Scalar(7, mask=True),
+                Boolean([True, False, True], mask=[False, True, False]),
+                Scalar(np.zeros((0, 4))), Vector3(np.ones((3, 3)), mask=True)):
+        obj.save(path)
+        assert_same(Qube.load(path), obj, readonly=False)
+
+
+def test_qube_ext_storage_errors(tmp_path) -> None:
+    """Invalid files and modes are rejected."""
+
+    path = tmp_path / 'bad.qube'
+    path.write_bytes(b'not a qube file')
+    with pytest.raises(ValueError):
+        Qube.load(path)
+
+    Scalar(1.).save(path)
+    with pytest.raises(ValueError):
+        Qube.load(path, mmap_mode='r+')
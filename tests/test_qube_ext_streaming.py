@@ -0,0 +1,96 @@
+##########################################################################################
+# tests/test_qube_ext_streaming.py
+#
+# Unit tests for streaming pickles with Qube.dump_blocks(), Qube.iter_blocks() and
+# Qube.load_blocks()
+##########################################################################################
+
+import io
+import pickle
+
+import numpy as np
+import pytest
+
+from polymath import Boolean, Qube, Scalar, Unit, Vector3
+
+from tests.qube_helpers import assert_same
+
+
+def test_qube_ext_streaming_round_trip() -> None:
+    """Objects written in blocks are read back whole or one block at a time."""
+
+    np.random.seed(6120)
+
+    mask = np.random.rand(50, 30) < 0.3
+    v = Vector3(np.random.randn(50, 30, 3), mask=mask, unit=Unit.KM,
+                derivs={'t': Vector3(np.random.randn(50, 30, 3), mask=mask,
+                                     unit=Unit.KM / Unit.S)})
+
+    f = io.BytesIO()
+    v.dump_blocks(f, rows=8)
+    f.seek(0)
+    blocks = list(Qube.iter_blocks(f))
+    assert [len(block) for block in blocks] == 6 * [8] + [2]
+    for (k, block) in enumerate(blocks):
+        assert_same(block, v[8*k:8*k+8])
+
+    f.seek(0)
+    assert_same(Qube.load_blocks(f), v)
+
+    # The default block size holds everything here
+    f = io.BytesIO()
+    v.dump_blocks(f)
+    f.seek(0)
+    assert len(list(Qube.iter_blocks(f))) == 1
+    f.seek(0)
+    assert_same(Qube.load_blocks(f), v)
+
+
+def test_qube_ext_streaming_pickle_settings() -> None:
+    """Each block uses the pickle settings of the object and its derivatives."""
+
+    np.random.seed(2231)
+
+    a = Scalar(np.random.rand(40, 100),
+               derivs={'t': Scalar(np.random.rand(40, 100))}).as_readonly()
+    a.set_pickle_digits(4, 1.)
+    a.d_dt.set_pickle_digits(2, 1.)
+
+    f = io.BytesIO()
+    a.dump_blocks(f, rows=np.int64(16))
+    plain = Scalar(a.values, derivs={'t': Scalar(a.d_dt.values)})
+    assert len(f.getvalue()) < 0.5 * len(pickle.dumps(plain))
+
+    f.seek(0)
+    b = Qube.load_blocks(f)
+    assert b.readonly
+    assert np.all(np.abs(b.values - a.values) <= 0.5e-4)
+    assert np.all(np.abs(b.d_dt.values - a.d_dt.values) <= 0.5e-2)
+
+
+def test_qube_ext_streaming_other_objects() -> None:
+    """Shapeless, Boolean, integer and empty objects are supported."""
+
+    for obj in (Scalar(2.5, unit=Unit.DEG), Scalar(np.arange(20).reshape(10, 2)),
+                Boolean(np.arange(7) % 3 == 0, mask=np.arange(7) == 4),
+                Scalar(np.zeros((0, 4)))):
+        f = io.BytesIO()
+        obj.dump_blocks(f, rows=3)
+        f.seek(0)
+        assert_same(Qube.load_blocks(f), obj)
+
+
+def test_qube_ext_streaming_errors() -> None:
+    """Invalid files and block sizes are rejected."""
+
+    f = io.BytesIO(pickle.dumps(Scalar(1.)))
+    with pytest.raises(ValueError):
+        Qube.iter_blocks(f)
+
+    f.seek(0)
+    with pytest.raises(ValueError):
+        Qube.load_blocks(f)
+
+    for rows in (0, -2, 1.5):
+        with pytest.raises(ValueError):
+            Scalar(np.arange(4.)).dump_blocks(io.BytesIO(), rows=rows)
@@ -0,0 +1,90 @@
+##########################################################################################
+# tests/test_qube_ext_tiler.py
+#
+# Unit tests for tiled evaluation with Qube.map_tiles()
+##########################################################################################
+
+import numpy as np
+import pytest
+
+from polymath import Qube, Scalar, Unit, Vector3
+
+from tests.qube_helpers import assert_close
+
+
+def test_qube_ext_tiler_matches_direct() -> None:
+    """Tiled results match the result of the untiled function."""
+
+    np.random.seed(4726)
+
+    a = Scalar(np.random.rand(37, 29) + 0.5, mask=np.random.rand(37, 29) < 0.2,
+               unit=Unit.KM, derivs={'t': Scalar(np.random.randn(37, 29))})
+    b = Scalar(np.random.rand(29) + 0.5, mask=np.random.rand(29) < 0.2)
+
+    def func(x, y, power):
+        return (x * y) ** power / x + x * y.sqrt()
+
+    expected = func(a, b, 2)
+    for workers in (1, 4):
+        for tile_shape in (5, (8, 7), (100, 100), (3, 1)):
+            result = Qube.map_tiles(func, a, b, 2, tile_shape=tile_shape,
+                                    workers=workers)
+            assert_close(result, expected)
+            assert not result.readonly
+
+
+def test_qube_ext_tiler_multiple_results() -> None:
+    """Tuples of results, items and masks are stitched."""
+
+    np.random.seed(1508)
+
+    v = Vector3(np.random.randn(20, 3), mask=np.random.rand(20) < 0.3)
+
+    def func(x):
+        return (x.norm(), x.unit())
+
+    (norm, unit) = Qube.map_tiles(func, v, tile_shape=6, workers=3)
+    assert_close(norm, v.norm())
+    assert_close(unit, v.unit())
+
+
+def test_qube_ext_tiler_partial_derivs_and_readonly() -> None:
+    """Derivatives missing from some tiles are zero; read-only status is kept."""
+
+    a = Scalar(np.arange(10.))
+
+    def func(x):
+        if x.values[0] == 0.:
+            return x.with_deriv('t', Scalar(np.ones(x.shape))).as_readonly()
+        return x.copy().as_readonly()
+
+    result = Qube.map_tiles(func, a, tile_shape=4)
+    assert np.all(result.d_dt.values == 4 * [1.] + 6 * [0.])
+    assert result.readonly
+
+    result = Qube.map_tiles(lambda x: x * 2., Scalar(3.))
+    assert result == 6.
+
+
+def test_qube_ext_tiler_errors() -> None:
+    """Invalid results raise errors."""
+
+    a = Scalar(np.arange(10.))
+
+    with pytest.raises(TypeError):
+        Qube.map_tiles(lambda x: x.values, a, tile_shape=3)
+    with pytest.raises(ValueError):
+        Qube.map_tiles(lambda x: x, a, tile_shape=0)
+    with pytest.raises(ValueError):
+        Qube.map_tiles(lambda x: Scalar(np.ones(20)), a, tile_shape=3, workers=2)
+    with pytest.raises(TypeError):
+        Qube.map_tiles(lambda x: x > 0 if x.values[0] else x, a, tile_shape=3)
+    with pytest.raises(ValueError):
+        Qube.map_tiles(lambda x: x if x.values[0] else (x, x), a, tile_shape=3)
+
+    # Tiles that would broadcast into their slices are rejected
+    b = Scalar(np.arange(200.))
+    with pytest.raises(ValueError):
+        Qube.map_tiles(lambda x: x.sum(), b, tile_shape=64)
+    with pytest.raises(ValueError):
+        Qube.map_tiles(lambda x: x[:1], b, tile_shape=64)
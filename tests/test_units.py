@@ -2,6 +2,8 @@
 # test/test_units.py
 ##########################################################################################
 
+import pickle
+
 import numpy as np
 import pytest
 
@@ -1630,3 +1632,17 @@ def test_units_unsupported_operand_raises_type_error(operation: Callable[[], obj
 
     with pytest.raises(TypeError, match=message):
         operation()
+
+
+def test_units_pickle_round_trip() -> None:
+    """Units pickle as their constructor arguments and compare equal when restored."""
+
+    for unit in (Unit.KM, Unit.DEG, Unit.KM / Unit.S**2, Unit.MRAD.copy()):
+        state = pickle.dumps(unit)
+        restored = pickle.loads(state)
+        assert restored == unit
+        assert restored.name == unit.name
+        assert restored.triple == unit.triple
+        assert restored.factor == unit.factor
+        assert restored.factor_inv == unit.factor_inv
+        assert len(state) < 100